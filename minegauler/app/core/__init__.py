@@ -3,15 +3,20 @@
 __all__ = (
     "BoardBase",
     "GameBase",
+    "GameChanges",
     "MinefieldBase",
     "UberController",
     "api",
+    "noguess",
     "regular",
+    "session",
+    "simulate",
+    "solver",
     "split_cell",
 )
 
-from . import api, regular, split_cell
+from . import api, noguess, regular, session, simulate, solver, split_cell
 from .board import BoardBase
 from .engine import UberController
-from .game import GameBase
+from .game import GameBase, GameChanges
 from .minefield import MinefieldBase
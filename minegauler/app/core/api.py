@@ -3,21 +3,49 @@
 """
 API between backend and frontends.
 
+Listeners are registered with a controller to receive notifications of
+changes. By default notifications are delivered synchronously, but listeners
+may instead be registered to have them delivered from a worker thread or in
+an asyncio event loop, so that a slow listener does not hold up the game.
+
 """
 
 __all__ = (
     "AbstractController",
     "AbstractListener",
+    "BackPressure",
+    "Delivery",
     "GameInfo",
+    "GameUpdate",
+    "ListenerStats",
 )
 
 import abc
+import asyncio
+import collections
+import enum
+import inspect
+import itertools
 import logging
-from typing import Callable, Dict, Iterable, List, Optional
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
 import attr
 
 from ..shared.types import (
+    CellAction,
     CellContents,
     Coord,
     Difficulty,
@@ -54,9 +82,110 @@ class GameInfo:
     mode: GameMode
 
     minefield_known: bool
+    # Whether the minefield is guaranteed to be solvable without guessing.
+    no_guess: bool = False
     started_info: Optional[StartedInfo] = None
 
 
+@attr.attrs(auto_attribs=True, kw_only=True, frozen=True)
+class GameUpdate:
+    """
+    The changes to the state of a game resulting from one user action.
+
+    Fields are None if unchanged. The cell updates must not be modified once
+    the update has been created.
+    """
+
+    cell_updates: Mapping[Coord, CellContents] = attr.attrib(factory=dict)
+    mines_remaining: Optional[int] = None
+    game_state: Optional[GameState] = None
+
+    def merge(self, later: "GameUpdate") -> "GameUpdate":
+        """
+        Combine with a later update, giving the overall changes.
+
+        :param later:
+            The update that came after this one.
+        :return:
+            A new update.
+        """
+        if not self.cell_updates:
+            cell_updates = later.cell_updates
+        elif not later.cell_updates:
+            cell_updates = self.cell_updates
+        else:
+            cell_updates = {**self.cell_updates, **later.cell_updates}
+        return GameUpdate(
+            cell_updates=cell_updates,
+            mines_remaining=(
+                self.mines_remaining
+                if later.mines_remaining is None
+                else later.mines_remaining
+            ),
+            game_state=(
+                self.game_state if later.game_state is None else later.game_state
+            ),
+        )
+
+    def split(self) -> List[Tuple[str, Any]]:
+        """
+        Split into the individual listener update methods to call.
+
+        :return:
+            A list of pairs of the method name and the argument to pass.
+        """
+        calls = []
+        if self.cell_updates:
+            calls.append(("update_cells", self.cell_updates))
+        if self.mines_remaining is not None:
+            calls.append(("update_mines_remaining", self.mines_remaining))
+        if self.game_state is not None:
+            calls.append(("update_game_state", self.game_state))
+        return calls
+
+
+class Delivery(enum.Enum):
+    """How notifications are delivered to a listener."""
+
+    # Called directly, in the thread sending the notification.
+    SYNC = "sync"
+    # Called in a worker thread for the listener.
+    THREAD = "thread"
+    # Called in an asyncio event loop, awaiting coroutine methods.
+    ASYNC = "async"
+
+
+class BackPressure(enum.Enum):
+    """What to do with a notification when a listener's queue is full."""
+
+    # Wait for the listener to catch up.
+    BLOCK = "block"
+    # Discard batched updates. Other notifications are queued regardless of
+    # the limit, since the listener cannot recover from missing them.
+    DROP = "drop"
+    # Merge batched updates into the last queued update, queueing other
+    # notifications regardless of the limit.
+    COALESCE = "coalesce"
+
+
+@attr.attrs(auto_attribs=True, kw_only=True)
+class ListenerStats:
+    """Statistics about the notifications delivered to a listener."""
+
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    # Time in seconds from sending a notification to the listener returning.
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+
 class AbstractListener(metaclass=abc.ABCMeta):
     """
     An abstract class outlining methods that should be implemented to receive
@@ -123,6 +252,19 @@ class AbstractListener(metaclass=abc.ABCMeta):
         """
         return NotImplemented
 
+    def update_batch(self, update: GameUpdate) -> None:
+        """
+        Called with all the changes resulting from one user action.
+
+        By default the individual update methods are called, but this may be
+        overridden to handle the changes together.
+
+        :param update:
+            The changes to the game state.
+        """
+        for method, arg in update.split():
+            getattr(self, method)(arg)
+
     @abc.abstractmethod
     def ui_mode_changed(self, mode: UIMode) -> None:
         """
@@ -168,51 +310,435 @@ class AbstractListener(metaclass=abc.ABCMeta):
         return NotImplemented
 
 
+# The listener methods that notifications are passed on for.
+_LISTENER_METHODS = tuple(
+    sorted(AbstractListener.__abstractmethods__ - {"handle_exception"})
+) + ("update_batch",)
+
+
+class _IdLoggerAdapter(logging.LoggerAdapter):
+    """Logger adapter prefixing messages with the id of the object logging."""
+
+    def process(self, msg: Any, kwargs: Any) -> Tuple[str, Any]:
+        return f"[{self.extra['id']}] {msg}", kwargs
+
+
+# A queued notification: method name, args, kwargs and the time it was sent.
+_QueueItem = Tuple[str, Tuple[Any, ...], Dict[str, Any], float]
+
+
+class _ListenerEntry:
+    """
+    A registered listener, with its queue of notifications to deliver.
+
+    Notifications are delivered synchronously, by `deliver_pending()`.
+    """
+
+    def __init__(self, listener: AbstractListener, logger: logging.LoggerAdapter):
+        self.listener: AbstractListener = listener
+        self.logger: logging.LoggerAdapter = logger
+        # Bound methods, looked up once on registration.
+        self.methods: Dict[str, Callable] = {
+            name: getattr(listener, name) for name in _LISTENER_METHODS
+        }
+        self.queue: Deque[_QueueItem] = collections.deque()
+        self.stats = ListenerStats()
+        # Protects the queue and stats, notified when the queue changes.
+        self.cond = threading.Condition()
+        self.delivering: bool = False
+        self.closed: bool = False
+
+    def enqueue(self, func: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        """Add a notification to the queue, coalescing updates."""
+        with self.cond:
+            if not self._coalesce(func, args, kwargs):
+                self.queue.append((func, args, kwargs, time.monotonic()))
+                self._record_depth()
+
+    def deliver_pending(self) -> None:
+        """
+        Deliver the queued notifications, unless already delivering (in this
+        or another thread). The listener is called without the lock held.
+        """
+        with self.cond:
+            if self.delivering:
+                return
+            self.delivering = True
+        try:
+            while True:
+                with self.cond:
+                    # Stop delivering while holding the lock, so that a sender
+                    # either sees the flag cleared or has its item delivered.
+                    if not self.queue:
+                        self.delivering = False
+                        return
+                    item = self.queue.popleft()
+                    self.stats.queue_depth = len(self.queue)
+                self._deliver(item)
+        except BaseException:
+            with self.cond:
+                self.delivering = False
+            raise
+
+    def close(self) -> None:
+        """Stop delivering notifications."""
+        self.closed = True
+
+    def _coalesce(
+        self, func: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> bool:
+        """
+        Merge an update into the last queued notification if that is also an
+        update. Must be called with the lock held.
+
+        :return:
+            Whether the update was merged.
+        """
+        if func != "update_batch" or not self.queue or self.queue[-1][0] != func:
+            return False
+        _, prev_args, prev_kwargs, sent = self.queue.pop()
+        prev = prev_args[0] if prev_args else prev_kwargs["update"]
+        update = args[0] if args else kwargs["update"]
+        # Keep the time the earlier update was sent.
+        self.queue.append((func, (prev.merge(update),), {}, sent))
+        self.stats.coalesced += 1
+        return True
+
+    def _record_depth(self) -> None:
+        self.stats.queue_depth = len(self.queue)
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self.stats.queue_depth
+        )
+
+    def _record_delivery(self, sent: float) -> None:
+        latency = time.monotonic() - sent
+        with self.cond:
+            self.stats.delivered += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+
+    def _handle_exception(self, func: str, exc: Exception) -> None:
+        self.logger.warning(f"Error occurred calling {func}() on {self.listener}")
+        self.listener.handle_exception(func, exc)
+
+    def _deliver(self, item: _QueueItem) -> None:
+        func, args, kwargs, sent = item
+        try:
+            self.methods[func](*args, **kwargs)
+        except Exception as e:
+            self._handle_exception(func, e)
+        self._record_delivery(sent)
+
+
+class _QueuedListenerEntry(_ListenerEntry, metaclass=abc.ABCMeta):
+    """
+    A listener whose notifications are delivered by a worker, with an optional
+    limit on the queue length.
+    """
+
+    def __init__(
+        self,
+        listener: AbstractListener,
+        logger: logging.LoggerAdapter,
+        *,
+        max_queue: Optional[int],
+        back_pressure: BackPressure,
+    ):
+        super().__init__(listener, logger)
+        self.max_queue: Optional[int] = max_queue
+        self.back_pressure: BackPressure = back_pressure
+
+    def enqueue(self, func: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        with self.cond:
+            if self.closed:
+                return
+            if self.back_pressure is BackPressure.COALESCE and self._coalesce(
+                func, args, kwargs
+            ):
+                return
+            if self.max_queue is not None and len(self.queue) >= self.max_queue:
+                if self.back_pressure is BackPressure.DROP:
+                    # Only batched updates may be dropped.
+                    if func == "update_batch":
+                        self.stats.dropped += 1
+                        return
+                elif self.back_pressure is BackPressure.BLOCK and self._can_block():
+                    while len(self.queue) >= self.max_queue and not self.closed:
+                        self.cond.wait()
+            self.queue.append((func, args, kwargs, time.monotonic()))
+            self._record_depth()
+        self._wake()
+
+    def deliver_pending(self) -> None:
+        # Delivered by the worker.
+        pass
+
+    @abc.abstractmethod
+    def _can_block(self) -> bool:
+        """Whether the current thread may wait for the queue to have space."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _wake(self) -> None:
+        """Wake the worker after adding to the queue."""
+        raise NotImplementedError
+
+    def _pop(self) -> Optional[_QueueItem]:
+        """Take the next notification from the queue, if any."""
+        with self.cond:
+            if not self.queue:
+                return None
+            item = self.queue.popleft()
+            self.stats.queue_depth = len(self.queue)
+            # Wake any senders waiting for space.
+            self.cond.notify_all()
+            return item
+
+
+class _ThreadedListenerEntry(_QueuedListenerEntry):
+    """A listener whose notifications are delivered by a worker thread."""
+
+    def __init__(
+        self, listener: AbstractListener, logger: logging.LoggerAdapter, **kwargs
+    ):
+        super().__init__(listener, logger, **kwargs)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"listener-{type(listener).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the worker once the queued notifications are delivered."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _can_block(self) -> bool:
+        # The listener may itself trigger notifications.
+        return threading.current_thread() is not self._thread
+
+    def _wake(self) -> None:
+        with self.cond:
+            self.cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self.cond:
+                while not self.queue and not self.closed:
+                    self.cond.wait()
+            item = self._pop()
+            if item is None:
+                return
+            self._deliver(item)
+
+
+class _AsyncListenerEntry(_QueuedListenerEntry):
+    """
+    A listener whose notifications are delivered by a task in an asyncio event
+    loop. Listener methods may be coroutine functions.
+    """
+
+    def __init__(
+        self,
+        listener: AbstractListener,
+        logger: logging.LoggerAdapter,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        **kwargs,
+    ):
+        super().__init__(listener, logger, **kwargs)
+        if type(listener).update_batch is AbstractListener.update_batch:
+            # Make sure coroutine update methods are awaited.
+            self.methods["update_batch"] = self._split_update
+        self._loop: asyncio.AbstractEventLoop = loop
+        # Created in the event loop by the task.
+        self._event: Optional[asyncio.Event] = None
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), loop)
+
+    def close(self) -> None:
+        """Stop the task once the queued notifications are delivered."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self._wake()
+
+    def _can_block(self) -> bool:
+        # Waiting in the event loop would stop the listener catching up.
+        try:
+            return asyncio.get_running_loop() is not self._loop
+        except RuntimeError:
+            return True
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._set_event)
+        except RuntimeError:
+            self.logger.debug("Event loop closed, unable to deliver notifications")
+
+    def _set_event(self) -> None:
+        if self._event is not None:
+            self._event.set()
+
+    async def _split_update(self, update: GameUpdate) -> None:
+        for method, arg in update.split():
+            result = self.methods[method](arg)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _run(self) -> None:
+        self._event = asyncio.Event()
+        while True:
+            # Clear before checking the queue so that no wakeup is missed.
+            self._event.clear()
+            item = self._pop()
+            if item is None:
+                if self.closed:
+                    return
+                await self._event.wait()
+                continue
+            func, args, kwargs, sent = item
+            try:
+                result = self.methods[func](*args, **kwargs)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self._handle_exception(func, e)
+            self._record_delivery(sent)
+
+
 class _Notifier(AbstractListener):
-    """Pass on calls to registered listeners."""
+    """
+    Pass on calls to registered listeners.
 
-    _count: int = 0
+    Each listener has its own queue of notifications, and receives them in the
+    order they were sent. Consecutive batched updates queued for a synchronous
+    listener are coalesced into one.
+
+    Synchronous listeners are called directly. A notification sent while a
+    listener is still handling an earlier one (e.g. if the listener triggers
+    another user action) is delivered once the listener is ready.
+
+    Threaded and async listeners are called by a worker, so they can fall
+    behind without holding up the game. Their queues may be limited in length,
+    with a back-pressure policy to apply when full.
+    """
+
+    # Taking the next id is atomic, so notifiers can be created in any thread.
+    _ids: Iterator[int] = itertools.count()
 
     def __init__(self, listeners: Iterable[AbstractListener] = None):
         """
-        Create the implementation for all
-
         :param listeners:
-        """
-        self._listeners: List[AbstractListener] = list(listeners) if listeners else []
-        self._id: int = self._count
-        self._logger = logging.getLogger(
-            f"{__name__}.{self.__class__.__name__}[{self._id}]"
+            Listeners to register, with synchronous delivery.
+        """
+        self._listeners: List[_ListenerEntry] = []
+        self._id: int = next(self._ids)
+        # Share one logger between all notifiers, since loggers are never freed.
+        self._logger = _IdLoggerAdapter(
+            logging.getLogger(f"{__name__}.{self.__class__.__name__}"),
+            {"id": self._id},
         )
 
-        self.__class__._count += 1
-
         # Do the method wrapping here because we need the registered listeners.
-        for method in AbstractListener.__abstractmethods__:
+        for method in _LISTENER_METHODS:
             setattr(self, method, self._call_registered(method))
 
-    def register_listener(self, listener: AbstractListener) -> None:
+        for listener in listeners or []:
+            self.register_listener(listener)
+
+    def register_listener(
+        self,
+        listener: AbstractListener,
+        *,
+        delivery: Delivery = Delivery.SYNC,
+        max_queue: Optional[int] = None,
+        back_pressure: BackPressure = BackPressure.BLOCK,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
         """
         Register a listener to receive updates from the controller.
 
         :param listener:
             An AbstractListener instance to register.
-        """
-        self._listeners.append(listener)
+        :param delivery:
+            How to deliver notifications to the listener.
+        :param max_queue:
+            The maximum number of notifications to queue for a threaded or async
+            listener, or None for no limit.
+        :param back_pressure:
+            What to do with notifications when the queue is full. Only batched
+            updates are ever dropped or coalesced. Blocking is not possible in the listener's own thread or event loop, where the
+            queue is allowed to grow instead.
+        :param loop:
+            The event loop to deliver notifications in, for an async listener.
+        :raise ValueError:
+            If no event loop is given for an async listener.
+        """
+        if delivery is Delivery.SYNC:
+            entry = _ListenerEntry(listener, self._logger)
+        elif delivery is Delivery.THREAD:
+            entry = _ThreadedListenerEntry(
+                listener,
+                self._logger,
+                max_queue=max_queue,
+                back_pressure=back_pressure,
+            )
+        elif delivery is Delivery.ASYNC:
+            if loop is None:
+                raise ValueError("An event loop is required for async delivery")
+            entry = _AsyncListenerEntry(
+                listener,
+                self._logger,
+                loop=loop,
+                max_queue=max_queue,
+                back_pressure=back_pressure,
+            )
+        else:
+            raise ValueError(f"Unknown delivery {delivery!r}")
+        self._listeners.append(entry)
 
     def unregister_listener(self, listener: AbstractListener) -> None:
         """
         Unregister a listener to receive updates from the controller.
 
-        Does nothing if not registered.
+        Notifications already queued for a threaded or async listener are still
+        delivered. Does nothing if not registered.
 
         :param listener:
             An AbstractListener instance to unregister.
         """
-        try:
-            self._listeners.remove(listener)
-        except ValueError:
-            self._logger.debug("Listener not registered - nothing to do")
+        for i, entry in enumerate(self._listeners):
+            if entry.listener is listener:
+                del self._listeners[i]
+                entry.close()
+                return
+        self._logger.debug("Listener not registered - nothing to do")
+
+    def get_listener_stats(self, listener: AbstractListener) -> ListenerStats:
+        """
+        Get statistics about the notifications delivered to a listener.
+
+        :param listener:
+            A registered listener.
+        :return:
+            A snapshot of the statistics.
+        :raise ValueError:
+            If the listener is not registered.
+        """
+        for entry in self._listeners:
+            if entry.listener is listener:
+                with entry.cond:
+                    return attr.evolve(entry.stats)
+        raise ValueError(f"Listener not registered: {listener}")
+
+    def close(self) -> None:
+        """Unregister all listeners, stopping any workers."""
+        while self._listeners:
+            self._listeners.pop().close()
 
     def _call_registered(self, func: str) -> Callable:
         """
@@ -223,19 +749,17 @@ class _Notifier(AbstractListener):
         :return:
             The decorated version of the method.
         """
-        if not hasattr(self, func + "_orig"):
-            setattr(self, func + "_orig", getattr(self, func))
+        orig = getattr(self, func)
 
         def wrapped(*args, **kwargs):
-            getattr(self, func + "_orig")(*args, **kwargs)
-            for listener in self._listeners:
-                try:
-                    getattr(listener, func)(*args, **kwargs)
-                except Exception as e:
-                    self._logger.warning(
-                        f"Error occurred calling {func}() on {listener}"
-                    )
-                    listener.handle_exception(func, e)
+            orig(*args, **kwargs)
+            # Queue for all listeners before delivering, so that notifications
+            # sent by a listener are delivered to the others in order.
+            entries = tuple(self._listeners)
+            for entry in entries:
+                entry.enqueue(func, args, kwargs)
+            for entry in entries:
+                entry.deliver_pending()
 
         return wrapped
 
@@ -291,6 +815,17 @@ class _Notifier(AbstractListener):
         """
         self._logger.debug(f"Calling update_mines_remaining() with {mines_remaining}")
 
+    def update_batch(self, update: GameUpdate) -> None:
+        """
+        Called with all the changes resulting from one user action.
+
+        :param update:
+            The changes to the game state.
+        """
+        self._logger.debug(
+            "Calling update_batch() with %d updated cells", len(update.cell_updates)
+        )
+
     def ui_mode_changed(self, mode: UIMode) -> None:
         """
         Called to indicate the UI mode has changed.
@@ -340,19 +875,22 @@ class AbstractController(metaclass=abc.ABCMeta):
             f"{self.__class__.__module__}.{self.__class__.__name__}"
         )
 
-    def register_listener(self, listener: AbstractListener) -> None:
+    def register_listener(self, listener: AbstractListener, **kwargs) -> None:
         """
         Register a listener to receive updates from the controller.
 
         :param listener:
             An AbstractListener instance to register.
+        :param kwargs:
+            Options for how to deliver notifications, see
+            `_Notifier.register_listener()`.
         """
         self._logger.info(
             "Registering listener: %s.%s",
             type(listener).__module__,
             type(listener).__name__,
         )
-        self._notif.register_listener(listener)
+        self._notif.register_listener(listener, **kwargs)
         # TODO Implement in subclass to update with current state.
 
     def unregister_listener(self, listener: AbstractListener) -> None:
@@ -371,6 +909,17 @@ class AbstractController(metaclass=abc.ABCMeta):
         )
         self._notif.unregister_listener(listener)
 
+    def get_listener_stats(self, listener: AbstractListener) -> ListenerStats:
+        """
+        Get statistics about the notifications delivered to a listener.
+
+        :param listener:
+            A registered listener.
+        :raise ValueError:
+            If the listener is not registered.
+        """
+        return self._notif.get_listener_stats(listener)
+
     # --------------------------------------------------------------------------
     # Getters
     # --------------------------------------------------------------------------
@@ -434,6 +983,38 @@ class AbstractController(metaclass=abc.ABCMeta):
         """
         self._logger.debug("Flags in cell %s being removed", coord)
 
+    def apply_actions(
+        self, actions: Iterable[Tuple[CellAction, Coord]], *, flag_only: bool = False
+    ) -> None:
+        """
+        Apply a sequence of cell actions, e.g. from a drag gesture or a replay.
+
+        By default each action is performed in turn, but subclasses may apply
+        them as a batch and send a single update to listeners.
+
+        :param actions:
+            Pairs of the action to perform and the cell to perform it on.
+        :param flag_only:
+            Passed through to `flag_cell()` for 'flag' actions.
+        :raise ValueError:
+            If an action is not supported.
+        """
+        actions = list(actions)
+        self._logger.debug("Applying %d cell actions", len(actions))
+        for action, coord in actions:
+            if action is CellAction.SELECT:
+                self.select_cell(coord)
+            elif action is CellAction.FLAG:
+                self.flag_cell(coord, flag_only=flag_only)
+            elif action is CellAction.CHORD:
+                self.chord_on_cell(coord)
+            elif action is CellAction.SPLIT:
+                self.split_cell(coord)
+            elif action is CellAction.REMOVE_FLAGS:
+                self.remove_cell_flags(coord)
+            else:
+                raise ValueError(f"Unsupported cell action: {action}")
+
     @abc.abstractmethod
     def resize_board(self, x_size: int, y_size: int, mines: int) -> None:
         """
@@ -5,14 +5,63 @@ Minesweeper board API.
 
 """
 
-__all__ = ("BoardBase",)
+__all__ = ("BoardBase", "get_shared_tables", "shared_per_size")
 
 import abc
-from typing import Iterable, List
+import functools
+import threading
+import weakref
+from typing import Any, Callable, Iterable, List, Tuple, TypeVar
 
 from ..shared.types import CellContents, Coord, GameMode
 
 
+_T = TypeVar("_T")
+
+# All tables created by functions decorated with `shared_per_size()`, for
+# each function and board size.
+_shared_tables: "weakref.WeakValueDictionary[Tuple[Any, int, int], Any]" = (
+    weakref.WeakValueDictionary()
+)
+_shared_tables_lock = threading.Lock()
+
+
+def shared_per_size(
+    maxsize: int,
+) -> Callable[[Callable[[int, int], _T]], Callable[[int, int], _T]]:
+    """
+    Decorator for functions creating immutable tables for a board size, so
+    that the tables are shared between boards of the same size.
+
+    The most recently used tables are kept, and any table still in use is
+    shared regardless of how many different sizes are in use.
+
+    :param maxsize:
+        The number of recently used tables to keep when not in use.
+    """
+
+    def decorator(func: Callable[[int, int], _T]) -> Callable[[int, int], _T]:
+        @functools.lru_cache(maxsize=maxsize)
+        @functools.wraps(func)
+        def wrapped(x_size: int, y_size: int) -> _T:
+            key = (func, x_size, y_size)
+            with _shared_tables_lock:
+                table = _shared_tables.get(key)
+                if table is None:
+                    table = _shared_tables[key] = func(x_size, y_size)
+            return table
+
+        return wrapped
+
+    return decorator
+
+
+def get_shared_tables() -> List[Any]:
+    """Get the per-size tables currently shared between boards."""
+    with _shared_tables_lock:
+        return list(_shared_tables.values())
+
+
 class BoardBase(metaclass=abc.ABCMeta):
     """Representation of a minesweeper board, generic over the game mode."""
 
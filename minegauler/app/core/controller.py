@@ -5,14 +5,22 @@ __all__ = ("ControllerBase", "GameControllerBase", "CreateControllerBase", "Shar
 import abc
 import json
 import logging
+import math
 import os.path
 from os import PathLike
-from typing import Dict, Optional, Type
+from typing import Dict, Iterable, Optional, Tuple, Type
 
 import attr
 
 from ..shared import GameOptsStruct
-from ..shared.types import CellContents, Coord, Difficulty, GameMode, GameState
+from ..shared.types import (
+    CellAction,
+    CellContents,
+    Coord,
+    Difficulty,
+    GameMode,
+    GameState,
+)
 from . import api
 from .board import BoardBase
 from .game import GameBase
@@ -159,6 +167,7 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
             per_cell=self._opts.per_cell,
             lives=self._opts.lives,
             first_success=self._opts.first_success,
+            no_guess=self._opts.no_guess,
         )
         self._last_update = SharedInfo()
         # self._send_updates()
@@ -173,7 +182,12 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
         return self.game.board
 
     def get_game_info(self) -> api.GameInfo:
-        """Get info about the current game."""
+        """
+        Get info about the current game.
+
+        All stats are calculated when the info is created, so the info stays
+        consistent with the game state it was created from.
+        """
         ret = api.GameInfo(
             game_state=self.game.state,
             x_size=self.game.x_size,
@@ -184,16 +198,24 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
             first_success=self.game.first_success,
             mode=self.mode,
             minefield_known=self.game.minefield_known,
+            no_guess=self.game.no_guess,
         )
         if self.game.state.started():
+            game = self.game
+            elapsed = game.get_elapsed()
+            # The 3bv stats are only calculated once for each version of the
+            # game state.
+            prop_complete = game.memoise("prop_complete", game.get_prop_complete)
             ret.started_info = api.GameInfo.StartedInfo(
-                start_time=self.game.start_time,
-                elapsed=self.game.get_elapsed(),
-                bbbv=self.game.mf.bbbv,
-                rem_bbbv=self.game.get_rem_3bv(),
-                bbbvps=self.game.get_3bvps(),
-                prop_complete=self.game.get_prop_complete(),
-                prop_flagging=self.game.get_flag_proportion(),
+                start_time=game.start_time,
+                elapsed=elapsed,
+                bbbv=game.mf.bbbv,
+                rem_bbbv=game.memoise("rem_3bv", game.get_rem_3bv),
+                bbbvps=(
+                    game.mf.bbbv * prop_complete / elapsed if elapsed else math.inf
+                ),
+                prop_complete=prop_complete,
+                prop_flagging=game.get_flag_proportion(),
             )
         return ret
 
@@ -222,6 +244,7 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
             per_cell=self._opts.per_cell,
             lives=self._opts.lives,
             first_success=self._opts.first_success,
+            no_guess=self._opts.no_guess,
         )
         self._send_reset_update()
 
@@ -254,6 +277,20 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
         self.game.set_cell_flags(coord, 0)
         self._send_updates({coord: self.board[coord]})
 
+    def apply_actions(
+        self, actions: Iterable[Tuple[CellAction, Coord]], *, flag_only: bool = False
+    ) -> None:
+        """
+        See AbstractController.
+
+        The actions are applied to the game as a batch, sending a single update
+        to listeners.
+        """
+        actions = list(actions)
+        logger.debug("Applying %d cell actions as a batch", len(actions))
+        cells = self.game.apply_actions(actions, flag_only=flag_only)
+        self._send_updates(cells)
+
     def set_first_success(self, value: bool) -> None:
         """
         Set whether the first click should be a guaranteed success.
@@ -324,15 +361,26 @@ class GameControllerBase(ControllerBase, metaclass=abc.ABCMeta):
             game_state=self.game.state,
         )
 
-        # Send updates to registered listeners.
-        if update.cell_updates:
-            self._notif.update_cells(update.cell_updates)
-        if update.mines_remaining != self._last_update.mines_remaining:
-            self._notif.update_mines_remaining(update.mines_remaining)
-        # if update.lives_remaining != self._last_update.lives_remaining:
-        #     self._notif.update_lives_remaining(update.lives_remaining)
-        if update.game_state is not self._last_update.game_state:
-            self._notif.update_game_state(update.game_state)
+        # Send the changes to registered listeners as a single batch.
+        batch = api.GameUpdate(
+            cell_updates=update.cell_updates or {},
+            mines_remaining=(
+                update.mines_remaining
+                if update.mines_remaining != self._last_update.mines_remaining
+                else None
+            ),
+            game_state=(
+                update.game_state
+                if update.game_state is not self._last_update.game_state
+                else None
+            ),
+        )
+        if (
+            batch.cell_updates
+            or batch.mines_remaining is not None
+            or batch.game_state is not None
+        ):
+            self._notif.update_batch(batch)
 
         self._last_update = update
 
@@ -10,9 +10,9 @@ __all__ = ("UberController",)
 import json
 import logging
 import sys
-from typing import Mapping, Type
+from typing import Dict, Iterable, Tuple, Type
 
-from ..shared.types import Coord, Difficulty, GameMode, PathLike, UIMode
+from ..shared.types import CellAction, Coord, Difficulty, GameMode, PathLike, UIMode
 from ..shared.utils import GameOptsStruct
 from . import api, board, controller, game, minefield, regular, split_cell
 from .board import BoardBase
@@ -39,7 +39,9 @@ class GameModeImplementation(Protocol):
     mode: GameMode
 
 
-GAME_MODE_IMPL: Mapping[GameMode, GameModeImplementation] = {
+# The implementation used for each game mode. Alternative implementations can
+# be swapped in, e.g. 'regular.bitboard' for the regular game mode.
+GAME_MODE_IMPL: Dict[GameMode, GameModeImplementation] = {
     GameMode.REGULAR: regular,
     GameMode.SPLIT_CELL: split_cell,
 }
@@ -171,6 +173,11 @@ class UberController(api.AbstractController):
     def remove_cell_flags(self, coord: Coord) -> None:
         self._active_ctrlr.remove_cell_flags(coord)
 
+    def apply_actions(
+        self, actions: Iterable[Tuple[CellAction, Coord]], *, flag_only: bool = False
+    ) -> None:
+        self._active_ctrlr.apply_actions(actions, flag_only=flag_only)
+
     def resize_board(self, x_size: int, y_size: int, mines: int) -> None:
         self._active_ctrlr.resize_board(x_size, y_size, mines)
 
@@ -2,18 +2,44 @@
 
 __all__ = (
     "GameBase",
+    "GameChanges",
     "GameNotStartedError",
+    "Rem3bvTrackerBase",
     "check_game_started",
 )
 
 import abc
+import collections
 import functools
 import logging
 import math
 import time
-from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import attr
 
-from ..shared.types import CellContents, Coord, Difficulty, GameMode, GameState
+from ..shared.types import (
+    CellAction,
+    CellContents,
+    Coord,
+    Difficulty,
+    GameMode,
+    GameState,
+)
 from .board import BoardBase
 from .minefield import MinefieldBase
 
@@ -31,51 +57,80 @@ def _check_coord(method: Callable) -> Callable:
 
     @functools.wraps(method)
     def wrapped(self: "GameBase", coord: Coord, *args, **kwargs):
-        if not 0 <= coord.x < self.x_size or not 0 <= coord.y < self.y_size:
-            raise ValueError(
-                f"Coordinate is out of bounds, should be between (0,0) and "
-                f"({self.x_size-1}, {self.y_size-1})"
-            )
+        _validate_coord(self, coord)
         return method(self, coord, *args, **kwargs)
 
     return wrapped
 
 
+def _validate_coord(game: "GameBase", coord: Coord) -> None:
+    """
+    Check a coord is inside the valid range for a game.
+
+    :raise ValueError:
+        If the coord is not valid.
+    """
+    if not 0 <= coord.x < game.x_size or not 0 <= coord.y < game.y_size:
+        raise ValueError(
+            f"Coordinate is out of bounds, should be between (0,0) and "
+            f"({game.x_size-1}, {game.y_size-1})"
+        )
+
+
 def _ignore_decorator_helper(conditions_sense, game_state, cell_state) -> Callable:
     # If the cell state is specified it is assumed the coord is passed in
     # as the first arg.
+    # The guard tables are built once here so that checking whether to ignore
+    # a call is just a couple of set lookups.
+    if game_state is None:
+        game_states = frozenset()
+    elif type(game_state) is GameState:
+        game_states = frozenset([game_state])
+    else:
+        game_states = frozenset(game_state)
+
+    if cell_state is None:
+        cell_states = []
+    elif cell_state in CellContents.items:
+        cell_states = [cell_state]
+    else:
+        cell_states = cell_state
+    # Cell contents are interned, so the instance types (e.g. unclicked) can be
+    # matched by type in the same way as the numeric types.
+    cell_types = set()
+    for s in cell_states:
+        if s not in CellContents.items:
+            raise ValueError(f"Unrecognised type {s!r}")
+        cell_types.add(s if isinstance(s, type) else type(s))
+    cell_types = frozenset(cell_types)
+
     def decorator(method: Callable) -> Callable:
-        if game_state is None:
-            game_states = []
-        elif type(game_state) is GameState:
-            game_states = [game_state]
-        else:
-            game_states = game_state
+        if not cell_types:
+
+            @functools.wraps(method)
+            def wrapped(game: "GameBase", coord: Coord = None, *args, **kwargs):
+                if (game.state in game_states) is conditions_sense:
+                    return
+                return method(game, coord, *args, **kwargs)
+
+        elif conditions_sense:
+
+            @functools.wraps(method)
+            def wrapped(game: "GameBase", coord: Coord = None, *args, **kwargs):
+                if game.state in game_states or type(game.board[coord]) in cell_types:
+                    return
+                return method(game, coord, *args, **kwargs)
 
-        if cell_state is None:
-            cell_states = []
-        elif cell_state in CellContents.items:
-            cell_states = [cell_state]
         else:
-            cell_states = cell_state
-
-        @functools.wraps(method)
-        def wrapped(game: "GameBase", coord: Coord = None, *args, **kwargs):
-            conditions = [any(game.state is s for s in game_states)]
-            if cell_states:
-                conditions.append(
-                    any(game.board[coord].is_type(s) for s in cell_states)
-                )
-
-            # fmt: off
-            if (
-                any(conditions) and conditions_sense
-                or not all(conditions) and not conditions_sense
-            ):
-                return
-            # fmt: on
-
-            return method(game, coord, *args, **kwargs)
+
+            @functools.wraps(method)
+            def wrapped(game: "GameBase", coord: Coord = None, *args, **kwargs):
+                if (
+                    game.state not in game_states
+                    or type(game.board[coord]) not in cell_types
+                ):
+                    return
+                return method(game, coord, *args, **kwargs)
 
         return wrapped
 
@@ -137,6 +192,137 @@ class GameNotStartedError(Exception):
     """Game has not been started, so no minefield has been created."""
 
 
+@attr.attrs(auto_attribs=True, kw_only=True, frozen=True)
+class GameChanges:
+    """
+    The changes to a game since a given state version.
+
+    If the changes are no longer stored, `full` is set and the cell updates are
+    a snapshot of the whole board.
+    """
+
+    version: int
+    cell_updates: Mapping[Coord, CellContents]
+    full: bool
+    game_state: GameState
+    mines_remaining: int
+
+
+class Rem3bvTrackerBase(metaclass=abc.ABCMeta):
+    """
+    Track the remaining 3bv of a game incrementally as safe cells are revealed.
+
+    The remaining 3bv is the number of openings still to be clicked, plus the
+    number of unrevealed safe cells that are not next to an unrevealed blank
+    (and so must each be clicked individually). Partially revealed openings
+    are counted by finding the separate openings their unrevealed blanks form,
+    using a flood fill when next needed.
+
+    Cells are identified by their index, with subclasses providing the
+    neighbours of each cell and the blanks in each opening.
+    """
+
+    def __init__(
+        self,
+        *,
+        labels: Sequence[int],
+        opening_sizes: List[int],
+        nbr_blanks: List[int],
+        isolated: int,
+        num_cells: int,
+    ):
+        """
+        :param labels:
+            The opening each cell belongs to, or -1 for cells that are not
+            blank.
+        :param opening_sizes:
+            The number of blanks in each opening.
+        :param nbr_blanks:
+            The number of blanks in the 3x3 block around each cell.
+        :param isolated:
+            The number of safe cells that are not next to a blank.
+        :param num_cells:
+            The number of cells.
+        """
+        self._labels = labels
+        self._opening_sizes = opening_sizes
+        # Number of unrevealed blanks in each opening.
+        self._unrevealed_blanks = list(opening_sizes)
+        self._untouched_openings: int = len(opening_sizes)
+        # Partially revealed openings, mapped to the number of separate
+        # openings they now form (None if this needs recalculating).
+        self._partial_openings: Dict[int, Optional[int]] = {}
+        # Number of unrevealed blanks in the 3x3 block around each cell.
+        self._nbr_blanks = nbr_blanks
+        self._revealed = bytearray(num_cells)
+        self._isolated: int = isolated
+
+    @abc.abstractmethod
+    def _index(self, coord: Coord) -> int:
+        """Get the index of a cell."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _nbr_indices(self, idx: int) -> Iterable[int]:
+        """Get the indices of the cells in the 3x3 block around a cell."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _opening_blanks(self, label: int) -> Iterable[int]:
+        """Get the indices of the blanks in an opening."""
+        raise NotImplementedError
+
+    @property
+    def rem_3bv(self) -> int:
+        partial = 0
+        for label, num in self._partial_openings.items():
+            if num is None:
+                num = self._partial_openings[label] = self._count_components(label)
+            partial += num
+        return self._untouched_openings + partial + self._isolated
+
+    def reveal(self, coord: Coord) -> None:
+        """Record a safe cell being revealed."""
+        idx = self._index(coord)
+        if self._revealed[idx]:
+            return
+        self._revealed[idx] = 1
+        if self._nbr_blanks[idx] == 0:
+            self._isolated -= 1
+        label = self._labels[idx]
+        if label < 0:
+            return
+        # A blank was revealed - update the neighbouring cells.
+        for nbr_idx in self._nbr_indices(idx):
+            self._nbr_blanks[nbr_idx] -= 1
+            if self._nbr_blanks[nbr_idx] == 0 and not self._revealed[nbr_idx]:
+                self._isolated += 1
+        if self._unrevealed_blanks[label] == self._opening_sizes[label]:
+            self._untouched_openings -= 1
+        self._unrevealed_blanks[label] -= 1
+        if self._unrevealed_blanks[label] == 0:
+            self._partial_openings.pop(label, None)
+        else:
+            self._partial_openings[label] = None
+
+    def _count_components(self, label: int) -> int:
+        """
+        Count the separate openings formed by the unrevealed blanks of a
+        partially revealed opening.
+        """
+        remaining = {i for i in self._opening_blanks(label) if not self._revealed[i]}
+        components = 0
+        while remaining:
+            components += 1
+            to_check = [remaining.pop()]
+            while to_check:
+                for nbr_idx in self._nbr_indices(to_check.pop()):
+                    if nbr_idx in remaining:
+                        remaining.remove(nbr_idx)
+                        to_check.append(nbr_idx)
+        return components
+
+
 class GameBase(metaclass=abc.ABCMeta):
     """Representation of a minesweeper game, generic on the game mode."""
 
@@ -146,6 +332,23 @@ class GameBase(metaclass=abc.ABCMeta):
 
     _diff_pairs: List[Tuple[Difficulty, Tuple[int, int, int]]]
 
+    # The actions supported by `apply_actions()`.
+    supported_actions: FrozenSet[CellAction] = frozenset(
+        {
+            CellAction.SELECT,
+            CellAction.FLAG,
+            CellAction.CHORD,
+            CellAction.REMOVE_FLAGS,
+        }
+    )
+
+    # Whether to cross-check incrementally tracked state against a full
+    # recalculation (expensive, intended for tests).
+    _check_tracked_state: bool = False
+
+    # The number of state versions to keep the cell updates for.
+    max_stored_changes: int = 256
+
     def __init__(
         self,
         *,
@@ -155,6 +358,7 @@ class GameBase(metaclass=abc.ABCMeta):
         per_cell: int = 1,
         lives: int = 1,
         first_success: bool = False,
+        no_guess: bool = False,
     ):
         self.x_size: int = x_size
         self.y_size: int = y_size
@@ -165,14 +369,33 @@ class GameBase(metaclass=abc.ABCMeta):
         self.minefield_known: bool = False
         self.lives: int = lives
         self.first_success: bool = first_success
+        # Whether the minefield should be solvable without guessing. Cleared
+        # when the minefield is created if this could not be achieved.
+        self.no_guess: bool = no_guess
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.state: GameState = GameState.READY
         self.mines_remaining: int = self.mines
         self.lives_remaining: int = self.lives
         self._num_flags: int = 0
+        # Number of safe cells still to be revealed, counted once the
+        # minefield is known.
+        self._unrevealed_safe_cells: Optional[int] = None
 
         self._cell_updates: Dict[Coord, CellContents] = {}
+        # Incremented whenever cells change, to tell when values calculated
+        # from the game state are out of date.
+        self.state_version: int = 0
+        # The cell updates made in reaching each recent state version.
+        self._changes: Deque[
+            Tuple[int, Mapping[Coord, CellContents]]
+        ] = collections.deque(maxlen=self.max_stored_changes)
+        # Values calculated from the game state, for the version stored.
+        self._memo: Dict[str, Any] = {}
+        self._memo_version: int = 0
+        # Whether to skip checking for completion after each action, set while
+        # applying a batch of actions.
+        self._defer_completion: bool = False
 
     @abc.abstractmethod
     def _make_board(self) -> BoardBase:
@@ -188,7 +411,8 @@ class GameBase(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def _is_complete(self) -> bool:
+    def _count_unrevealed_safe_cells(self) -> int:
+        """Count the safe cells that are yet to be revealed by scanning the board."""
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -238,7 +462,7 @@ class GameBase(metaclass=abc.ABCMeta):
 
     def get_prop_complete(self) -> float:
         """Calculate the progress of solving the board using 3bv."""
-        rem_3bv = self.get_rem_3bv()
+        rem_3bv = self.memoise("rem_3bv", self.get_rem_3bv)
         try:
             return (self.mf.bbbv - rem_3bv) / self.mf.bbbv
         except ZeroDivisionError:
@@ -269,6 +493,62 @@ class GameBase(metaclass=abc.ABCMeta):
                 return 0
         return self._num_flags / self.mines
 
+    def changes_since(self, version: int) -> GameChanges:
+        """
+        Get the changes made since a state version, e.g. for a client to catch
+        up with the game.
+
+        :param version:
+            The state version the client has.
+        :return:
+            The merged cell updates made since that version, or a snapshot of
+            the board if they are no longer stored.
+        :raise ValueError:
+            If the version is invalid.
+        """
+        if not 0 <= version <= self.state_version:
+            raise ValueError(
+                f"Invalid state version {version}, current version is "
+                f"{self.state_version}"
+            )
+        num_changes = self.state_version - version
+        if num_changes <= len(self._changes):
+            full = False
+            cell_updates: Dict[Coord, CellContents] = {}
+            for i in range(len(self._changes) - num_changes, len(self._changes)):
+                cell_updates.update(self._changes[i][1])
+        else:
+            full = True
+            cell_updates = {c: self.board[c] for c in self.board.all_coords}
+        return GameChanges(
+            version=self.state_version,
+            cell_updates=cell_updates,
+            full=full,
+            game_state=self.state,
+            mines_remaining=self.mines_remaining,
+        )
+
+    def memoise(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Get a value calculated from the game state, only calculating it if the
+        state has changed since it was last calculated.
+
+        :param key:
+            The name of the value.
+        :param func:
+            Function to calculate the value.
+        :return:
+            The value.
+        """
+        if self._memo_version != self.state_version:
+            self._memo.clear()
+            self._memo_version = self.state_version
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = func()
+            return value
+
     # ---------------------
     # Other methods
     # ---------------------
@@ -281,14 +561,88 @@ class GameBase(metaclass=abc.ABCMeta):
         :param state:
             The state to set the cell to.
         """
+        if (
+            type(state) is CellContents.Num
+            and type(self.board[coord]) is not CellContents.Num
+        ):
+            self._get_unrevealed_safe_cells()
+            self._unrevealed_safe_cells -= 1
         self.board[coord] = state
         self._cell_updates[coord] = state
 
+    def _take_cell_updates(self) -> Dict[Coord, CellContents]:
+        """
+        Take the cell updates stored since this was last called, moving on the
+        state version if there are any.
+
+        :return:
+            The cell updates.
+        """
+        updates = self._cell_updates
+        self._cell_updates = {}
+        if updates:
+            self.state_version += 1
+            self._changes.append((self.state_version, updates))
+        return updates
+
+    def _find_opening(
+        self, coord: Coord, is_blank: Callable[[Coord], bool]
+    ) -> List[Coord]:
+        """
+        Find the cells revealed by clicking on a blank cell, spreading out
+        through unclicked blank cells.
+
+        This is a breadth-first search using a work queue, with a bitmap of the
+        cells already visited (indexed by their row-major position).
+
+        :param coord:
+            The blank cell that was clicked.
+        :param is_blank:
+            Function to check whether a cell will be revealed as a blank.
+        :return:
+            The unclicked cells that are revealed, in the order found.
+        """
+        board = self.board
+        unclicked = CellContents.Unclicked
+        x_size = self.x_size
+        visited = bytearray(x_size * self.y_size)
+        visited[coord.y * x_size + coord.x] = 1
+        opening = [coord] if board[coord] is unclicked else []
+        queue = collections.deque([coord])
+        while queue:
+            for nbr in board.get_nbrs(queue.popleft()):
+                idx = nbr.y * x_size + nbr.x
+                if visited[idx]:
+                    continue
+                visited[idx] = 1
+                if board[nbr] is unclicked:
+                    opening.append(nbr)
+                    if is_blank(nbr):
+                        queue.append(nbr)
+        return opening
+
+    def _get_unrevealed_safe_cells(self) -> int:
+        """Get the number of safe cells that are yet to be revealed."""
+        if self._unrevealed_safe_cells is None:
+            self._unrevealed_safe_cells = self._count_unrevealed_safe_cells()
+        return self._unrevealed_safe_cells
+
+    def _is_complete(self) -> bool:
+        num_unrevealed = self._get_unrevealed_safe_cells()
+        if self._check_tracked_state:
+            assert num_unrevealed == self._count_unrevealed_safe_cells(), (
+                f"Tracked {num_unrevealed} unrevealed safe cells, "
+                f"found {self._count_unrevealed_safe_cells()}"
+            )
+        return num_unrevealed == 0
+
     def _check_for_completion(self) -> None:
         """
         Check if game is complete by comparing the board to the minefield's
         completed board. If it is, display flags in remaining unclicked cells.
         """
+        if self._defer_completion:
+            return
         if self._is_complete():
             logger.info("Game won")
 
@@ -318,10 +672,7 @@ class GameBase(metaclass=abc.ABCMeta):
             self._check_for_completion()
         if self.state.finished() and just_started:
             self.end_time = self.start_time
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = {}
+        return self._take_cell_updates()
 
     @_check_coord
     @_ignore_if_not(
@@ -348,10 +699,7 @@ class GameBase(metaclass=abc.ABCMeta):
         self.mines_remaining += old_nr_flags - nr_flags
         self._num_flags += nr_flags - old_nr_flags
 
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = {}
+        return self._take_cell_updates()
 
     @_check_coord
     @_ignore_if_not(game_state=GameState.ACTIVE, cell_state=CellContents.Num)
@@ -381,7 +729,103 @@ class GameBase(metaclass=abc.ABCMeta):
         if self.state != GameState.LOST:
             self._check_for_completion()
 
+        return self._take_cell_updates()
+
+    @_check_coord
+    def cycle_cell_flags(
+        self, coord: Coord, *, flag_only: bool = False
+    ) -> Optional[Mapping[Coord, CellContents]]:
+        """
+        Add a flag to a cell, removing the flags once the maximum number per
+        cell is reached.
+
+        :param coord:
+            The cell to flag.
+        :param flag_only:
+            Whether to leave cells with the maximum number of flags rather than
+            removing them.
+        :return:
+            The cell updates, or None if the action was ignored.
+        """
+        cell = self.board[coord]
+        if cell is CellContents.Unclicked:
+            return self.set_cell_flags(coord, 1)
+        elif isinstance(cell, CellContents.Flag):
+            if cell.num < self.per_cell:
+                return self.set_cell_flags(coord, cell.num + 1)
+            elif not flag_only:
+                return self.set_cell_flags(coord, 0)
+        return {}
+
+    def apply_actions(
+        self, actions: Iterable[Tuple[CellAction, Coord]], *, flag_only: bool = False
+    ) -> Mapping[Coord, CellContents]:
+        """
+        Apply a sequence of cell actions, checking for completion only once at
+        the end.
+
+        Each action has the same effect as performing it on its own. Once the
+        game is finished (or all safe cells are revealed) any remaining actions
+        are ignored, just as they would be if performed one at a time.
+
+        :param actions:
+            Pairs of the action to perform and the cell to perform it on. A
+            'flag' action adds a flag to the cell, removing the flags once the
+            maximum number per cell is reached.
+        :param flag_only:
+            Whether 'flag' actions should leave cells with the maximum number
+            of flags rather than removing them.
+        :return:
+            The merged cell updates, with the final contents of each cell.
+        :raise ValueError:
+            If an action is not supported or a coord is out of bounds, in which
+            case no actions are applied.
+        """
+        actions = list(actions)
+        # Check all the actions before applying any, so that an invalid action
+        # cannot leave the batch partly applied.
+        for action, coord in actions:
+            if action not in self.supported_actions:
+                raise ValueError(f"Unsupported action in {self.mode} mode: {action}")
+            _validate_coord(self, coord)
+        updates: Dict[Coord, CellContents] = {}
+        self._defer_completion = True
         try:
-            return self._cell_updates
+            for action, coord in actions:
+                # Ignored actions return None.
+                cell_updates = self._apply_action(action, coord, flag_only=flag_only)
+                if cell_updates:
+                    updates.update(cell_updates)
+                if self.state.finished() or (
+                    self.state is GameState.ACTIVE
+                    and self._get_unrevealed_safe_cells() == 0
+                ):
+                    break
         finally:
-            self._cell_updates = {}
+            self._defer_completion = False
+        if self.state is GameState.ACTIVE:
+            self._check_for_completion()
+            updates.update(self._take_cell_updates())
+        return updates
+
+    def _apply_action(
+        self, action: CellAction, coord: Coord, *, flag_only: bool
+    ) -> Optional[Mapping[Coord, CellContents]]:
+        """
+        Apply a single action for `apply_actions()`.
+
+        :return:
+            The cell updates, or None if the action was ignored.
+        :raise ValueError:
+            If the action is not supported.
+        """
+        if action is CellAction.SELECT:
+            return self.select_cell(coord)
+        elif action is CellAction.CHORD:
+            return self.chord_on_cell(coord)
+        elif action is CellAction.REMOVE_FLAGS:
+            return self.set_cell_flags(coord, 0)
+        elif action is CellAction.FLAG:
+            return self.cycle_cell_flags(coord, flag_only=flag_only)
+        else:
+            raise ValueError(f"Unsupported action in {self.mode} mode: {action}")
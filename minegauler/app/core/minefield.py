@@ -5,9 +5,11 @@ Minesweeper minefield API.
 
 """
 
-__all__ = ("MinefieldBase",)
+__all__ = ("MinefieldBase", "sample_mine_indices")
 
 import abc
+import array
+import bisect
 import logging
 import random
 from typing import Any, Generic, Iterable, List, Mapping, Optional, Set, TypeVar
@@ -22,6 +24,47 @@ C = TypeVar("C")
 B = TypeVar("B", bound=BoardBase)
 
 
+def sample_mine_indices(
+    rng: random.Random,
+    num_indices: int,
+    safe_indices: Iterable[int],
+    mines: int,
+    per_cell: int,
+) -> List[int]:
+    """
+    Randomly choose the cells to place mines in, as flat indices.
+
+    Each cell that is not safe provides 'per_cell' slots, and mines are placed
+    in slots sampled without replacement. Only the chosen slots are visited,
+    with each mapped to its cell by a binary search over the safe cells, so
+    this takes O(mines * log(safe cells)) time (plus sorting the safe cells)
+    rather than time proportional to the number of cells.
+
+    :param rng:
+        The random number generator to use.
+    :param num_indices:
+        The number of cells.
+    :param safe_indices:
+        Indices of cells that must not contain a mine.
+    :param mines:
+        The number of mines to place.
+    :param per_cell:
+        Maximum number of mines per cell.
+    :return:
+        The indices of cells containing mines, repeated for multiple mines.
+    """
+    safe_indices = sorted(set(safe_indices))
+    num_avble = num_indices - len(safe_indices)
+    # The number of available cells before each safe cell, which is
+    # non-decreasing, so the number of safe cells before the nth available
+    # cell is the number of these that are at most n.
+    avble_before_safe = [idx - i for i, idx in enumerate(safe_indices)]
+    return [
+        slot % num_avble + bisect.bisect_right(avble_before_safe, slot % num_avble)
+        for slot in rng.sample(range(num_avble * per_cell), mines)
+    ]
+
+
 class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
     """Representation of a minesweeper minefield, generic over the coord type."""
 
@@ -54,6 +97,15 @@ class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
         self.mines: int = mines
         self.per_cell: int = per_cell
         self.mine_coords: List[C] = []
+        # The seed used to populate the minefield, if populated randomly.
+        self.seed: Optional[int] = None
+        # The other arguments used to populate the minefield, so that it can be
+        # regenerated from the seed.
+        self.safe_coords: Optional[List[C]] = None
+        self.no_guess_click: Optional[C] = None
+        # Dense per-cell mine counts, indexed using _coord_index(). Kept in
+        # sync with mine_coords, allocated when the minefield is populated.
+        self._mine_counts: Optional[array.array] = None
         self._bbbv: Optional[int] = None
         self._completed_board: Optional[B] = None
         self._openings: Optional[List[List[C]]] = None
@@ -92,16 +144,14 @@ class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
             If the number of mines is too high.
         """
         mine_coords = list(mine_coords)
-        if any(mine_coords.count(c) > per_cell for c in mine_coords):
+        self = cls(all_coords, mines=len(mine_coords), per_cell=per_cell)
+        self._set_mine_coords(mine_coords)
+        too_many = {c for c in mine_coords if self[c] > per_cell}
+        if too_many:
             raise ValueError(
                 f"Max number of mines per cell is {per_cell}, too many in: "
-                + ", ".join(
-                    str(c) for c in mine_coords if mine_coords.count(c) > per_cell
-                )
+                + ", ".join(str(c) for c in sorted(too_many))
             )
-        self = cls(all_coords, mines=len(mine_coords), per_cell=per_cell)
-        self.mine_coords = mine_coords
-        self.populated = True
         return self
 
     def __repr__(self):
@@ -110,12 +160,14 @@ class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
     def __getitem__(self, coord: C) -> int:
         if coord not in self.all_coords:
             raise IndexError(f"Invalid coord '{coord}'")
-        return self.mine_coords.count(coord)
+        if self._mine_counts is None:
+            return 0
+        return self._mine_counts[self._coord_index(coord)]
 
     def __eq__(self, other):
         if type(other) is not type(self):
             return False
-        fields = ("all_coords", "mines", "mine_coords", "per_cell")
+        fields = ("all_coords", "mines", "per_cell", "_mine_counts")
         return all(getattr(self, f) == getattr(other, f) for f in fields)
 
     @property
@@ -142,19 +194,38 @@ class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
             self._openings = self._find_openings()
         return self._openings
 
-    def populate(self, safe_coords: Optional[Iterable[C]] = None) -> None:
+    def populate(
+        self,
+        safe_coords: Optional[Iterable[C]] = None,
+        *,
+        seed: Optional[int] = None,
+        no_guess_click: Optional[C] = None,
+    ) -> None:
         """
         Randomly place mines in the available coordinates.
 
+        The same mines are placed when populating with the same safe coords
+        and seed. The seed used is stored in the 'seed' attribute, and the
+        other arguments in the 'safe_coords' and 'no_guess_click' attributes,
+        so that the minefield can be regenerated using `regenerate()`.
+
         :param safe_coords:
             Optional iterable of coords that should not contain a mine when
             filling the minefield.
-        :return:
-            A list of randomly chosen mine coords.
+        :param seed:
+            Optional seed for the random placement of mines, otherwise a seed
+            is chosen randomly.
+        :param no_guess_click:
+            If given, the minefield should be solvable without guessing when
+            starting by clicking this coord, which is treated as safe.
         :raise ValueError:
             If the number of mines is too high.
+        :raise NotImplementedError:
+            If no-guess minefields are not supported.
         """
         safe_coords = set(safe_coords) if safe_coords else None
+        if no_guess_click is not None:
+            safe_coords = (safe_coords or set()) | {no_guess_click}
         mine_spaces = len(self.all_coords) - (len(safe_coords) if safe_coords else 1)
 
         if self.mines > mine_spaces * self.per_cell:
@@ -163,19 +234,103 @@ class MinefieldBase(Generic[C, B], metaclass=abc.ABCMeta):
                 f"spaces with max {self.per_cell} per cell"
             )
 
-        # Get a list of coordinates which can have mines placed in them.
+        if seed is None:
+            seed = random.getrandbits(64)
+        rng = random.Random(seed)
         # Make sure there is at least one safe cell.
-        avble_set = set(self.all_coords)
         if safe_coords:
-            avble_set -= safe_coords
+            # Sorted so that the mines placed do not depend on set ordering.
+            safe_indices = sorted(
+                self._coord_index(c) for c in safe_coords if c in self.all_coords
+            )
+        else:
+            safe_indices = [rng.randrange(self._num_indices)]
+
+        if no_guess_click is not None:
+            mine_indices = self._sample_no_guess_mine_indices(
+                rng, safe_indices, self._coord_index(no_guess_click)
+            )
         else:
-            avble_set.remove(random.choice(tuple(avble_set)))
+            mine_indices = sample_mine_indices(
+                rng, self._num_indices, safe_indices, self.mines, self.per_cell
+            )
+        self._set_mine_coords([self._index_coord(i) for i in mine_indices])
+        self.seed = seed
+        self.safe_coords = sorted(safe_coords) if safe_coords else None
+        self.no_guess_click = no_guess_click
+        logger.debug(
+            "Populated minefield with %s mines using seed %s",
+            len(self.mine_coords),
+            seed,
+        )
 
-        avble_list = list(avble_set) * self.per_cell
-        random.shuffle(avble_list)
-        self.mine_coords = avble_list[: self.mines]
+    def regenerate(self) -> "MinefieldBase":
+        """
+        Create a new minefield by populating with the same arguments as this
+        one, e.g. after loading from JSON.
+
+        :return:
+            The new minefield, with the same mines as this one.
+        :raise ValueError:
+            If the minefield was not populated randomly.
+        """
+        if self.seed is None:
+            raise ValueError("Minefield was not populated from a seed")
+        mf = type(self)(self.all_coords, mines=self.mines, per_cell=self.per_cell)
+        mf.populate(
+            self.safe_coords, seed=self.seed, no_guess_click=self.no_guess_click
+        )
+        return mf
+
+    def _set_mine_coords(self, mine_coords: List[C]) -> None:
+        """
+        Set the mine coords, building the dense mine counts alongside them.
+
+        :param mine_coords:
+            List of coords containing mines, repeated for multiple mines.
+        """
+        mine_counts = array.array("B", bytes(self._num_indices))
+        for c in mine_coords:
+            mine_counts[self._coord_index(c)] += 1
+        self.mine_coords = mine_coords
+        self._mine_counts = mine_counts
         self.populated = True
-        logger.debug("Populated minefield with %s mines", len(self.mine_coords))
+
+    def _sample_no_guess_mine_indices(
+        self, rng: random.Random, safe_indices: List[int], click: int
+    ) -> List[int]:
+        """
+        Choose the cells to place mines in such that the minefield can be solved
+        without guessing, as flat indices.
+
+        :param rng:
+            The random number generator to use.
+        :param safe_indices:
+            Indices of cells that must not contain a mine.
+        :param click:
+            The index of the first click.
+        :return:
+            The indices of cells containing mines, repeated for multiple mines.
+        """
+        raise NotImplementedError(
+            f"No-guess minefields not supported by {type(self).__name__}"
+        )
+
+    @property
+    @abc.abstractmethod
+    def _num_indices(self) -> int:
+        """The size of the dense mine counts array."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _coord_index(self, coord: C) -> int:
+        """Get the index of a coord in the dense mine counts array."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _index_coord(self, index: int) -> C:
+        """Get the coord at an index of the dense mine counts array."""
+        raise NotImplementedError
 
     @abc.abstractmethod
     def _calc_3bv(self) -> int:
@@ -0,0 +1,387 @@
+# October 2026
+
+"""
+Generation of minefields that can be solved without guessing.
+
+Candidate minefields are generated randomly and checked by playing them with a
+deterministic logical solver from the first click, retrying until a candidate
+is solved or the time budget runs out. Regular game mode only.
+
+The solver works on flat, row-major arrays and only uses local deductions:
+ - Single-point: a number whose remaining mines are zero (or fill all of its
+   unknown neighbours) reveals (or flags) those neighbours.
+ - Pairwise: comparing two nearby numbers, if the difference in their
+   remaining mines can only be made up by filling the cells only next to one
+   and leaving empty the cells only next to the other, those cells are solved.
+   This covers the usual subset rule.
+ - Mine count: once all remaining mines are accounted for (or all unknown cells
+   must be mines) the rest of the board is solved.
+
+Numbers are only re-examined when a neighbouring cell has changed, and pairs of
+numbers are only compared when one of them has changed since the last time.
+
+"""
+
+__all__ = ("NoGuessStats", "generate_no_guess", "is_solvable")
+
+import functools
+import logging
+import multiprocessing
+import random
+import time
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+import attr
+
+from .minefield import sample_mine_indices
+
+
+logger = logging.getLogger(__name__)
+
+
+_UNKNOWN = 0
+_REVEALED = 1
+_MINE = 2
+
+
+@attr.attrs(auto_attribs=True, kw_only=True)
+class NoGuessStats:
+    """Statistics about generating a no-guess minefield."""
+
+    # The number of candidate minefields generated.
+    attempts: int = 0
+    # Whether a candidate was solved, otherwise the last candidate is used.
+    solved: bool = False
+    # The time taken in seconds.
+    elapsed: float = 0.0
+
+
+@attr.attrs(auto_attribs=True, kw_only=True, frozen=True)
+class _Params:
+    x_size: int
+    y_size: int
+    mines: int
+    per_cell: int
+    safe_indices: Tuple[int, ...]
+    click: int
+
+
+@functools.lru_cache(maxsize=8)
+def _get_nbrs(x_size: int, y_size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Get the flat indices of the neighbours of each cell, excluding itself."""
+    nbrs = []
+    for y in range(y_size):
+        for x in range(x_size):
+            nbrs.append(
+                tuple(
+                    j * x_size + i
+                    for j in range(max(0, y - 1), min(y_size, y + 2))
+                    for i in range(max(0, x - 1), min(x_size, x + 2))
+                    if (i, j) != (x, y)
+                )
+            )
+    return tuple(nbrs)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_nearby(x_size: int, y_size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get the flat indices of the cells that may share a neighbour with each
+    cell, i.e. those in the surrounding 5x5 block, excluding itself.
+    """
+    nearby = []
+    for y in range(y_size):
+        for x in range(x_size):
+            nearby.append(
+                tuple(
+                    j * x_size + i
+                    for j in range(max(0, y - 2), min(y_size, y + 3))
+                    for i in range(max(0, x - 2), min(x_size, x + 3))
+                    if (i, j) != (x, y)
+                )
+            )
+    return tuple(nearby)
+
+
+def is_solvable(
+    mine_counts: Sequence[int],
+    x_size: int,
+    y_size: int,
+    click: int,
+    *,
+    per_cell: int = 1,
+) -> bool:
+    """
+    Check whether a minefield can be solved by logic alone.
+
+    :param mine_counts:
+        The number of mines in each cell, as a flat, row-major array.
+    :param x_size:
+        The number of columns.
+    :param y_size:
+        The number of rows.
+    :param click:
+        The flat index of the first click, which must be safe.
+    :param per_cell:
+        Maximum number of mines per cell.
+    :return:
+        Whether all the safe cells can be revealed without guessing.
+    """
+    nbrs = _get_nbrs(x_size, y_size)
+    nearby = _get_nearby(x_size, y_size)
+    numbers = [sum(mine_counts[j] for j in nb) for nb in nbrs]
+    state = bytearray(len(mine_counts))
+    unrevealed_safe = sum(1 for n in mine_counts if n == 0)
+    unknown_cells = len(mine_counts)
+    unknown_mines = sum(mine_counts)
+    # Revealed numbers to check with the single-point rule, and those to check
+    # with the pairwise rule.
+    dirty: Set[int] = set()
+    changed: Set[int] = set()
+
+    def reveal(idx: int) -> None:
+        nonlocal unrevealed_safe, unknown_cells
+        stack = [idx]
+        while stack:
+            i = stack.pop()
+            if state[i] != _UNKNOWN:
+                continue
+            # The deductions are sound, so only safe cells are revealed.
+            assert mine_counts[i] == 0
+            state[i] = _REVEALED
+            unrevealed_safe -= 1
+            unknown_cells -= 1
+            if numbers[i] == 0:
+                stack.extend(j for j in nbrs[i] if state[j] == _UNKNOWN)
+            else:
+                dirty.add(i)
+            for j in nbrs[i]:
+                if state[j] == _REVEALED and numbers[j]:
+                    dirty.add(j)
+
+    def mark_mine(i: int) -> None:
+        nonlocal unknown_cells, unknown_mines
+        if state[i] != _UNKNOWN:
+            return
+        assert mine_counts[i] == per_cell
+        state[i] = _MINE
+        unknown_cells -= 1
+        unknown_mines -= per_cell
+        for j in nbrs[i]:
+            if state[j] == _REVEALED:
+                dirty.add(j)
+
+    def constraint(i: int) -> Tuple[Set[int], int]:
+        unknown = set()
+        rem = numbers[i]
+        for j in nbrs[i]:
+            if state[j] == _UNKNOWN:
+                unknown.add(j)
+            elif state[j] == _MINE:
+                rem -= per_cell
+        return unknown, rem
+
+    reveal(click)
+    while unrevealed_safe:
+        # Apply the single-point rule until there is nothing left to do.
+        while dirty:
+            i = dirty.pop()
+            unknown, rem = constraint(i)
+            if not unknown:
+                continue
+            if rem == 0:
+                for j in unknown:
+                    reveal(j)
+            elif rem == len(unknown) * per_cell:
+                for j in unknown:
+                    mark_mine(j)
+            else:
+                changed.add(i)
+        if not unrevealed_safe:
+            break
+
+        # Compare pairs of numbers, at least one of which has changed.
+        progress = False
+        checking, changed = changed, set()
+        for i in checking:
+            unknown_i, rem_i = constraint(i)
+            if not unknown_i:
+                continue
+            for j in nearby[i]:
+                if state[j] != _REVEALED or not numbers[j]:
+                    continue
+                unknown_j, rem_j = constraint(j)
+                if not unknown_j or unknown_i.isdisjoint(unknown_j):
+                    continue
+                only_i = unknown_i - unknown_j
+                only_j = unknown_j - unknown_i
+                diff = rem_j - rem_i
+                if diff == len(only_j) * per_cell:
+                    full, empty = only_j, only_i
+                elif -diff == len(only_i) * per_cell:
+                    full, empty = only_i, only_j
+                else:
+                    continue
+                for k in full:
+                    mark_mine(k)
+                for k in empty:
+                    reveal(k)
+                if full or empty:
+                    progress = True
+                    break
+            if progress:
+                # Carry on checking the others once the changes are handled.
+                changed |= checking
+                break
+        if progress:
+            continue
+
+        # Finally use the number of mines left.
+        if unknown_mines == 0 or unknown_mines == unknown_cells * per_cell:
+            for i in range(len(state)):
+                if state[i] == _UNKNOWN:
+                    if unknown_mines:
+                        mark_mine(i)
+                    else:
+                        reveal(i)
+            continue
+        return False
+    return True
+
+
+def _try_candidate(params: _Params, seed: int) -> Tuple[List[int], bool]:
+    """
+    Generate a candidate minefield and check whether it is solvable.
+
+    :return:
+        A tuple of the mine indices and whether the minefield is solvable.
+    """
+    num_cells = params.x_size * params.y_size
+    mine_indices = sample_mine_indices(
+        random.Random(seed),
+        num_cells,
+        params.safe_indices,
+        params.mines,
+        params.per_cell,
+    )
+    mine_counts = bytearray(num_cells)
+    for idx in mine_indices:
+        mine_counts[idx] += 1
+    solvable = is_solvable(
+        mine_counts,
+        params.x_size,
+        params.y_size,
+        params.click,
+        per_cell=params.per_cell,
+    )
+    return mine_indices, solvable
+
+
+def generate_no_guess(
+    x_size: int,
+    y_size: int,
+    mines: int,
+    click: int,
+    *,
+    safe_indices: Optional[Iterable[int]] = None,
+    per_cell: int = 1,
+    seed: Optional[int] = None,
+    time_budget: float = 1.0,
+    processes: Optional[int] = None,
+) -> Tuple[List[int], NoGuessStats]:
+    """
+    Generate a minefield that can be solved without guessing.
+
+    Candidates are generated from seeds derived from the given seed and checked
+    in order, so given the same seed the same minefield is produced regardless
+    of the number of processes, provided a candidate is solved in time.
+
+    :param x_size:
+        The number of columns.
+    :param y_size:
+        The number of rows.
+    :param mines:
+        The number of mines.
+    :param click:
+        The flat, row-major index of the first click.
+    :param safe_indices:
+        Indices of cells that must not contain a mine, by default the first
+        click and its neighbours. Must include the first click.
+    :param per_cell:
+        Maximum number of mines per cell.
+    :param seed:
+        Seed for the random number generation, or None to seed randomly.
+    :param time_budget:
+        The time in seconds after which to give up, in which case the last
+        candidate is used even though it cannot be solved, and the stats show
+        that no solvable candidate was found.
+    :param processes:
+        The number of worker processes to check candidates in parallel, or None
+        to check them in the current process.
+    :return:
+        A tuple of the indices of cells containing mines (repeated for multiple
+        mines) and stats about the generation.
+    :raise ValueError:
+        If the number of mines is too high.
+    """
+    if safe_indices is None:
+        y, x = divmod(click, x_size)
+        safe_indices = [
+            j * x_size + i
+            for j in range(max(0, y - 1), min(y_size, y + 2))
+            for i in range(max(0, x - 1), min(x_size, x + 2))
+        ]
+    safe_indices = tuple(sorted(set(safe_indices) | {click}))
+    mine_spaces = x_size * y_size - len(safe_indices)
+    if mines > mine_spaces * per_cell:
+        raise ValueError(
+            f"Number of mines too high: {mines} in {mine_spaces} "
+            f"spaces with max {per_cell} per cell"
+        )
+    params = _Params(
+        x_size=x_size,
+        y_size=y_size,
+        mines=mines,
+        per_cell=per_cell,
+        safe_indices=safe_indices,
+        click=click,
+    )
+    rng = random.Random(seed)
+    stats = NoGuessStats()
+    start = time.monotonic()
+
+    def out_of_time() -> bool:
+        return time.monotonic() - start >= time_budget
+
+    if processes is None:
+        while True:
+            mine_indices, stats.solved = _try_candidate(params, rng.getrandbits(64))
+            stats.attempts += 1
+            if stats.solved or out_of_time():
+                break
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            while True:
+                seeds = [rng.getrandbits(64) for _ in range(processes)]
+                results = pool.starmap(_try_candidate, [(params, s) for s in seeds])
+                for mine_indices, stats.solved in results:
+                    stats.attempts += 1
+                    if stats.solved:
+                        break
+                if stats.solved or out_of_time():
+                    break
+
+    stats.elapsed = time.monotonic() - start
+    if stats.solved:
+        logger.debug(
+            "Generated no-guess minefield after %d attempts in %.3fs",
+            stats.attempts,
+            stats.elapsed,
+        )
+    else:
+        logger.warning(
+            "Failed to generate no-guess minefield in %.3fs (%d attempts)",
+            stats.elapsed,
+            stats.attempts,
+        )
+    return mine_indices, stats
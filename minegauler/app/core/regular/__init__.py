@@ -7,10 +7,12 @@ __all__ = (
     "Game",
     "GameController",
     "CreateController",
+    "bitboard",
     "mode",
 )
 
 from ...shared.types import GameMode
+from . import bitboard
 from .board import Board
 from .controller import CreateController, GameController
 from .game import Game
@@ -0,0 +1,398 @@
+# October 2026
+
+"""
+Alternative regular game engine using bitboards.
+
+The minefield's mines, the unclicked cells, the revealed cells and the flags
+are each stored as a Python int with one bit per cell, in row-major order with
+one padding bit at the end of each row so that shifting left or right by one
+never wraps into a neighbouring row. Neighbour counts are calculated with
+bit-sliced addition of shifted copies of the mines, openings are found by
+repeatedly dilating the revealed blanks, and flags next to a cell are counted
+for chording by masking.
+
+Any operation on a Python int takes time proportional to the size of the
+board, so changes to single cells are collected and only applied to the
+bitboards when they are next needed, and single cells are looked up in the
+minefield's arrays rather than by testing bits. Completion is detected using
+the running count of unrevealed safe cells, as in the standard game.
+
+The game produces exactly the same cell updates as the standard regular game,
+and this module provides the same names as the 'regular' package so that it
+can be used as a game mode implementation, e.g. by setting
+`engine.GAME_MODE_IMPL[GameMode.REGULAR]` to this module.
+
+"""
+
+__all__ = (
+    "Coord",
+    "Minefield",
+    "Board",
+    "Game",
+    "GameController",
+    "CreateController",
+    "mode",
+)
+
+import array
+import logging
+import sys
+from typing import Container, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ...shared.types import CellContents, GameMode, GameState
+from ..board import shared_per_size
+from ..game import _check_coord, _ignore_if_not
+from . import controller, game
+from .board import Board
+from .controller import CreateController
+from .minefield import Minefield
+from .types import Coord
+
+
+logger = logging.getLogger(__name__)
+
+mode = GameMode.REGULAR
+
+_NBR_OFFSETS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+
+
+class _Layout:
+    """The bit layout for a given board size."""
+
+    def __init__(self, x_size: int, y_size: int):
+        self.x_size: int = x_size
+        self.y_size: int = y_size
+        # Each row has a padding bit at the end.
+        self.width: int = x_size + 1
+        self.num_bytes: int = (self.width * y_size + 7) // 8
+        row = (1 << x_size) - 1
+        self.valid: int = sum(row << (y * self.width) for y in range(y_size))
+        # The 3x3 block around the cell at bit 'width + 1'.
+        self._block: int = 0b111 * (1 | 1 << self.width | 1 << 2 * self.width)
+
+    def bit(self, x: int, y: int) -> int:
+        """Get the bit index of a cell."""
+        return y * self.width + x
+
+    def block(self, x: int, y: int) -> int:
+        """
+        Get the 3x3 block around a cell. This may include padding bits or bits
+        beyond the board, which are never set in the other bitboards.
+        """
+        offset = self.bit(x, y) - self.width - 1
+        return self._block << offset if offset >= 0 else self._block >> -offset
+
+    def mask_of(self, bits: Iterable[int]) -> int:
+        """Create a bitboard with the given bit indices set."""
+        bits = list(bits)
+        if not bits:
+            return 0
+        buf = bytearray(self.num_bytes)
+        for i in bits:
+            buf[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buf, "little")
+
+    def from_mask(self, mask: bytes) -> int:
+        """Create a bitboard from a row-major mask of ASCII '0' and '1' bytes."""
+        x_size = self.x_size
+        padded = b"0".join(
+            mask[y * x_size : (y + 1) * x_size] for y in range(self.y_size)
+        )
+        # Reverse so the first cell is the least significant bit.
+        return int(padded[::-1], 2) if padded else 0
+
+    def from_counts(self, counts: bytes) -> List[int]:
+        """
+        Convert row-major cell counts to bit planes, with plane k containing the
+        cells that have bit k set in their count.
+        """
+        planes = []
+        max_count = max(counts, default=0)
+        k = 0
+        while max_count >> k:
+            table = bytes(ord("1") if (v >> k) & 1 else ord("0") for v in range(256))
+            planes.append(self.from_mask(counts.translate(table)))
+            k += 1
+        return planes
+
+    def shift(self, b: int, dx: int, dy: int) -> int:
+        """
+        Shift a bitboard so each cell takes the value of the cell at the given
+        offset from it (or zero beyond the edges of the board).
+        """
+        offset = dy * self.width + dx
+        shifted = b >> offset if offset >= 0 else b << -offset
+        return shifted & self.valid
+
+    def dilate(self, b: int) -> int:
+        """Add the neighbours of each set cell."""
+        horiz = b | b << 1 | b >> 1
+        return (horiz | horiz << self.width | horiz >> self.width) & self.valid
+
+    def nbr_sums(self, planes: List[int]) -> List[int]:
+        """
+        Sum the values of the neighbours of each cell, excluding the cell
+        itself, with the values and the results given as bit planes.
+        """
+        total: List[int] = []
+        for dx, dy in _NBR_OFFSETS:
+            total = _add_planes(total, [self.shift(p, dx, dy) for p in planes])
+        return total
+
+    def iter_bits(self, b: int) -> Iterator[Tuple[int, int]]:
+        """Iterate over the (x, y) positions of the set cells."""
+        # Search a binary string rather than repeatedly taking the lowest bit,
+        # which would take quadratic time in the size of the board.
+        bits = bin(b)[:1:-1]
+        i = bits.find("1")
+        while i >= 0:
+            y, x = divmod(i, self.width)
+            yield x, y
+            i = bits.find("1", i + 1)
+
+
+@shared_per_size(maxsize=8)
+def _get_layout(x_size: int, y_size: int) -> _Layout:
+    return _Layout(x_size, y_size)
+
+
+def _add_planes(a: List[int], b: List[int]) -> List[int]:
+    """Add two bit-sliced numbers using a ripple-carry adder."""
+    result = []
+    carry = 0
+    for i in range(max(len(a), len(b))):
+        x = a[i] if i < len(a) else 0
+        y = b[i] if i < len(b) else 0
+        result.append(x ^ y ^ carry)
+        carry = (x & y) | (carry & (x ^ y))
+    if carry:
+        result.append(carry)
+    return result
+
+
+def _split_codes(codes: array.array) -> Tuple[bytes, bytes]:
+    """
+    Split cell contents codes into their type tags and numbers, with one byte
+    per cell for each.
+    """
+    shift = CellContents.CODE_NUM_BITS
+    if shift == 8 and codes.itemsize == 2:
+        # Split the bytes of the codes rather than each code in turn.
+        raw = codes.tobytes()
+        low, high = raw[0::2], raw[1::2]
+        return (high, low) if sys.byteorder == "little" else (low, high)
+    num_mask = (1 << shift) - 1
+    return bytes(c >> shift for c in codes), bytes(c & num_mask for c in codes)
+
+
+def _tag_table(tags: Container[int], match: bytes, other: bytes) -> bytes:
+    """Create a translation table mapping the given tags to one byte value."""
+    return b"".join(match if t in tags else other for t in range(256))
+
+
+class _GameBits:
+    """The bitboards for a game with a populated minefield."""
+
+    def __init__(self, layout: _Layout, mf: Minefield, board: Board):
+        self.layout = layout
+        mine_planes = layout.from_counts(bytes(mf._mine_counts))
+        self.mines: int = 0
+        for plane in mine_planes:
+            self.mines |= plane
+        self.safe: int = layout.valid & ~self.mines
+        # The neighbouring mine counts, as bit planes.
+        self.numbers: List[int] = layout.nbr_sums(mine_planes)
+        has_number = 0
+        for plane in self.numbers:
+            has_number |= plane
+        self.blanks: int = self.safe & ~has_number
+        # Use the row-major cell codes rather than creating cell contents.
+        tags, nums = _split_codes(board.cell_codes)
+        shift = CellContents.CODE_NUM_BITS
+        unclicked_tag = CellContents.Unclicked.code >> shift
+        num_tag = CellContents.Num(0).code >> shift
+        self.unclicked: int = layout.from_mask(
+            tags.translate(_tag_table({unclicked_tag}, b"1", b"0"))
+        )
+        self.revealed: int = layout.from_mask(
+            tags.translate(_tag_table({num_tag}, b"1", b"0"))
+        )
+        # The flags (and hit mines) counted when chording, as bit planes.
+        mine_type_tags = {
+            c.code >> shift for c in (CellContents.Flag(1), CellContents.HitMine(1))
+        }
+        is_mine_type = tags.translate(_tag_table(mine_type_tags, b"\xff", b"\x00"))
+        flag_counts = int.from_bytes(nums, "little") & int.from_bytes(
+            is_mine_type, "little"
+        )
+        self.flags: List[int] = layout.from_counts(
+            flag_counts.to_bytes(len(nums), "little")
+        )
+
+    def apply(self, changes: Mapping[int, CellContents]) -> None:
+        """
+        Update the bitboards for changes to the board.
+
+        :param changes:
+            The new contents of the changed cells, by bit index.
+        """
+        layout = self.layout
+        changed = layout.mask_of(changes)
+        self.unclicked = self.unclicked & ~changed | layout.mask_of(
+            i for i, state in changes.items() if state is CellContents.Unclicked
+        )
+        self.revealed |= layout.mask_of(
+            i for i, state in changes.items() if type(state) is CellContents.Num
+        )
+        flag_counts = {
+            i: state.num
+            for i, state in changes.items()
+            if type(state) in (CellContents.Flag, CellContents.HitMine)
+        }
+        num_planes = max(
+            len(self.flags), max(flag_counts.values(), default=0).bit_length()
+        )
+        self.flags = [
+            (self.flags[k] if k < len(self.flags) else 0) & ~changed
+            | layout.mask_of(i for i, n in flag_counts.items() if (n >> k) & 1)
+            for k in range(num_planes)
+        ]
+
+    def count_flags(self, cells: int) -> int:
+        """Count the flags in the given cells."""
+        return sum(
+            bin(plane & cells).count("1") << k for k, plane in enumerate(self.flags)
+        )
+
+    def numbers_in(self, cells: int) -> Dict[Tuple[int, int], int]:
+        """Get the number of mines next to each of the given cells."""
+        numbers = dict.fromkeys(self.layout.iter_bits(cells), 0)
+        for k, plane in enumerate(self.numbers):
+            for pos in self.layout.iter_bits(plane & cells):
+                numbers[pos] += 1 << k
+        return numbers
+
+    def find_opening(self, x: int, y: int) -> int:
+        """
+        Find the unclicked cells revealed by clicking a blank cell, spreading
+        through unclicked blanks. The clicked cell may already be revealed,
+        e.g. by an earlier opening when chording.
+        """
+        reached = 1 << self.layout.bit(x, y)
+        while True:
+            spread = self.layout.dilate(reached & self.blanks) & self.unclicked
+            spread |= reached
+            if spread == reached:
+                return reached & self.unclicked
+            reached = spread
+
+
+class Game(game.Game):
+    """A regular minesweeper game using bitboards."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._layout: _Layout = _get_layout(self.x_size, self.y_size)
+        # Created once the minefield is populated.
+        self._bits: Optional[_GameBits] = None
+        # Changes to single cells not yet applied to the bitboards, by bit
+        # index.
+        self._pending_bits: Dict[int, CellContents] = {}
+
+    def _get_bits(self) -> _GameBits:
+        """Get the bitboards, applying any pending changes."""
+        if self._bits is None:
+            self._bits = _GameBits(self._layout, self.mf, self.board)
+            self._pending_bits = {}
+        elif self._pending_bits:
+            self._bits.apply(self._pending_bits)
+            self._pending_bits = {}
+        return self._bits
+
+    def _count_unrevealed_safe_cells(self) -> int:
+        bits = self._get_bits()
+        return bin(bits.safe & ~bits.revealed).count("1")
+
+    def _set_cell(self, coord: Coord, state: CellContents) -> None:
+        super()._set_cell(coord, state)
+        if self._bits is not None:
+            self._pending_bits[self._layout.bit(*coord)] = state
+
+    def _is_complete(self) -> bool:
+        # Use the running count of unrevealed safe cells, so that the bitboards
+        # are only updated when needed for an opening or chording.
+        complete = super()._is_complete()
+        if self._check_tracked_state:
+            assert complete == (self._count_unrevealed_safe_cells() == 0)
+        return complete
+
+    def _select_cell_action(self, coord: Coord) -> None:
+        """
+        Implementation of the action of selecting/clicking a cell.
+        """
+        if self.mf[coord] == 0 and self.mf.completed_board[coord] is CellContents.Num(
+            0
+        ):
+            bits = self._get_bits()
+            logger.debug("Opening hit at %s", coord)
+            self._reveal_opening(bits, bits.find_opening(*coord))
+        else:
+            # Mines and single cells are handled as in the standard game.
+            super()._select_cell_action(coord)
+
+    def _reveal_opening(self, bits: _GameBits, opening: int) -> None:
+        """
+        Reveal the unclicked cells of an opening, updating the bitboards once
+        for the whole opening.
+        """
+        board = self.board
+        cell_updates = self._cell_updates
+        tracker = self._get_rem_3bv_tracker()
+        # Make sure the count is taken before the board is changed.
+        self._get_unrevealed_safe_cells()
+        numbers = bits.numbers_in(opening)
+        for (x, y), num in numbers.items():
+            coord = board.get_coord_at(x, y)
+            state = CellContents.Num(num)
+            board[coord] = state
+            cell_updates[coord] = state
+            tracker.reveal(coord)
+        self._unrevealed_safe_cells -= len(numbers)
+        bits.unclicked &= ~opening
+        bits.revealed |= opening
+
+    @_check_coord
+    @_ignore_if_not(game_state=GameState.ACTIVE, cell_state=CellContents.Num)
+    def chord_on_cell(self, coord: Coord) -> Mapping[Coord, CellContents]:
+        """Chord on a cell that contains a revealed number."""
+        bits = self._get_bits()
+        block = self._layout.block(*coord)
+        num_flagged_nbrs = bits.count_flags(block)
+        logger.debug(
+            "%s flagged mine(s) around clicked cell showing number %s",
+            num_flagged_nbrs,
+            self.board[coord],
+        )
+        unclicked = block & bits.unclicked
+        if self.board[coord] != CellContents.Num(num_flagged_nbrs) or not unclicked:
+            return {}
+
+        # Select the cells in the same order as the standard game.
+        unclicked_nbrs = [
+            self.board.get_coord_at(x, y)
+            for x, y in sorted(self._layout.iter_bits(unclicked))
+        ]
+        logger.info("Successful chording, selecting cells %s", unclicked_nbrs)
+        for c in unclicked_nbrs:
+            self._select_cell_action(c)
+
+        if self.state != GameState.LOST:
+            self._check_for_completion()
+
+        return self._take_cell_updates()
+
+
+class GameController(controller.GameController):
+    """GameController for a regular minesweeper game using bitboards."""
+
+    game_cls = Game
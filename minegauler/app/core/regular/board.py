@@ -1,20 +1,66 @@
 # October 2021, Lewis Gaul
 
-from typing import Iterable, List, Union
+import array
+from typing import Iterable, List, Tuple, Union
 
 from ...shared import utils
 from ...shared.types import CellContents, GameMode
-from ..board import BoardBase
+from ..board import BoardBase, shared_per_size
 from .types import Coord
 
 
+class _BoardLayout:
+    """
+    Coordinate tables for a given board size, shared between boards.
+
+    Cells are indexed in row-major order, i.e. the index of (x, y) is
+    `y * x_size + x`.
+    """
+
+    def __init__(self, x_size: int, y_size: int):
+        self.x_size: int = x_size
+        self.y_size: int = y_size
+        # Coords in index order.
+        self.coords: Tuple[Coord, ...] = tuple(
+            Coord(x, y) for y in range(y_size) for x in range(x_size)
+        )
+        # Coords in column-major order, as returned by Board.all_coords.
+        self.all_coords: Tuple[Coord, ...] = tuple(
+            self.coords[y * x_size + x] for x in range(x_size) for y in range(y_size)
+        )
+        # Neighbouring coords of each cell in index order, including the cell
+        # itself. Built up front and never modified, so the layout can be
+        # shared between threads.
+        x_ranges = [range(max(0, x - 1), min(x_size, x + 2)) for x in range(x_size)]
+        y_ranges = [range(max(0, y - 1), min(y_size, y + 2)) for y in range(y_size)]
+        self.nbrs: Tuple[Tuple[Coord, ...], ...] = tuple(
+            tuple(self.coords[j * x_size + i] for i in x_ranges[x] for j in y_ranges[y])
+            for y in range(y_size)
+            for x in range(x_size)
+        )
+
+
+@shared_per_size(maxsize=32)
+def _get_layout(x_size: int, y_size: int) -> _BoardLayout:
+    return _BoardLayout(x_size, y_size)
+
+
 class Board(BoardBase):
     """A regular minesweeper board."""
 
+    # The cells are stored as a flat, row-major array of the cell contents
+    # codes, with coord and neighbour lookups shared between all boards
+    # of the same size.
+
     mode = GameMode.REGULAR
 
     def __init__(self, x_size: int, y_size: int):
-        self._grid = utils.Grid(x_size, y_size, fill=CellContents.Unclicked)
+        self.x_size: int = x_size
+        self.y_size: int = y_size
+        self._layout = _get_layout(x_size, y_size)
+        self._cells = array.array("H", [CellContents.Unclicked.code]) * (
+            x_size * y_size
+        )
 
     @classmethod
     def from_2d_array(cls, array: List[List[Union[str, int]]]) -> "Board":
@@ -43,55 +89,98 @@ class Board(BoardBase):
                 )
         return board
 
+    @classmethod
+    def from_flat_array(
+        cls, x_size: int, y_size: int, cells: List[CellContents]
+    ) -> "Board":
+        """
+        Create an instance from a flat array of cell contents.
+
+        :param x_size:
+            Number of columns in the board.
+        :param y_size:
+            Number of rows in the board.
+        :param cells:
+            The cell contents in row-major order.
+        """
+        if len(cells) != x_size * y_size:
+            raise ValueError(
+                f"Expected {x_size * y_size} cells for a {x_size}x{y_size} board, "
+                f"got {len(cells)}"
+            )
+        board = cls(x_size, y_size)
+        board._cells = array.array("H", [c.code for c in cells])
+        return board
+
     def __repr__(self):
         return f"<{self.x_size}x{self.y_size} board>"
 
+    def copy(self) -> "Board":
+        """Create a copy of the board, which can be modified independently."""
+        board = type(self)(self.x_size, self.y_size)
+        board._cells = array.array("H", self._cells)
+        return board
+
     def __str__(self):
-        return self._grid.__str__(mapping={CellContents.Num(0): "."})
+        grid = utils.Grid(self.x_size, self.y_size)
+        for i, c in enumerate(self._layout.coords):
+            grid[c] = CellContents.from_code(self._cells[i])
+        return grid.__str__(mapping={CellContents.Num(0): "."})
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Board):
             return False
-        return self._grid == other._grid
+        return (self.x_size, self.y_size) == (other.x_size, other.y_size) and (
+            self._cells == other._cells
+        )
 
     def __getitem__(self, coord: Coord) -> CellContents:
-        return self._grid[coord]
+        return CellContents.from_code(self._cells[self._index(coord)])
 
     def __setitem__(self, coord: Coord, value: CellContents):
         if not isinstance(value, CellContents):
             raise TypeError("Board can only contain CellContents instances")
-        self._grid[coord] = value
-
-    def __contains__(self, coord: Coord) -> bool:
-        return coord in self.all_coords
+        self._cells[self._index(coord)] = value.code
 
     @property
-    def x_size(self):
-        return self._grid.x_size
+    def cell_codes(self) -> array.array:
+        """
+        A copy of the codes of the cell contents (see 'CellContents.code'), in
+        row-major order.
+        """
+        return array.array("H", self._cells)
 
-    @property
-    def y_size(self):
-        return self._grid.y_size
+    def __contains__(self, coord: Coord) -> bool:
+        x, y = coord
+        return 0 <= x < self.x_size and 0 <= y < self.y_size
 
     @property
     def all_coords(self) -> List[Coord]:
-        return [Coord(*c) for c in self._grid.all_coords]
+        return list(self._layout.all_coords)
 
     def fill(self, value: CellContents) -> None:
-        for c in self.all_coords:
-            self[c] = value
+        if not isinstance(value, CellContents):
+            raise TypeError("Board can only contain CellContents instances")
+        self._cells = array.array("H", [value.code]) * len(self._cells)
 
     def get_nbrs(self, coord: Coord, *, include_origin=False) -> Iterable[Coord]:
-        return [
-            Coord(*c) for c in self._grid.get_nbrs(coord, include_origin=include_origin)
-        ]
+        nbrs = list(self._layout.nbrs[self._index(coord)])
+        if not include_origin:
+            nbrs.remove(coord)
+        return nbrs
 
     def get_coord_at(self, x: int, y: int) -> Coord:
         if x < 0 or x >= self.x_size or y < 0 or y >= self.y_size:
             raise ValueError(f"Position out of bounds: ({x}, {y})")
-        return Coord(x, y)
+        return self._layout.coords[y * self.x_size + x]
 
     def reset(self):
         """Reset the board to the initial state."""
-        for c in self.all_coords:
-            self[c] = CellContents.Unclicked
+        self.fill(CellContents.Unclicked)
+
+    def _index(self, coord: Coord) -> int:
+        """Get the index of a coord in the flat cell array."""
+        x, y = coord
+        if not (0 <= x < self.x_size and 0 <= y < self.y_size):
+            raise IndexError(f"Coord {coord} out of bounds")
+        return y * self.x_size + x
@@ -4,17 +4,66 @@ __all__ = ("Game",)
 
 import logging
 import time
+from typing import Iterable, List, Optional
 
 from ...shared.types import CellContents, Difficulty, GameMode, GameState
-from ..game import GameBase, GameNotStartedError
+from ..game import GameBase, GameNotStartedError, Rem3bvTrackerBase
 from .board import Board
-from .minefield import Minefield
+from .minefield import Minefield, block_sums
 from .types import Coord
 
 
 logger = logging.getLogger(__name__)
 
 
+class _Rem3bvTracker(Rem3bvTrackerBase):
+    """
+    Track the remaining 3bv of a regular game, with cells indexed in row-major
+    order.
+    """
+
+    def __init__(self, mf: Minefield):
+        self._mf = mf
+        self._x_size: int = mf.x_size
+        self._y_size: int = mf.y_size
+        # Getting the labels calculates the blanks.
+        labels = mf._get_opening_labels()
+        nbr_blanks = block_sums(mf._blanks, self._x_size, self._y_size)
+        super().__init__(
+            labels=labels,
+            opening_sizes=[
+                sum(end - start for start, end in runs)
+                for runs in mf._get_opening_runs()
+            ],
+            nbr_blanks=nbr_blanks,
+            isolated=sum(
+                1
+                for mines, blanks in zip(mf._mine_counts, nbr_blanks)
+                if mines == 0 and blanks == 0
+            ),
+            num_cells=mf._num_indices,
+        )
+
+    def _index(self, coord: Coord) -> int:
+        return coord.y * self._x_size + coord.x
+
+    def _nbr_indices(self, idx: int) -> List[int]:
+        x_size = self._x_size
+        y, x = divmod(idx, x_size)
+        return [
+            j * x_size + i
+            for j in range(max(0, y - 1), min(self._y_size, y + 2))
+            for i in range(max(0, x - 1), min(x_size, x + 2))
+        ]
+
+    def _opening_blanks(self, label: int) -> Iterable[int]:
+        return (
+            i
+            for start, end in self._mf._get_opening_runs()[label]
+            for i in range(start, end)
+        )
+
+
 class Game(GameBase):
     """A regular minesweeper game."""
 
@@ -35,6 +84,11 @@ class Game(GameBase):
         # fmt: on
     ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Created once the minefield is populated.
+        self._rem_3bv_tracker: Optional[_Rem3bvTracker] = None
+
     # ---------------------
     # Abstract methods
     # ---------------------
@@ -50,66 +104,65 @@ class Game(GameBase):
         elif self.state is GameState.WON:
             return 0
 
-        # Partially completed board - do the real work!
-
-        partial_mf = Minefield.from_coords(
-            self.mf.all_coords,
-            mine_coords=self.mf.mine_coords,
-            per_cell=self.per_cell,
-        )
-        # Replace any openings already found with normal clicks (ones).
-        for c in self.board.all_coords:
-            if type(self.board[c]) is CellContents.Num:
-                partial_mf.completed_board[c] = CellContents.Num(1)
-        # Find the openings which remain.
-        rem_opening_coords = {c for opening in partial_mf.openings for c in opening}
-        # Count the number of essential clicks that have already been
-        # done by counting clicked cells minus the ones at the edge of
-        # an undiscovered opening.
-        completed_3bv = len(
-            {
-                c
-                for c in self.board.all_coords
-                if type(self.board[c]) is CellContents.Num
-            }
-            - rem_opening_coords
-        )
-        return partial_mf._calc_3bv() - completed_3bv
+        return self._get_rem_3bv_tracker().rem_3bv
 
     def _populate_minefield(self, coord: Coord) -> None:
         """Create the minefield in response to a cell being selected."""
-        if self.first_success:
+        if self.first_success or self.no_guess:
             safe_coords = self.board.get_nbrs(coord, include_origin=True)
+            # No-guess minefields are solved starting from the first click.
+            no_guess_click = coord if self.no_guess else None
             logger.debug(
-                "Trying to create minefield with the following safe coordinates: %s",
+                "Trying to create %sminefield with the following safe coordinates: "
+                "%s",
+                "no-guess " if self.no_guess else "",
                 safe_coords,
             )
             try:
-                self.mf.populate(safe_coords)
+                self.mf.populate(safe_coords, no_guess_click=no_guess_click)
             except ValueError:
                 logger.info(
                     "Unable to give opening on the first click, "
                     "still ensuring a safe click"
                 )
                 # This should be guaranteed to succeed.
-                self.mf.populate(safe_coords=[coord])
+                self.mf.populate(safe_coords=[coord], no_guess_click=no_guess_click)
             else:
                 logger.debug("Successfully created minefield")
+            if self.no_guess and not self.mf.no_guess_stats.solved:
+                # Make it clear the game is not guaranteed to be solvable, e.g.
+                # so that it is treated as a normal game for highscores.
+                logger.warning(
+                    "Unable to create a no-guess minefield, continuing with a "
+                    "minefield that may require guessing"
+                )
+                self.no_guess = False
         else:
             logger.debug("Creating minefield without guaranteed first click success")
             self.mf.populate()
 
-    def _is_complete(self) -> bool:
-        return all(
-            type(self.board[c]) is CellContents.Num or c in self.mf.mine_coords
+    def _count_unrevealed_safe_cells(self) -> int:
+        return sum(
+            1
             for c in self.board.all_coords
+            if type(self.board[c]) is not CellContents.Num and self.mf[c] == 0
         )
 
+    def _set_cell(self, coord: Coord, state: CellContents) -> None:
+        super()._set_cell(coord, state)
+        if type(state) is CellContents.Num:
+            self._get_rem_3bv_tracker().reveal(coord)
+
+    def _get_rem_3bv_tracker(self) -> _Rem3bvTracker:
+        if self._rem_3bv_tracker is None:
+            self._rem_3bv_tracker = _Rem3bvTracker(self.mf)
+        return self._rem_3bv_tracker
+
     def _select_cell_action(self, coord: Coord) -> None:
         """
         Implementation of the action of selecting/clicking a cell.
         """
-        if coord in self.mf.mine_coords:
+        if self.mf[coord] > 0:
             logger.debug("Mine hit at %s", coord)
             self._set_cell(coord, CellContents.HitMine(self.mf[coord]))
             self.lives_remaining -= 1
@@ -120,10 +173,7 @@ class Game(GameBase):
                 self.state = GameState.LOST
 
                 for c in self.mf.all_coords:
-                    if (
-                        c in self.mf.mine_coords
-                        and self.board[c] is CellContents.Unclicked
-                    ):
+                    if self.mf[c] > 0 and self.board[c] is CellContents.Unclicked:
                         self._set_cell(c, CellContents.Mine(self.mf[c]))
 
                     elif (
@@ -134,30 +184,28 @@ class Game(GameBase):
             else:
                 self.mines_remaining -= self.mf[coord]
         elif self.mf.completed_board[coord] is CellContents.Num(0):
-            for full_opening in self.mf.openings:
-                if coord in full_opening:
-                    # Found the opening, quit the loop here.
-                    logger.debug("Opening hit: %s", full_opening)
-                    break
+            index = self.mf.get_opening_index(coord)
+            logger.debug("Opening hit: %d", index)
+            full_opening = self.mf.get_opening_coords(index)
+            blank = CellContents.Num(0)
+            unclicked = []
+            untouched = True
+            for c in full_opening:
+                if self.board[c] is CellContents.Unclicked:
+                    unclicked.append(c)
+                elif self.mf.completed_board[c] is blank:
+                    untouched = False
+            if untouched:
+                # The opening is untouched, so clicking any of its blanks
+                # reveals all of its unclicked cells.
+                opening = unclicked
             else:
-                raise RuntimeError(f"Coordinate {coord} not found in openings")
-
-            # Get the propagation of cells forming part of the opening.
-            opening = set()  # Coords belonging to the opening
-            check = {coord}  # Coords whose neighbours need checking
-            while check:
-                c = check.pop()
-                unclicked_nbrs = {
-                    z
-                    for z in self.board.get_nbrs(c, include_origin=True)
-                    if self.board[z] is CellContents.Unclicked
-                }
-                check |= {
-                    z
-                    for z in unclicked_nbrs - opening
-                    if self.mf.completed_board[z] is CellContents.Num(0)
-                }
-                opening |= unclicked_nbrs
+                # Propagation may be stopped by previously revealed or flagged
+                # blanks, so find the propagation of cells from the click.
+                completed_board = self.mf.completed_board
+                opening = self._find_opening(
+                    coord, lambda c: completed_board[c] is blank
+                )
 
             logger.debug("Propagated opening: %s", list(opening))
             for c in opening:
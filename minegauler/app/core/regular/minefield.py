@@ -1,13 +1,33 @@
 # October 2021, Lewis Gaul
 
-__all__ = ("Minefield", "RegularMinefieldBase")
+__all__ = (
+    "Minefield",
+    "RegularMinefieldBase",
+    "block_sums",
+    "calc_3bv",
+    "find_blank_runs",
+)
 
 import abc
-from typing import Any, Iterable, List, Mapping, Optional, TypeVar
+import array
+import random
+import re
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from ...shared import utils
 from ...shared.types import CellContents
 from ...shared.types import Coord as CoordBase
+from .. import noguess
 from ..board import BoardBase
 from ..minefield import MinefieldBase
 from .board import Board
@@ -17,6 +37,124 @@ from .types import Coord
 C = TypeVar("C", bound=CoordBase)
 B = TypeVar("B", bound=BoardBase)
 
+_Run = Tuple[int, int]
+
+_BLANK_RUN_REGEX = re.compile(rb"\x01+")
+
+
+def block_sums(values: Sequence[int], x_size: int, y_size: int) -> List[int]:
+    """
+    Sum the 3x3 block around each cell of a flat, row-major grid.
+
+    The rows are summed horizontally and then vertically using shifted copies,
+    rather than visiting the neighbours of each cell individually.
+    """
+    horiz_sums = []
+    for y in range(y_size):
+        row = [0, *values[y * x_size : (y + 1) * x_size], 0]
+        horiz_sums.append([a + b + c for a, b, c in zip(row, row[1:], row[2:])])
+    zeros = [0] * x_size
+    sums = []
+    for above, row, below in zip(
+        [zeros, *horiz_sums[:-1]], horiz_sums, [*horiz_sums[1:], zeros]
+    ):
+        sums.extend([a + b + c for a, b, c in zip(above, row, below)])
+    return sums
+
+
+def find_blank_runs(blanks: bytes, x_size: int, y_size: int) -> List[List[_Run]]:
+    """
+    Group the blank cells of a flat, row-major grid into connected components.
+
+    Horizontal runs of blanks are found a row at a time, and runs touching a
+    run in the row above (including diagonally) are merged using union-find.
+
+    :param blanks:
+        The grid, with a 1 byte for each blank cell and 0 bytes otherwise.
+    :return:
+        A list of the components, each as a list of (start, end) flat index
+        ranges of the runs it consists of.
+    """
+    runs: List[_Run] = []
+    parents: List[int] = []
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    prev_row_runs: List[int] = []
+    for y in range(y_size):
+        row_start = y * x_size
+        row_runs = []
+        k = 0
+        for match in _BLANK_RUN_REGEX.finditer(blanks, row_start, row_start + x_size):
+            start, end = match.span()
+            idx = len(runs)
+            runs.append((start, end))
+            parents.append(idx)
+            row_runs.append(idx)
+            # Runs in the row above that finish too far left cannot touch this
+            # run or any later run in this row.
+            while k < len(prev_row_runs) and runs[prev_row_runs[k]][1] < start - x_size:
+                k += 1
+            j = k
+            while j < len(prev_row_runs) and runs[prev_row_runs[j]][0] <= end - x_size:
+                parents[find(prev_row_runs[j])] = find(idx)
+                j += 1
+        prev_row_runs = row_runs
+
+    components = {}
+    for idx, run in enumerate(runs):
+        components.setdefault(find(idx), []).append(run)
+    return list(components.values())
+
+
+def _run_extent(run: _Run, x_size: int, y_size: int) -> Iterable[_Run]:
+    """
+    Get the flat index ranges covering a run of cells and their neighbours.
+    """
+    start, end = run
+    y, x_start = divmod(start, x_size)
+    x_min = max(0, x_start - 1)
+    x_max = min(x_size, end - y * x_size + 1)
+    for j in range(max(0, y - 1), min(y_size, y + 2)):
+        yield j * x_size + x_min, j * x_size + x_max
+
+
+def _get_exposed(opening_runs: List[List[_Run]], x_size: int, y_size: int) -> bytearray:
+    """
+    Get a flat mask of the cells revealed by clicking the given openings.
+    """
+    exposed = bytearray(x_size * y_size)
+    for opening in opening_runs:
+        for run in opening:
+            for start, end in _run_extent(run, x_size, y_size):
+                exposed[start:end] = b"\x01" * (end - start)
+    return exposed
+
+
+def calc_3bv(
+    mine_counts: Sequence[int],
+    opening_runs: List[List[_Run]],
+    x_size: int,
+    y_size: int,
+) -> int:
+    """
+    Calculate the 3bv of a board given as flat, row-major arrays.
+
+    :param mine_counts:
+        The number of mines in each cell.
+    :param opening_runs:
+        The openings, as found by find_blank_runs().
+    :return:
+        The 3bv: one click per opening plus one per safe cell not revealed by
+        clicking an opening.
+    """
+    exposed = _get_exposed(opening_runs, x_size, y_size).count(1)
+    return len(opening_runs) + mine_counts.count(0) - exposed
+
 
 class RegularMinefieldBase(MinefieldBase[C, B], metaclass=abc.ABCMeta):
     """The base for a minefield with regular coords."""
@@ -97,13 +235,84 @@ class RegularMinefieldBase(MinefieldBase[C, B], metaclass=abc.ABCMeta):
         """
         return cls.from_grid(utils.Grid.from_2d_array(array), per_cell=per_cell)
 
+    @property
+    def _num_indices(self) -> int:
+        return self.x_size * self.y_size
+
+    def _coord_index(self, coord: C) -> int:
+        return coord.y * self.x_size + coord.x
+
+    def _populate_args_to_json(self) -> Mapping[str, Any]:
+        """Get the JSON encoding of the arguments used to populate the minefield."""
+        return dict(
+            seed=self.seed,
+            safe_coords=(
+                None
+                if self.safe_coords is None
+                else [(c.x, c.y) for c in self.safe_coords]
+            ),
+            no_guess_click=(
+                None
+                if self.no_guess_click is None
+                else (self.no_guess_click.x, self.no_guess_click.y)
+            ),
+        )
+
+    def _populate_args_from_json(
+        self, obj: Mapping[str, Any], make_coord: Callable[[int, int], C]
+    ) -> None:
+        """
+        Set the arguments used to populate the minefield from a JSON encoding.
+
+        :param obj:
+            The dictionary obtained from decoding JSON.
+        :param make_coord:
+            Function to create a coord from x and y values.
+        """
+        self.seed = obj.get("seed")
+        if obj.get("safe_coords") is not None:
+            self.safe_coords = [make_coord(*c) for c in obj["safe_coords"]]
+        if obj.get("no_guess_click") is not None:
+            self.no_guess_click = make_coord(*obj["no_guess_click"])
+
+    def _mine_positions(self) -> List[Tuple[int, int]]:
+        """
+        Get the (x, y) positions of mines from the dense mine counts, with
+        positions repeated for cells containing multiple mines.
+        """
+        if self._mine_counts is None:
+            return []
+        return [
+            (i % self.x_size, i // self.x_size)
+            for i, num in enumerate(self._mine_counts)
+            for _ in range(num)
+        ]
+
 
 class Minefield(RegularMinefieldBase[Coord, Board]):
     """A regular minesweeper minefield."""
 
+    # The completed board, openings and 3bv are calculated on flat, row-major
+    # arrays of the board, with neighbouring cells handled by shifted sums and
+    # openings found as connected runs of blank cells. The original cell by
+    # cell implementations are kept as a reference, see the '_reference'
+    # methods.
+
+    # The time budget in seconds and number of worker processes to use when
+    # generating no-guess minefields.
+    no_guess_time_budget: float = 1.0
+    no_guess_processes: Optional[int] = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Stats from generating a no-guess minefield, if populated that way.
+        self.no_guess_stats: Optional[noguess.NoGuessStats] = None
         self._openings: Optional[List[List[Coord]]] = None
+        self._nbr_counts: Optional[List[int]] = None
+        self._blanks: Optional[bytes] = None
+        self._opening_runs: Optional[List[List[_Run]]] = None
+        self._opening_labels: Optional[array.array] = None
+        self._opening_members: Optional[List[Optional[array.array]]] = None
 
     @classmethod
     def from_json(cls, obj: Mapping[str, Any]) -> "Minefield":
@@ -112,12 +321,14 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
 
         :param obj:
             The dictionary obtained from decoding JSON. Must contain the
-            following fields: 'x_size', 'y_size', 'mine_coords'.
+            following fields: 'x_size', 'y_size', 'mine_coords'. May also
+            contain 'per_cell', and 'seed', 'safe_coords' and 'no_guess_click'
+            for regenerating the minefield.
         :raise ValueError:
             If the dictionary is missing required fields.
         """
         try:
-            return cls.from_coords(
+            mf = cls.from_coords(
                 (
                     Coord(x, y)
                     for x in range(obj["x_size"])
@@ -130,16 +341,68 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
             raise ValueError(
                 "Missing key in dictionary when trying to create minefield"
             ) from e
+        mf._populate_args_from_json(obj, Coord)
+        return mf
 
     def to_json(self) -> Mapping[str, Any]:
         return dict(
             type="regular",
             x_size=self.x_size,
             y_size=self.y_size,
-            mine_coords=self.mine_coords,
+            mine_coords=self._mine_positions(),
             per_cell=self.per_cell,
+            **self._populate_args_to_json(),
         )
 
+    def get_opening_index(self, coord: Coord) -> Optional[int]:
+        """
+        Get the index of the opening containing a cell, as ordered in
+        `openings`.
+
+        :param coord:
+            The coord of the cell.
+        :return:
+            The opening index if the cell is blank, otherwise None.
+        """
+        if coord not in self.all_coords:
+            raise IndexError(f"Invalid coord '{coord}'")
+        if not self.populated:
+            raise AttributeError("Uninitialised minefield has no openings")
+        label = self._get_opening_labels()[self._coord_index(coord)]
+        return label if label >= 0 else None
+
+    def get_opening_coords(self, index: int) -> List[Coord]:
+        """
+        Get the coords of the cells in an opening, including the numbers at its
+        edge, in row-major order.
+
+        :param index:
+            The index of the opening, as ordered in `openings`.
+        """
+        return [
+            Coord(i % self.x_size, i // self.x_size)
+            for i in self._get_opening_members(index)
+        ]
+
+    def _index_coord(self, index: int) -> Coord:
+        return Coord(index % self.x_size, index // self.x_size)
+
+    def _sample_no_guess_mine_indices(
+        self, rng: random.Random, safe_indices: List[int], click: int
+    ) -> List[int]:
+        mine_indices, self.no_guess_stats = noguess.generate_no_guess(
+            self.x_size,
+            self.y_size,
+            self.mines,
+            click,
+            safe_indices=safe_indices,
+            per_cell=self.per_cell,
+            seed=rng.getrandbits(64),
+            time_budget=self.no_guess_time_budget,
+            processes=self.no_guess_processes,
+        )
+        return mine_indices
+
     def _get_nbrs(self, coord: Coord, *, include_origin=False) -> Iterable[Coord]:
         """Get coordinates of neighbouring cells."""
         x, y = coord
@@ -151,42 +414,144 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
             nbrs.remove(coord)
         return nbrs
 
+    def _get_nbr_counts(self) -> List[int]:
+        """
+        Get the number of mines in the 3x3 block around each cell, as a flat
+        row-major list. For safe cells this is the number displayed.
+        """
+        if self._nbr_counts is None:
+            self._nbr_counts = block_sums(self._mine_counts, self.x_size, self.y_size)
+        return self._nbr_counts
+
+    def _get_opening_runs(self) -> List[List[_Run]]:
+        """Get the openings as lists of runs of blank cells."""
+        if self._opening_runs is None:
+            self._blanks = bytes(n == 0 for n in self._get_nbr_counts())
+            self._opening_runs = find_blank_runs(self._blanks, self.x_size, self.y_size)
+        return self._opening_runs
+
+    def _get_opening_labels(self) -> array.array:
+        """
+        Get the index of the opening each blank cell belongs to, as a flat
+        row-major array with -1 for cells that are not blank.
+        """
+        if self._opening_labels is None:
+            labels = array.array("l", [-1]) * self._num_indices
+            for label, opening_runs in enumerate(self._get_opening_runs()):
+                for start, end in opening_runs:
+                    labels[start:end] = array.array("l", [label]) * (end - start)
+            self._opening_labels = labels
+        return self._opening_labels
+
+    def _get_opening_members(self, label: int) -> array.array:
+        """
+        Get the flat indices of the cells in an opening, including the numbers
+        at its edge, in row-major order.
+        """
+        if self._opening_members is None:
+            self._opening_members = [None] * len(self._get_opening_runs())
+        members = self._opening_members[label]
+        if members is None:
+            idxs = set()
+            for run in self._get_opening_runs()[label]:
+                for start, end in _run_extent(run, self.x_size, self.y_size):
+                    idxs.update(range(start, end))
+            members = self._opening_members[label] = array.array("l", sorted(idxs))
+        return members
+
     def _calc_3bv(self) -> int:
         """Calculate the 3bv of the board."""
-        clicks = len(self.openings)
-        exposed = len({c for opening in self.openings for c in opening})
-        clicks += self.x_size * self.y_size - len(set(self.mine_coords)) - exposed
-        return clicks
+        return calc_3bv(
+            self._mine_counts, self._get_opening_runs(), self.x_size, self.y_size
+        )
+
+    def _calc_rem_3bv(self, revealed: Iterable[Coord]) -> int:
+        """
+        Calculate the 3bv remaining once the given cells have been revealed.
+
+        :param revealed:
+            The coords of the cells revealed (containing numbers).
+        """
+        self._get_opening_runs()
+        revealed_idxs = {self._coord_index(c) for c in revealed}
+        # Revealed blanks no longer provide an opening to click.
+        blanks = bytearray(self._blanks)
+        for i in revealed_idxs:
+            blanks[i] = 0
+        opening_runs = find_blank_runs(blanks, self.x_size, self.y_size)
+        exposed = _get_exposed(opening_runs, self.x_size, self.y_size)
+        partial_3bv = len(opening_runs) + self._mine_counts.count(0) - exposed.count(1)
+        # Clicks already made, not counting cells at the edge of an opening
+        # still to be found.
+        completed_3bv = sum(1 for i in revealed_idxs if not exposed[i])
+        return partial_3bv - completed_3bv
 
     def _calc_completed_board(self) -> Board:
         """
         Create the completed board with the flags and numbers that should be
         seen upon game completion.
         """
+        nums = [CellContents.Num(i) for i in range(9 * self.per_cell + 1)]
+        flags = [None] + [CellContents.Flag(i) for i in range(1, self.per_cell + 1)]
+        cells = [
+            flags[mines] if mines else nums[num]
+            for mines, num in zip(self._mine_counts, self._get_nbr_counts())
+        ]
+        return Board.from_flat_array(self.x_size, self.y_size, cells)
+
+    def _find_openings(self) -> List[List[Coord]]:
+        """
+        Find the openings of the board.
+
+        A list of openings is stored, each represented as a list of
+        coordinates belonging to that opening. Note that each cell
+        cannot belong to multiple openings.
+        """
+        x_size, y_size = self.x_size, self.y_size
+        openings = []
+        for label in range(len(self._get_opening_runs())):
+            # Sort in coord order, i.e. column-major.
+            idxs = sorted(
+                self._get_opening_members(label),
+                key=lambda i: i % x_size * y_size + i // x_size,
+            )
+            openings.append([Coord(i % x_size, i // x_size) for i in idxs])
+        return openings
+
+    # ---------------------
+    # Reference implementations
+    # ---------------------
+    def _calc_3bv_reference(self) -> int:
+        """Calculate the 3bv of the board, one coord at a time."""
+        openings = self._find_openings_reference()
+        clicks = len(openings)
+        exposed = len({c for opening in openings for c in opening})
+        mine_cells = self._num_indices - self._mine_counts.count(0)
+        clicks += self.x_size * self.y_size - mine_cells - exposed
+        return clicks
+
+    def _calc_completed_board_reference(self) -> Board:
+        """Create the completed board, one coord at a time."""
         completed_board = Board(self.x_size, self.y_size)
         completed_board.fill(CellContents.Num(0))
+        mine_counts = self._mine_counts
         for c in self.all_coords:
-            mines = self[c]
+            mines = mine_counts[self._coord_index(c)]
             if mines > 0:
                 completed_board[c] = CellContents.Flag(mines)
                 for nbr in self._get_nbrs(c):
                     # For neighbouring cells that don't contain mines, increment
                     # their number.
-                    if nbr not in self.mine_coords:
+                    if mine_counts[self._coord_index(nbr)] == 0:
                         completed_board[nbr] += mines
         return completed_board
 
-    def _find_openings(self) -> List[List[Coord]]:
-        """
-        Find the openings of the board.
-
-        A list of openings is stored, each represented as a list of
-        coordinates belonging to that opening. Note that each cell
-        cannot belong to multiple openings.
-        """
+    def _find_openings_reference(self) -> List[List[Coord]]:
+        """Find the openings of the board, one coord at a time."""
+        completed_board = self._calc_completed_board_reference()
         openings = []
         blanks_to_check = {
-            c for c in self.all_coords if self.completed_board[c] is CellContents.Num(0)
+            c for c in self.all_coords if completed_board[c] is CellContents.Num(0)
         }
         while blanks_to_check:
             orig_coord = blanks_to_check.pop()
@@ -200,7 +565,7 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
                 check |= {
                     c
                     for c in nbrs - opening
-                    if self.completed_board[c] is CellContents.Num(0)
+                    if completed_board[c] is CellContents.Num(0)
                 }
                 opening |= nbrs
             openings.append(sorted(opening))
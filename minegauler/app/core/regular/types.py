@@ -2,14 +2,22 @@
 
 __all__ = ("Coord",)
 
+import operator
 from typing import Tuple
 
 from ...shared.types import Coord as CoordBase
 
 
 class Coord(Tuple[int, int], CoordBase):
+    # Equality and hashing come from the tuple base, and the fields are read
+    # from the tuple rather than stored separately.
+    __slots__ = ()
+
+    x = property(operator.itemgetter(0))
+    y = property(operator.itemgetter(1))
+
     def __new__(cls, x: int, y: int):
-        self = super().__new__(cls, (x, y))
-        self.x = x
-        self.y = y
-        return self
+        return tuple.__new__(cls, (x, y))
+
+    def __getnewargs__(self):
+        return tuple(self)
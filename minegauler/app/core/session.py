@@ -0,0 +1,394 @@
+# October 2026
+
+"""
+Hosting many concurrent games in one process.
+
+Each session has its own game controller, looked up by session id, e.g. for
+bots, tournaments or a web frontend. No frontend resources (such as images)
+are involved, and tables that depend only on the board size are shared
+between all games of that size.
+
+Sessions that are not used for a while can be evicted, either by calling
+`SessionManager.evict_idle()` or by starting a background thread to do so. A
+session counts as used whenever it is looked up or a method is called on its
+controller.
+
+"""
+
+__all__ = ("Session", "SessionManager", "SessionNotFoundError")
+
+import collections
+import enum
+import functools
+import logging
+import sys
+import threading
+import time
+import types
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import attr
+
+from ..shared.types import CellContents
+from ..shared.utils import GameOptsStruct
+from . import api, board, engine
+from .controller import GameControllerBase
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionNotFoundError(LookupError):
+    """No session exists with the given id."""
+
+
+class _ActiveController:
+    """
+    Proxy for a session's controller, marking the session as active whenever
+    a method is called on the controller.
+    """
+
+    __slots__ = ("_ctrlr", "_session")
+
+    def __init__(self, ctrlr: GameControllerBase, session: "Session"):
+        self._ctrlr = ctrlr
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._ctrlr, name)
+        if name.startswith("_") or not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def wrapped(*args, **kwargs):
+            self._session.touch()
+            return value(*args, **kwargs)
+
+        return wrapped
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} for {self._ctrlr!r}>"
+
+
+@attr.attrs(auto_attribs=True, kw_only=True, eq=False)
+class Session:
+    """A game hosted by a session manager."""
+
+    id: str
+    _ctrlr: GameControllerBase
+    # Times from `time.monotonic()`.
+    created: float
+    last_active: float
+    # The notifier passing on updates to the controller's listeners.
+    _notif: api._Notifier
+    # Called with the session id when the session is used.
+    _on_active: Optional[Callable[[str], None]] = None
+    _proxy: _ActiveController = attr.attrib(init=False)
+
+    def __attrs_post_init__(self):
+        self._proxy = _ActiveController(self._ctrlr, self)
+
+    @property
+    def ctrlr(self) -> GameControllerBase:
+        """
+        The session's game controller.
+
+        Calling methods on the controller marks the session as active, so the
+        controller may be kept and used directly.
+        """
+        return self._proxy  # type: ignore
+
+    @property
+    def idle_time(self) -> float:
+        """The time in seconds since the session was last used."""
+        return time.monotonic() - self.last_active
+
+    def touch(self) -> None:
+        """Mark the session as active."""
+        self.last_active = time.monotonic()
+        if self._on_active is not None:
+            self._on_active(self.id)
+
+    def memory_usage(self) -> int:
+        """
+        Estimate the memory used by the session's game, in bytes.
+
+        Tables shared with other sessions and the registered listeners are not
+        included.
+        """
+        return _estimate_size(self._ctrlr, {id(t) for t in board.get_shared_tables()})
+
+    def close(self) -> None:
+        """Stop delivering notifications to the registered listeners."""
+        self._notif.close()
+
+
+# Objects not owned by any one session.
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    enum.Enum,
+    CellContents,
+    logging.Logger,
+    logging.LoggerAdapter,
+    api.AbstractListener,
+)
+
+
+def _estimate_size(root: Any, skip_ids: Iterable[int]) -> int:
+    """
+    Estimate the memory used by an object and everything it references.
+
+    :param root:
+        The object to estimate the size of.
+    :param skip_ids:
+        Ids of objects not to include.
+    :return:
+        The estimated size in bytes.
+    """
+    seen = set(skip_ids)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return total
+
+
+class SessionManager:
+    """
+    Create, look up and expire game sessions by id.
+
+    Methods may be called from any thread. Each session's controller should
+    only be used by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        idle_timeout: Optional[float] = 600,
+        max_sessions: Optional[int] = None,
+    ):
+        """
+        :param idle_timeout:
+            Time in seconds after which an unused session is evicted, or None
+            for sessions never to be evicted for being idle.
+        :param max_sessions:
+            The maximum number of sessions, or None for no limit. The least
+            recently used session is evicted to make room for a new session.
+        """
+        self.idle_timeout: Optional[float] = idle_timeout
+        self.max_sessions: Optional[int] = max_sessions
+        # Sessions in order of when they were last used, most recent last.
+        self._sessions: "collections.OrderedDict[str, Session]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._evictor: Optional[threading.Thread] = None
+        self._stop_eviction = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    @property
+    def session_ids(self) -> List[str]:
+        """The ids of the current sessions."""
+        with self._lock:
+            return list(self._sessions)
+
+    def create(
+        self,
+        opts: Optional[GameOptsStruct] = None,
+        *,
+        session_id: Optional[str] = None,
+        listeners: Iterable[api.AbstractListener] = (),
+    ) -> Session:
+        """
+        Create a new session.
+
+        :param opts:
+            Game options, defaulting to the standard options.
+        :param session_id:
+            The id for the session, by default a random one is generated.
+        :param listeners:
+            Listeners to register with the controller, with synchronous
+            delivery. Other listeners can be registered with the controller.
+        :return:
+            The new session.
+        :raise ValueError:
+            If a session already exists with the given id.
+        """
+        # The controller keeps a reference to the options, so take a copy.
+        opts = GameOptsStruct.from_structs(opts) if opts else GameOptsStruct()
+        notif = api._Notifier(listeners)
+        ctrlr = engine.GAME_MODE_IMPL[opts.mode].GameController(opts, notif=notif)
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            if session_id is None:
+                session_id = uuid.uuid4().hex
+            elif session_id in self._sessions:
+                raise ValueError(f"Session already exists with id {session_id!r}")
+            if self.max_sessions is not None:
+                while self._sessions and len(self._sessions) >= self.max_sessions:
+                    oldest = next(iter(self._sessions))
+                    logger.info("Evicting session %s to make room", oldest)
+                    evicted.append(self._sessions.pop(oldest))
+            session = Session(
+                id=session_id,
+                ctrlr=ctrlr,
+                created=now,
+                last_active=now,
+                notif=notif,
+                on_active=self._mark_active,
+            )
+            self._sessions[session_id] = session
+        self._close_sessions(evicted)
+        logger.debug("Created session %s", session_id)
+        return session
+
+    def get(self, session_id: str) -> Session:
+        """
+        Get a session, marking it as active.
+
+        :param session_id:
+            The id of the session.
+        :return:
+            The session.
+        :raise SessionNotFoundError:
+            If there is no session with the id, e.g. if it has been evicted.
+        """
+        with self._lock:
+            try:
+                session = self._sessions[session_id]
+            except KeyError:
+                raise SessionNotFoundError(
+                    f"No session with id {session_id!r}"
+                ) from None
+        session.touch()
+        return session
+
+    def close(self, session_id: str) -> None:
+        """
+        Close a session. Does nothing if there is no session with the id.
+
+        :param session_id:
+            The id of the session.
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._close_sessions([session])
+            logger.debug("Closed session %s", session_id)
+
+    def close_all(self) -> None:
+        """Close all sessions, stopping eviction if running."""
+        self.stop_eviction()
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        self._close_sessions(sessions)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Estimate the memory used by each session, in bytes.
+
+        :return:
+            A mapping of session ids to the memory used.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {s.id: s.memory_usage() for s in sessions}
+
+    def evict_idle(self) -> List[str]:
+        """
+        Evict sessions that have not been used for longer than the idle timeout.
+
+        :return:
+            The ids of the evicted sessions.
+        """
+        if self.idle_timeout is None:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        with self._lock:
+            # Sessions are in order of when they were last used.
+            for session_id, session in list(self._sessions.items()):
+                if session.last_active > cutoff:
+                    break
+                evicted.append(self._sessions.pop(session_id))
+        if evicted:
+            logger.info("Evicting %d idle session(s)", len(evicted))
+            self._close_sessions(evicted)
+        return [s.id for s in evicted]
+
+    def start_eviction(self, interval: float = 60) -> None:
+        """
+        Start a background thread to evict idle sessions periodically.
+
+        :param interval:
+            Time in seconds between checking for idle sessions.
+        :raise RuntimeError:
+            If eviction is already running.
+        """
+        if self._evictor is not None:
+            raise RuntimeError("Session eviction already running")
+        self._stop_eviction.clear()
+        self._evictor = threading.Thread(
+            target=self._run_eviction,
+            args=(interval,),
+            name="session-eviction",
+            daemon=True,
+        )
+        self._evictor.start()
+
+    def stop_eviction(self) -> None:
+        """Stop evicting idle sessions in the background, if running."""
+        if self._evictor is None:
+            return
+        self._stop_eviction.set()
+        self._evictor.join()
+        self._evictor = None
+
+    def _mark_active(self, session_id: str) -> None:
+        """Keep the sessions in order of when they were last used."""
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions.move_to_end(session_id)
+
+    def _run_eviction(self, interval: float) -> None:
+        while not self._stop_eviction.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception:
+                logger.exception("Error evicting idle sessions")
+
+    @staticmethod
+    def _close_sessions(sessions: Iterable[Session]) -> None:
+        """
+        Close removed sessions. This may wait for notifications to be delivered,
+        so is done without the lock held.
+        """
+        for session in sessions:
+            session.close()
@@ -0,0 +1,226 @@
+# October 2026
+
+"""
+Headless generation of minefields in bulk, for gathering board statistics.
+
+Boards are generated directly as flat arrays of mine counts, without creating
+games or coords, and analysed using the same flat-array helpers as regular
+minefields. Regular game mode only.
+
+"""
+
+__all__ = ("BoardStats", "simulate_boards")
+
+import array
+import logging
+import multiprocessing
+import random
+from typing import List, Optional, Set, Tuple
+
+import attr
+
+from .minefield import sample_mine_indices
+from .regular.minefield import block_sums, calc_3bv, find_blank_runs
+
+
+logger = logging.getLogger(__name__)
+
+
+@attr.attrs(auto_attribs=True, kw_only=True, frozen=True)
+class _BoardParams:
+    x_size: int
+    y_size: int
+    mines: int
+    per_cell: int
+    first_success: bool
+    first_click: Optional[Tuple[int, int]]
+
+
+@attr.attrs(auto_attribs=True, kw_only=True, frozen=True)
+class BoardStats:
+    """
+    Statistics for a batch of generated boards, with one entry per board in
+    each array.
+    """
+
+    bbbv: array.array
+    openings: array.array
+    # Whether the first click was on a blank cell (1) or not (0).
+    first_click_opening: array.array
+    # The number of safe cells on the completed board showing each number,
+    # indexed by the number.
+    number_counts: Tuple[array.array, ...]
+
+    def __len__(self) -> int:
+        return len(self.bbbv)
+
+
+def _generate_mine_counts(
+    rng: random.Random, params: _BoardParams
+) -> Tuple[bytearray, int]:
+    """
+    Randomly place mines as they would be for a new game.
+
+    :param rng:
+        The random number generator to use.
+    :param params:
+        The board parameters.
+    :return:
+        A tuple of the flat, row-major mine counts and the flat index of the
+        first click.
+    """
+    x_size, y_size = params.x_size, params.y_size
+    num_cells = x_size * y_size
+    if params.first_click is None:
+        click = rng.randrange(num_cells)
+    else:
+        click = params.first_click[1] * x_size + params.first_click[0]
+
+    if params.first_success:
+        y, x = divmod(click, x_size)
+        safe: Set[int] = {
+            j * x_size + i
+            for i in range(max(0, x - 1), min(x_size, x + 2))
+            for j in range(max(0, y - 1), min(y_size, y + 2))
+        }
+        if params.mines > (num_cells - len(safe)) * params.per_cell:
+            # Unable to give an opening, still ensure a safe click.
+            safe = {click}
+    else:
+        # Make sure there is at least one safe cell, as for a game.
+        safe = {rng.randrange(num_cells)}
+
+    mine_counts = bytearray(num_cells)
+    for idx in sample_mine_indices(rng, num_cells, safe, params.mines, params.per_cell):
+        mine_counts[idx] += 1
+    return mine_counts, click
+
+
+def _calc_stats(
+    mine_counts: bytearray, click: int, x_size: int, y_size: int, per_cell: int
+) -> Tuple[int, int, bool, List[int]]:
+    """
+    Calculate the statistics for a board.
+
+    :return:
+        A tuple of the 3bv, the number of openings, whether the first click is
+        on a blank cell, and the number of safe cells showing each number.
+    """
+    nbr_counts = block_sums(mine_counts, x_size, y_size)
+    number_counts = [0] * (8 * per_cell + 1)
+    for mines, num in zip(mine_counts, nbr_counts):
+        if mines == 0:
+            number_counts[num] += 1
+    blanks = bytes(n == 0 for n in nbr_counts)
+    opening_runs = find_blank_runs(blanks, x_size, y_size)
+    bbbv = calc_3bv(mine_counts, opening_runs, x_size, y_size)
+    return bbbv, len(opening_runs), bool(blanks[click]), number_counts
+
+
+def _simulate_chunk(
+    params: _BoardParams, seeds: List[int]
+) -> List[Tuple[int, int, bool, List[int]]]:
+    """Generate and analyse a board for each of the given seeds."""
+    results = []
+    for seed in seeds:
+        mine_counts, click = _generate_mine_counts(random.Random(seed), params)
+        results.append(
+            _calc_stats(
+                mine_counts, click, params.x_size, params.y_size, params.per_cell
+            )
+        )
+    return results
+
+
+def simulate_boards(
+    x_size: int,
+    y_size: int,
+    mines: int,
+    *,
+    per_cell: int = 1,
+    first_success: bool = True,
+    first_click: Optional[Tuple[int, int]] = None,
+    num_boards: int = 1,
+    seed: Optional[int] = None,
+    processes: Optional[int] = None,
+) -> BoardStats:
+    """
+    Generate boards in bulk and gather statistics about them.
+
+    Each board is generated from its own seed, derived from the given seed, so
+    the results are reproducible regardless of the number of processes used.
+
+    :param x_size:
+        The number of columns.
+    :param y_size:
+        The number of rows.
+    :param mines:
+        The number of mines.
+    :param per_cell:
+        The maximum number of mines per cell.
+    :param first_success:
+        Whether the first click should be guaranteed to be an opening where
+        possible (otherwise it is guaranteed to be safe).
+    :param first_click:
+        The (x, y) position of the first click, or None to use a random cell
+        for each board.
+    :param num_boards:
+        The number of boards to generate.
+    :param seed:
+        Seed for the random number generation, or None to seed randomly.
+    :param processes:
+        The number of worker processes to use, or None to run in the current
+        process.
+    :return:
+        The statistics for the generated boards.
+    :raise ValueError:
+        If the number of mines is too high or the first click is out of bounds.
+    """
+    if per_cell < 1:
+        raise ValueError(f"Max mines per cell must be at least 1, got {per_cell}")
+    if mines < 0:
+        raise ValueError(f"Number of mines must be positive, got {mines}")
+    if mines > (x_size * y_size - 1) * per_cell:
+        raise ValueError(
+            f"Number of mines too high: {mines} in {x_size * y_size - 1} "
+            f"spaces with max {per_cell} per cell"
+        )
+    if first_click is not None and not (
+        0 <= first_click[0] < x_size and 0 <= first_click[1] < y_size
+    ):
+        raise ValueError(f"First click out of bounds: {first_click}")
+
+    params = _BoardParams(
+        x_size=x_size,
+        y_size=y_size,
+        mines=mines,
+        per_cell=per_cell,
+        first_success=first_success,
+        first_click=first_click,
+    )
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in range(num_boards)]
+
+    logger.debug(
+        "Simulating %d boards of %dx%d with %d mines", num_boards, x_size, y_size, mines
+    )
+    if processes is None:
+        results = _simulate_chunk(params, seeds)
+    else:
+        chunk_size = max(1, -(-num_boards // (4 * processes)))
+        chunks = [seeds[i : i + chunk_size] for i in range(0, num_boards, chunk_size)]
+        with multiprocessing.Pool(processes) as pool:
+            chunk_results = pool.starmap(
+                _simulate_chunk, [(params, chunk) for chunk in chunks]
+            )
+        results = [r for chunk in chunk_results for r in chunk]
+
+    return BoardStats(
+        bbbv=array.array("l", [r[0] for r in results]),
+        openings=array.array("l", [r[1] for r in results]),
+        first_click_opening=array.array("b", [r[2] for r in results]),
+        number_counts=tuple(
+            array.array("l", [r[3][num] for r in results])
+            for num in range(8 * per_cell + 1)
+        ),
+    )
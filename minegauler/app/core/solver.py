@@ -0,0 +1,370 @@
+# October 2026
+
+"""
+Minesweeper solver, calculating the probability of cells containing mines.
+
+The unclicked cells next to revealed numbers (the 'frontier') are grouped into
+classes of cells that share exactly the same number constraints, since the
+mines in a class can be counted without caring which of its cells they are
+in. Classes are then split into independent groups that share no constraints,
+and the numbers of ways of placing mines in each group are counted separately,
+merging partial assignments that leave the same constraints to satisfy rather
+than enumerating every arrangement. Finally the groups are combined, weighting
+each combination by the number of ways of placing the remaining mines in the
+cells away from the frontier.
+
+Mines are assumed to be placed as by a minefield, with each cell providing
+'per_cell' slots to place mines in and all choices of slots equally likely, so
+there are C(n * per_cell, m) ways of placing m mines in n cells.
+
+Regular game mode only.
+
+"""
+
+__all__ = ("calc_probabilities",)
+
+import functools
+import logging
+import math
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from ..shared.types import CellContents
+from .regular.board import Board
+from .regular.types import Coord
+
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=4096)
+def _comb(n: int, k: int) -> int:
+    """The binomial coefficient, zero when k is out of range."""
+    if k < 0 or k > n:
+        return 0
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def _convolve(a: Sequence[int], b: Sequence[int], max_len: int) -> List[int]:
+    """Multiply two polynomials, given as coefficient lists, truncating."""
+    result = [0] * min(len(a) + len(b) - 1, max_len)
+    for i, x in enumerate(a[:max_len]):
+        if x:
+            for j, y in enumerate(b[: max_len - i]):
+                result[i + j] += x * y
+    return result
+
+
+class _Group:
+    """
+    An independent group of cell classes, linked by shared constraints.
+
+    Rather than enumerating every valid assignment, the classes are assigned
+    mine counts in turn and assignments are merged whenever they leave the
+    same mines to place for the constraints that are only partly assigned,
+    since the later classes cannot tell them apart. Going forwards this gives
+    'weights[t]', the number of ways of placing t mines in the group's cells
+    consistent with the constraints. Going backwards, given the weighting for
+    each number of mines in the group, gives the weighted number of ways with
+    a cell of each class containing a mine.
+    """
+
+    def __init__(
+        self,
+        sizes: List[int],
+        constraints: List[Tuple[List[int], int]],
+        per_cell: int,
+        max_mines: int,
+    ):
+        """
+        :param sizes:
+            The number of cells in each class, in the order the classes are to
+            be assigned.
+        :param constraints:
+            The constraints on the classes, each as a list of the classes
+            involved and the number of mines they must contain.
+        :param per_cell:
+            Maximum number of mines per cell.
+        :param max_mines:
+            The maximum number of mines that may be placed in the group.
+        """
+        self.sizes = sizes
+        self.constraints = constraints
+        self.per_cell = per_cell
+        self.max_mines = max_mines
+        self.weights: List[int] = []
+        # The ways of assigning the classes before each class, for each state
+        # of the partly assigned constraints, by the number of mines placed.
+        self._forward: List[Dict[Tuple[int, ...], List[int]]] = []
+        # The valid assignments of each class from each state, as a list of
+        # the number of mines and the resulting state.
+        self._steps: List[Dict[Tuple[int, ...], List[Tuple[int, Tuple[int, ...]]]]]
+        self._steps = []
+
+    def calc_weights(self) -> None:
+        """Find the number of ways of placing each number of mines."""
+        num_classes = len(self.sizes)
+        capacities = [size * self.per_cell for size in self.sizes]
+        constraints_of: List[List[int]] = [[] for _ in range(num_classes)]
+        first = []
+        last = []
+        for i, (classes, _) in enumerate(self.constraints):
+            for c in classes:
+                constraints_of[c].append(i)
+            first.append(min(classes))
+            last.append(max(classes))
+        values = [num for _, num in self.constraints]
+        # The constraints partly assigned before each class.
+        active: List[List[int]] = [[] for _ in range(num_classes + 1)]
+        for i in range(len(self.constraints)):
+            for c in range(first[i] + 1, last[i] + 1):
+                active[c].append(i)
+        # The capacity of each constraint's classes after each class.
+        capacity = [0] * len(self.constraints)
+        capacity_after: List[Dict[int, int]] = [{} for _ in range(num_classes)]
+        for c in reversed(range(num_classes)):
+            for i in constraints_of[c]:
+                capacity_after[c][i] = capacity[i]
+                capacity[i] += capacities[c]
+
+        forward: Dict[Tuple[int, ...], List[int]] = {(): [1]}
+        for c in range(num_classes):
+            self._forward.append(forward)
+            steps = {}
+            next_forward: Dict[Tuple[int, ...], List[int]] = {}
+            for state, ways in forward.items():
+                remaining = dict(zip(active[c], state))
+                # The fewest mines placed so far, for which no state is stored
+                # unless there is at least one way.
+                least = next(t for t, x in enumerate(ways) if x)
+                upper = min(capacities[c], self.max_mines - least)
+                lower = 0
+                for i in constraints_of[c]:
+                    r = remaining.get(i, values[i])
+                    upper = min(upper, r)
+                    lower = max(lower, r - capacity_after[c][i])
+                    remaining[i] = r
+                state_steps = []
+                for m in range(lower, upper + 1):
+                    for i in constraints_of[c]:
+                        remaining[i] -= m
+                    next_state = tuple(remaining[i] for i in active[c + 1])
+                    for i in constraints_of[c]:
+                        remaining[i] += m
+                    state_steps.append((m, next_state))
+                    w = _comb(capacities[c], m)
+                    next_ways = next_forward.get(next_state)
+                    if next_ways is None:
+                        next_ways = next_forward[next_state] = []
+                    end = min(len(ways) + m, self.max_mines + 1)
+                    if len(next_ways) < end:
+                        next_ways.extend([0] * (end - len(next_ways)))
+                    for t in range(end - m):
+                        if ways[t]:
+                            next_ways[t + m] += ways[t] * w
+                steps[state] = state_steps
+            self._steps.append(steps)
+            forward = next_forward
+        self._forward.append(forward)
+        self.weights = forward.get((), [0])
+        # Drop the counts of mines that are not possible.
+        while len(self.weights) > 1 and self.weights[-1] == 0:
+            self.weights.pop()
+
+    def calc_class_weights(self, outside: List[int]) -> List[int]:
+        """
+        Find the weighted number of ways with a cell of each class containing a
+        mine.
+
+        :param outside:
+            The weighting for each number of mines in the group.
+        """
+        class_weights = [0] * len(self.sizes)
+        # The weighted ways of assigning the classes after each class, for each
+        # state, by the number of mines placed before.
+        backward: Dict[Tuple[int, ...], List[int]] = {(): outside}
+        for c in reversed(range(len(self.sizes))):
+            capacity = self.sizes[c] * self.per_cell
+            without_capacity = capacity - self.per_cell
+            prev_backward = {}
+            num = 0
+            for state, ways in self._forward[c].items():
+                after = [0] * len(ways)
+                for m, next_state in self._steps[c][state]:
+                    next_after = backward.get(next_state)
+                    if next_after is None:
+                        continue
+                    w = _comb(capacity, m)
+                    with_mine = w - _comb(without_capacity, m)
+                    end = min(len(ways), len(next_after) - m)
+                    total = 0
+                    for t in range(end):
+                        x = next_after[t + m]
+                        if x:
+                            after[t] += w * x
+                            total += ways[t] * x
+                    num += with_mine * total
+                prev_backward[state] = after
+            class_weights[c] = num
+            backward = prev_backward
+        return class_weights
+
+
+def _find_groups(
+    cells: Iterable[FrozenSet[int]], num_constraints: int
+) -> List[List[FrozenSet[int]]]:
+    """
+    Split the classes (identified by their sets of constraints) into groups
+    that do not share any constraints.
+    """
+    parent = list(range(num_constraints))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for key in cells:
+        first, *rest = key
+        for other in rest:
+            parent[find(other)] = find(first)
+    groups: Dict[int, List[FrozenSet[int]]] = {}
+    for key in cells:
+        groups.setdefault(find(next(iter(key))), []).append(key)
+    return list(groups.values())
+
+
+def calc_probabilities(
+    board: Board, mines: int, *, per_cell: int = 1
+) -> Dict[Coord, float]:
+    """
+    Calculate the probability of each unrevealed cell containing a mine.
+
+    Flagged cells are treated as unrevealed, since flags may be wrong, while
+    revealed mines (e.g. hit mines when playing with multiple lives) are taken
+    as known.
+
+    :param board:
+        The current state of the board.
+    :param mines:
+        The total number of mines in the minefield.
+    :param per_cell:
+        Maximum number of mines per cell.
+    :return:
+        A mapping of the unrevealed cells to the probability of them containing
+        at least one mine.
+    :raise ValueError:
+        If the board state is inconsistent with the number of mines.
+    """
+    unknown = []
+    known_mines = 0
+    numbers = []
+    for c in board.all_coords:
+        contents = board[c]
+        if contents is CellContents.Unclicked or isinstance(
+            contents, CellContents.Flag
+        ):
+            unknown.append(c)
+        elif type(contents) is CellContents.Num:
+            numbers.append(c)
+        elif contents.is_mine_type():
+            known_mines += contents.num
+    if not unknown:
+        return {}
+
+    # Find the constraints from the revealed numbers.
+    unknown_set = set(unknown)
+    cell_constraints: Dict[Coord, List[int]] = {}
+    constraint_values: List[int] = []
+    for c in numbers:
+        num = board[c].num
+        unknown_nbrs = []
+        for nbr in board.get_nbrs(c):
+            if nbr in unknown_set:
+                unknown_nbrs.append(nbr)
+            elif board[nbr].is_mine_type():
+                num -= board[nbr].num
+        if num < 0 or num > len(unknown_nbrs) * per_cell:
+            raise ValueError(f"Inconsistent number at {c}")
+        if not unknown_nbrs:
+            continue
+        for nbr in unknown_nbrs:
+            cell_constraints.setdefault(nbr, []).append(len(constraint_values))
+        constraint_values.append(num)
+
+    # Group frontier cells into classes sharing the same constraints.
+    classes: Dict[FrozenSet[int], List[Coord]] = {}
+    for c, cons in cell_constraints.items():
+        classes.setdefault(frozenset(cons), []).append(c)
+    interior = [c for c in unknown if c not in cell_constraints]
+    interior_slots = len(interior) * per_cell
+    rem_mines = mines - known_mines
+    if rem_mines < 0:
+        raise ValueError("More mines revealed than in the minefield")
+
+    groups = []
+    for keys in _find_groups(classes, len(constraint_values)):
+        # Assign the classes in the order their constraints were found, which
+        # follows the board, to keep few constraints partly assigned.
+        keys.sort(key=lambda k: (min(k), max(k)))
+        index = {key: i for i, key in enumerate(keys)}
+        cons_classes: Dict[int, List[int]] = {}
+        for key in keys:
+            for con in key:
+                cons_classes.setdefault(con, []).append(index[key])
+        group = _Group(
+            [len(classes[key]) for key in keys],
+            [(cls, constraint_values[con]) for con, cls in cons_classes.items()],
+            per_cell,
+            rem_mines,
+        )
+        group.calc_weights()
+        groups.append((keys, group))
+    logger.debug(
+        "Solving with %d frontier classes in %d groups, %d interior cells",
+        len(classes),
+        len(groups),
+        len(interior),
+    )
+
+    # Combine the groups, with products of the other groups' weights found
+    # using prefix and suffix products.
+    max_len = rem_mines + 1
+    prefixes = [[1]]
+    for _, group in groups:
+        prefixes.append(_convolve(prefixes[-1], group.weights, max_len))
+    suffixes = [[1]]
+    for _, group in reversed(groups):
+        suffixes.append(_convolve(suffixes[-1], group.weights, max_len))
+    suffixes.reverse()
+    all_weights = prefixes[-1]
+
+    def interior_ways(frontier_mines: int) -> int:
+        return _comb(interior_slots, rem_mines - frontier_mines)
+
+    total = sum(w * interior_ways(s) for s, w in enumerate(all_weights) if w)
+    if total == 0:
+        raise ValueError("No valid arrangement of mines")
+
+    probs: Dict[Coord, float] = {}
+    for g, (keys, group) in enumerate(groups):
+        others = _convolve(prefixes[g], suffixes[g + 1], max_len)
+        # Ways of placing the mines outside the group, given t in the group.
+        outside = [
+            sum(w * interior_ways(t + s) for s, w in enumerate(others) if w)
+            for t in range(len(group.weights))
+        ]
+        for key, num in zip(keys, group.calc_class_weights(outside)):
+            prob = num / total
+            for c in classes[key]:
+                probs[c] = prob
+    if interior:
+        num = sum(
+            w * (interior_ways(s) - _comb(interior_slots - per_cell, rem_mines - s))
+            for s, w in enumerate(all_weights)
+            if w
+        )
+        prob = num / total
+        for c in interior:
+            probs[c] = prob
+    return probs
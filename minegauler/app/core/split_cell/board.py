@@ -1,6 +1,6 @@
 # October 2021, Lewis Gaul
 
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 from ...shared.types import CellContents, GameMode
 from ..board import BoardBase
@@ -26,6 +26,9 @@ class Board(BoardBase):
             for x in range(self.x_size // 2)
             for y in range(self.y_size // 2)
         }
+        # Sorted neighbours of cells, including the cell itself, filled in on
+        # first use and invalidated around cells that are split.
+        self._nbrs: Dict[Coord, Tuple[Coord, ...]] = {}
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Board):
@@ -41,6 +44,9 @@ class Board(BoardBase):
         # TODO: This seems desirable, but is used for displaying hit mines...
         # if coord not in self:
         #     raise KeyError(f"{coord} not in board")
+        if coord not in self._all_coords:
+            # Positions may now resolve to a different coord.
+            self._nbrs.clear()
         self._all_coords[coord] = obj
 
     def __contains__(self, coord: Coord):
@@ -59,13 +65,24 @@ class Board(BoardBase):
     def copy(self) -> "Board":
         new_board = type(self)(self.x_size, self.y_size)
         new_board._all_coords = self._all_coords.copy()
+        new_board._nbrs = self._nbrs.copy()
         return new_board
 
     def get_nbrs(
         self, coord: Coord, *, include_origin: bool = False
     ) -> Iterable[Coord]:
-        if coord not in self.all_coords:
-            raise ValueError(f"{coord} not in board")
+        try:
+            nbrs = self._nbrs[coord]
+        except KeyError:
+            if coord not in self._all_coords:
+                raise ValueError(f"{coord} not in board") from None
+            nbrs = self._nbrs[coord] = self._calc_nbrs(coord)
+        if include_origin:
+            return list(nbrs)
+        return [c for c in nbrs if c != coord]
+
+    def _calc_nbrs(self, coord: Coord) -> Tuple[Coord, ...]:
+        """Calculate the sorted neighbours of a cell, including the cell itself."""
         x_min = max(0, coord.x - 1)
         y_min = max(0, coord.y - 1)
         if coord.is_split:
@@ -78,9 +95,7 @@ class Board(BoardBase):
         for i in range(x_min, x_max + 1):
             for j in range(y_min, y_max + 1):
                 nbrs.add(self.get_coord_at(i, j))
-        if not include_origin:
-            nbrs.remove(coord)
-        return sorted(nbrs)
+        return tuple(sorted(nbrs))
 
     def get_coord_at(self, x: int, y: int) -> Coord:
         split = Coord(x, y, True)
@@ -93,5 +108,10 @@ class Board(BoardBase):
             raise ValueError(f"Position out of bounds: ({x}, {y})")
 
     def split_coord(self, coord: Coord) -> None:
+        # Neighbourhoods are symmetric, so only the neighbours of the split
+        # cell have the cell in their cached neighbours.
+        if coord in self._all_coords:
+            for c in self.get_nbrs(coord, include_origin=True):
+                self._nbrs.pop(c, None)
         self._all_coords.pop(coord)
         self._all_coords.update({c: CellContents.Unclicked for c in coord.split()})
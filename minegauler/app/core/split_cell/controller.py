@@ -35,17 +35,7 @@ class GameController(_ControllerMixin, GameControllerBase):
         super().flag_cell(coord, flag_only=flag_only)
         if not coord.is_split:
             return
-        cell_state = self.board[coord]
-        if cell_state is CellContents.Unclicked:
-            self.game.set_cell_flags(coord, 1)
-        elif isinstance(cell_state, CellContents.Flag):
-            if cell_state.num >= self.game.per_cell:
-                if flag_only:
-                    return
-                self.game.set_cell_flags(coord, 0)
-            else:
-                self.game.set_cell_flags(coord, cell_state.num + 1)
-        self._send_updates({coord: self.board[coord]})
+        self._send_updates(self.game.cycle_cell_flags(coord, flag_only=flag_only))
 
     def remove_cell_flags(self, coord: Coord) -> None:
         if not coord.is_split:
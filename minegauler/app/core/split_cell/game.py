@@ -4,10 +4,17 @@ __all__ = ("Game",)
 
 import logging
 import time
-from typing import Iterable, Mapping
+from typing import Dict, Iterable, List, Mapping, Optional
 
-from ...shared.types import CellContents, Difficulty, GameMode, GameState
-from ..game import GameBase, GameNotStartedError, _check_coord, _ignore_if_not
+from ...shared.types import CellAction, CellContents, Difficulty, GameMode, GameState
+from ..game import (
+    GameBase,
+    GameNotStartedError,
+    Rem3bvTrackerBase,
+    _check_coord,
+    _ignore_if_not,
+)
+from ..regular.minefield import block_sums
 from .board import Board
 from .minefield import Minefield
 from .types import Coord
@@ -16,6 +23,83 @@ from .types import Coord
 logger = logging.getLogger(__name__)
 
 
+class _Rem3bvTracker(Rem3bvTrackerBase):
+    """
+    Track the remaining 3bv of a split-cell game incrementally as cells are
+    revealed and split.
+
+    This works on the cells of the minefield's completed board, in which each
+    big cell containing a mine is split. On top of the regular remaining 3bv,
+    each required split not yet made counts once.
+    """
+
+    def __init__(self, mf: Minefield):
+        board = mf.completed_board
+        coords = board.all_coords
+        self._indices: Dict[Coord, int] = {c: i for i, c in enumerate(coords)}
+        # Neighbours of each cell, including the cell itself.
+        self._nbrs: List[List[int]] = [
+            [self._indices[n] for n in board.get_nbrs(c, include_origin=True)]
+            for c in coords
+        ]
+        blank = CellContents.Num(0)
+        blanks = [board[c] is blank for c in coords]
+        # Big cells containing both a mine and a safe cell, which have not yet
+        # been split.
+        self._required_splits = {
+            c.get_big_cell_coord()
+            for c in coords
+            if c.is_split and type(board[c]) is CellContents.Num
+        }
+        # Label each blank with the opening it belongs to (-1 for non-blanks).
+        labels = [-1] * len(coords)
+        # The blanks in each opening.
+        self._blanks_by_opening: List[List[int]] = []
+        for i, is_blank in enumerate(blanks):
+            if not is_blank or labels[i] >= 0:
+                continue
+            label = len(self._blanks_by_opening)
+            labels[i] = label
+            members = [i]
+            to_check = [i]
+            while to_check:
+                for j in self._nbrs[to_check.pop()]:
+                    if blanks[j] and labels[j] < 0:
+                        labels[j] = label
+                        members.append(j)
+                        to_check.append(j)
+            self._blanks_by_opening.append(members)
+        nbr_blanks = [sum(blanks[j] for j in nbrs) for nbrs in self._nbrs]
+        super().__init__(
+            labels=labels,
+            opening_sizes=[len(members) for members in self._blanks_by_opening],
+            nbr_blanks=nbr_blanks,
+            isolated=sum(
+                1
+                for c, num in zip(coords, nbr_blanks)
+                if num == 0 and type(board[c]) is CellContents.Num
+            ),
+            num_cells=len(coords),
+        )
+
+    @property
+    def rem_3bv(self) -> int:
+        return len(self._required_splits) + super().rem_3bv
+
+    def split(self, coord: Coord) -> None:
+        """Record a big cell being split."""
+        self._required_splits.discard(coord)
+
+    def _index(self, coord: Coord) -> int:
+        return self._indices[coord]
+
+    def _nbr_indices(self, idx: int) -> List[int]:
+        return self._nbrs[idx]
+
+    def _opening_blanks(self, label: int) -> List[int]:
+        return self._blanks_by_opening[label]
+
+
 class Game(GameBase):
     """A split-cells minesweeper game."""
 
@@ -36,10 +120,15 @@ class Game(GameBase):
         # fmt: on
     ]
 
+    supported_actions = GameBase.supported_actions | {CellAction.SPLIT}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Used for tracking numbers that should be revealed for performance.
-        self._revealed_board = Board(self.x_size, self.y_size)
+        # The contents each cell would be revealed as, created when the game
+        # starts and kept up to date as cells are split.
+        self._revealed_board: Optional[Board] = None
+        # Created when the remaining 3bv is first requested.
+        self._rem_3bv_tracker: Optional[_Rem3bvTracker] = None
 
     # ---------------------
     # Abstract methods
@@ -56,39 +145,13 @@ class Game(GameBase):
         elif self.state is GameState.WON:
             return 0
 
-        # Partially completed board - do the real work!
-
-        # TODO: This is too slow!
-
-        partial_mf = Minefield.from_coords(
-            self.mf.all_coords,
-            mine_coords=self.mf.mine_coords,
-            per_cell=self.per_cell,
-        )
-        # Replace any openings already found with normal clicks (ones).
-        for c in self.board.all_coords:
-            if type(self.board[c]) is CellContents.Num:
-                partial_mf.completed_board[c] = CellContents.Num(1)
-        # Find the openings which remain.
-        rem_opening_coords = {c for opening in partial_mf.openings for c in opening}
-        # Count the number of essential clicks that have already been
-        # done by counting clicked cells minus the ones at the edge of
-        # an undiscovered opening.
-        num_coords = {
-            c for c in self.board.all_coords if type(self.board[c]) is CellContents.Num
-        }
-        completed_3bv = len(num_coords - rem_opening_coords)
-        # Add necessary splits that have already been done.
-        big_cells_correctly_split = {
-            c.get_big_cell_coord()
-            for c in self.board.all_coords
-            if c.is_split and c not in self.mf.mine_coords
-        }
-        completed_3bv += len(big_cells_correctly_split)
-        return partial_mf._calc_3bv() - completed_3bv
+        return self._get_rem_3bv_tracker().rem_3bv
 
     def _populate_minefield(self, coord: Coord) -> None:
         """Create the minefield in response to a cell being selected."""
+        if self.no_guess:
+            logger.warning("No-guess minefields are not supported in split-cell mode")
+            self.no_guess = False
         if self.first_success:
             safe_coords = [
                 small
@@ -117,21 +180,37 @@ class Game(GameBase):
             logger.debug("Creating minefield without guaranteed first click success")
             self.mf.populate()
 
-    def _is_complete(self) -> bool:
-        return all(
-            type(self.board[c]) is CellContents.Num
-            or all(small in self.mf.mine_coords for small in c.get_small_cell_coords())
+    def _count_unrevealed_safe_cells(self) -> int:
+        return sum(
+            1
             for c in self.board.all_coords
+            if type(self.board[c]) is not CellContents.Num
+            and not all(self.mf[small] > 0 for small in c.get_small_cell_coords())
         )
 
+    def _set_cell(self, coord: Coord, state: CellContents) -> None:
+        super()._set_cell(coord, state)
+        if self._rem_3bv_tracker is not None and type(state) is CellContents.Num:
+            self._rem_3bv_tracker.reveal(coord)
+
+    def _get_rem_3bv_tracker(self) -> _Rem3bvTracker:
+        if self._rem_3bv_tracker is None:
+            self._rem_3bv_tracker = tracker = _Rem3bvTracker(self.mf)
+            # Catch up with the cells already revealed and split.
+            for c in self.board.all_coords:
+                if type(self.board[c]) is CellContents.Num:
+                    tracker.reveal(c)
+                if c.is_split and self.mf[c] == 0:
+                    tracker.split(c.get_big_cell_coord())
+        return self._rem_3bv_tracker
+
     def _select_cell_action(self, coord: Coord) -> None:
         """Implementation of the action of selecting/clicking a cell."""
-        if self._revealed_board[coord] is CellContents.Unclicked:
-            # TODO: This is a bit of a hacky place to do this...
+        if self._revealed_board is None:
             self._revealed_board = self._calc_revealed_board()
 
         if coord.is_split:
-            if coord in self.mf.mine_coords:
+            if self.mf[coord] > 0:
                 logger.debug("Mine hit at %s", coord)
                 self._set_cell(coord, CellContents.HitMine(self.mf[coord]))
                 self._finalise_lost_game()
@@ -140,7 +219,7 @@ class Game(GameBase):
                 self._set_cell(coord, self._revealed_board[coord])
         else:
             small_cells = coord.split()
-            if any(c in self.mf.mine_coords for c in small_cells):
+            if any(self.mf[c] > 0 for c in small_cells):
                 logger.debug("Mine hit in large cell containing %s", coord)
                 for c in small_cells:
                     if self.mf[c] > 0:
@@ -155,44 +234,38 @@ class Game(GameBase):
                 else:  # opening hit
                     logger.debug("Opening found")
                     # Use pre-calculated 'revealed board' for performance.
-                    checked = set()
-                    blank_nbrs = {coord}
-                    all_nbrs = {coord}
-                    while blank_nbrs - checked:
-                        c = (blank_nbrs - checked).pop()
-                        logger.debug("Checking neighbours of %s", c)
-                        cur_nbrs = set(
-                            c
-                            for c in self.board.get_nbrs(c)
-                            if self.board[c] is CellContents.Unclicked
-                        )
-                        all_nbrs |= cur_nbrs
-                        blank_nbrs |= {
-                            c
-                            for c in cur_nbrs
-                            if self._revealed_board[c] == CellContents.Num(0)
-                        }
-                        checked.add(c)
+                    revealed_board = self._revealed_board
+                    blank = CellContents.Num(0)
+                    opening = self._find_opening(
+                        coord, lambda c: revealed_board[c] == blank
+                    )
                     logger.debug("Opening cells deduced")
-                    for c in all_nbrs:
-                        self._set_cell(c, self._revealed_board[c])
+                    for c in opening:
+                        self._set_cell(c, revealed_board[c])
 
     # ---------------------
     # Other methods
     # ---------------------
     def _calc_revealed_board(self) -> Board:
+        """
+        Calculate the contents each cell would be revealed as, with no cells
+        split (as at the start of a game).
+        """
+        big_x_size, big_y_size = self.x_size // 2, self.y_size // 2
+        # Count the mines in each big cell, working on flat row-major arrays.
+        big_mines = [0] * (big_x_size * big_y_size)
+        for i, mines in enumerate(self.mf._mine_counts):
+            if mines:
+                y, x = divmod(i, self.x_size)
+                big_mines[y // 2 * big_x_size + x // 2] += mines
+        nbr_mines = block_sums(big_mines, big_x_size, big_y_size)
         board = Board(self.x_size, self.y_size)
-        for coord in board.all_coords:
-            mines = sum(self.mf[small] for small in coord.get_small_cell_coords())
+        for i, mines in enumerate(big_mines):
+            y, x = divmod(i, big_x_size)
             if mines > 0:
-                board[coord] = CellContents.Flag(mines)
+                board[Coord(2 * x, 2 * y, False)] = CellContents.Flag(mines)
             else:
-                num = sum(
-                    self.mf[small]
-                    for nbr in board.get_nbrs(coord)
-                    for small in nbr.get_small_cell_coords()
-                )
-                board[coord] = CellContents.Num(num)
+                board[Coord(2 * x, 2 * y, False)] = CellContents.Num(nbr_mines[i])
         return board
 
     def _calc_nbr_mines(self, coord: Coord) -> int:
@@ -208,6 +281,10 @@ class Game(GameBase):
         situation.
         """
         for c in coords:
+            mines = sum(self.mf[small] for small in c.get_small_cell_coords())
+            if mines > 0:
+                self._revealed_board[c] = CellContents.Flag(mines)
+                continue
             num = CellContents.Num(self._calc_nbr_mines(c))
             if type(self.board[c]) is CellContents.Num:
                 self._set_cell(c, num)
@@ -247,7 +324,7 @@ class Game(GameBase):
             just_started = True
             self._revealed_board = self._calc_revealed_board()
 
-        if not any(c in self.mf.mine_coords for c in small_cells):
+        if not any(self.mf[c] > 0 for c in small_cells):
             logger.debug("Incorrect cell split %s", coord)
             self._set_cell(coord, CellContents.WrongFlag(1))
             self._finalise_lost_game()
@@ -256,11 +333,36 @@ class Game(GameBase):
         else:
             logger.debug("Splitting cell %s", coord)
             nbrs = self.board.get_nbrs(coord)
+            if self._unrevealed_safe_cells is not None:
+                # The big cell is replaced by its safe small cells.
+                num_safe = sum(1 for c in small_cells if self.mf[c] == 0)
+                if num_safe > 0:
+                    self._unrevealed_safe_cells += num_safe - 1
             self.board.split_coord(coord)
             self._revealed_board.split_coord(coord)
+            if self._rem_3bv_tracker is not None:
+                self._rem_3bv_tracker.split(coord)
             self._cell_updates.update({c: CellContents.Unclicked for c in small_cells})
             self._update_board_numbers((*nbrs, *small_cells))
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = {}
+        return self._take_cell_updates()
+
+    def cycle_cell_flags(
+        self, coord: Coord, *, flag_only: bool = False
+    ) -> Optional[Mapping[Coord, CellContents]]:
+        # Only small cells can hold flags.
+        if not coord.is_split:
+            return {}
+        return super().cycle_cell_flags(coord, flag_only=flag_only)
+
+    def _apply_action(
+        self, action: CellAction, coord: Coord, *, flag_only: bool
+    ) -> Optional[Mapping[Coord, CellContents]]:
+        if coord not in self.board:
+            # The big cell was split by an earlier action in the batch.
+            return None
+        if action is CellAction.SPLIT:
+            return {} if coord.is_split else self.split_cell(coord)
+        elif action is CellAction.REMOVE_FLAGS and not coord.is_split:
+            # Only small cells can hold flags.
+            return {}
+        return super()._apply_action(action, coord, flag_only=flag_only)
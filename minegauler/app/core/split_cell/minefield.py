@@ -26,12 +26,14 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
 
         :param obj:
             The dictionary obtained from decoding JSON. Must contain the
-            following fields: 'x_size', 'y_size', 'mine_coords'.
+            following fields: 'x_size', 'y_size', 'mine_coords'. May also
+            contain 'per_cell', and 'seed', 'safe_coords' and 'no_guess_click'
+            for regenerating the minefield.
         :raise ValueError:
             If the dictionary is missing required fields.
         """
         try:
-            return cls.from_coords(
+            mf = cls.from_coords(
                 (
                     Coord(x, y, True)
                     for x in range(obj["x_size"])
@@ -44,16 +46,22 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
             raise ValueError(
                 "Missing key in dictionary when trying to create minefield"
             ) from e
+        mf._populate_args_from_json(obj, lambda x, y: Coord(x, y, True))
+        return mf
 
     def to_json(self) -> Mapping[str, Any]:
         return dict(
             type="split_cell",
             x_size=self.x_size,
             y_size=self.y_size,
-            mine_coords=[(c.x, c.y) for c in self.mine_coords],
+            mine_coords=self._mine_positions(),
             per_cell=self.per_cell,
+            **self._populate_args_to_json(),
         )
 
+    def _index_coord(self, index: int) -> Coord:
+        return Coord(index % self.x_size, index // self.x_size, True)
+
     def _calc_3bv(self) -> int:
         """Calculate the 3bv of the board."""
         # Number of cells that must be split (contain a safe small cell and a mine).
@@ -66,18 +74,50 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
             [
                 big
                 for big in big_cells_containing_mines
-                if not all(small in self.mine_coords for small in big.split())
+                if not all(self[small] > 0 for small in big.split())
             ]
         )
         # Optimally click the openings first to reveal the edge numbers.
         clicks += len(self.openings)
         # Find remaining clicks required to reveal numbers.
         exposed = len({c for opening in self.openings for c in opening})
-        clicks += (
-            len(self.completed_board.all_coords) - len(set(self.mine_coords)) - exposed
-        )
+        mine_cells = self._num_indices - self._mine_counts.count(0)
+        clicks += len(self.completed_board.all_coords) - mine_cells - exposed
         return clicks
 
+    def _calc_rem_3bv(self, board: Board) -> int:
+        """
+        Calculate the 3bv remaining for a partially completed board.
+
+        This recalculates everything from scratch, so is only intended as a
+        reference for the incremental tracking done by a game.
+
+        :param board:
+            The board showing the cells revealed and split.
+        """
+        partial_mf = type(self).from_coords(
+            self.all_coords, mine_coords=self.mine_coords, per_cell=self.per_cell
+        )
+        # Replace any openings already found with normal clicks (ones).
+        for c in board.all_coords:
+            if type(board[c]) is CellContents.Num:
+                partial_mf.completed_board[c] = CellContents.Num(1)
+        # Find the openings which remain.
+        rem_opening_coords = {c for opening in partial_mf.openings for c in opening}
+        # Count the number of essential clicks that have already been
+        # done by counting clicked cells minus the ones at the edge of
+        # an undiscovered opening.
+        num_coords = {c for c in board.all_coords if type(board[c]) is CellContents.Num}
+        completed_3bv = len(num_coords - rem_opening_coords)
+        # Add necessary splits that have already been done.
+        big_cells_correctly_split = {
+            c.get_big_cell_coord()
+            for c in board.all_coords
+            if c.is_split and self[c] == 0
+        }
+        completed_3bv += len(big_cells_correctly_split)
+        return partial_mf._calc_3bv() - completed_3bv
+
     def _calc_completed_board(self) -> Board:
         """
         Create the completed board with the flags and numbers that should be
@@ -85,7 +125,7 @@ class Minefield(RegularMinefieldBase[Coord, Board]):
         """
         board = Board(self.x_size, self.y_size)
         # First mark all mines as flags, splitting the containing big cells.
-        for coord in set(self.mine_coords):
+        for coord in {c for c in self.all_coords if self[c] > 0}:
             if coord not in board:
                 big_coord = board.get_coord_at(coord.x, coord.y)
                 board.split_coord(big_coord)
@@ -9,7 +9,7 @@ from ...shared.types import Coord as CoordBase
 
 class Coord(CoordBase):
     fields = ("x", "y", "is_split")
-    __slots__ = fields
+    __slots__ = (*fields, "_hash")
 
     def __init__(self, x: int, y: int, is_split: bool):
         """
@@ -25,6 +25,19 @@ class Coord(CoordBase):
         self.x = x
         self.y = y
         self.is_split = is_split
+        self._hash = hash((x, y, is_split))
+
+    def __eq__(self, other):
+        if type(other) is Coord:
+            return (
+                self.x == other.x
+                and self.y == other.y
+                and self.is_split == other.is_split
+            )
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return self._hash
 
     def get_small_cell_coords(self) -> Iterable["Coord"]:
         if self.is_split:
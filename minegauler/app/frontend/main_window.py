@@ -537,6 +537,13 @@ class MinegaulerGUI(
         drag_act.setCheckable(True)
         drag_act.setChecked(self._state.drag_select)
 
+        # Probability overlay
+        prob_act = QAction("Show probabilities", self, checkable=True)
+        self._opts_menu.addAction(prob_act)
+        prob_act.triggered.connect(
+            lambda checked: self._mf_widget.set_show_probabilities(checked)
+        )
+
         # Max mines per cell option
         def get_change_per_cell_func(n):
             def change_per_cell():
@@ -637,11 +644,13 @@ class MinegaulerGUI(
 
         self._panel_widget.timer.set_time(int(info.started_info.elapsed + 1))
 
-        # Store the highscore if the game was won.
+        # Store the highscore if the game was won. No-guess games are easier,
+        # so are kept out of the highscore tables.
         if (
             info.game_state is GameState.WON
             and info.difficulty is not Difficulty.CUSTOM
             and not info.minefield_known
+            and not info.no_guess
         ):
             assert info.started_info.prop_complete == 1
             highscore = HighscoreStruct(
@@ -21,7 +21,7 @@ from ...core import BoardBase, api
 from ...shared.types import CellContents, CellImageType, Coord, GameMode
 from ..state import State
 from ..utils import CellUpdate_T, MouseMove
-from . import regular, simulate, split_cell
+from . import probabilities, regular, simulate, split_cell
 from ._base import RAISED_CELL, SUNKEN_CELL, FlagAction, MinefieldWidgetImplBase
 
 
@@ -88,6 +88,8 @@ class MinefieldWidget(QGraphicsView):
         self._impl: MinefieldWidgetImplBase = _IMPLS[state.game_mode](
             self._scene, ctrlr, state
         )
+        # Optional heat-map of mine probabilities, off by default.
+        self._prob_overlay = probabilities.ProbabilityOverlay(self._scene, ctrlr, state)
 
         # Keep track of mouse button states.
         self._mouse_coord: Optional[Coord] = None
@@ -440,12 +442,22 @@ class MinefieldWidget(QGraphicsView):
         self.size_changed.emit()
 
     def _redraw_cells(self) -> None:
+        self._prob_overlay.forget_items()
         self._scene.clear()
         for coord in self._board.all_coords:
             self._set_cell_image(coord, self._board[coord])
+        self._prob_overlay.schedule()
 
     def switch_mode(self, mode: GameMode) -> None:
         self._impl = _IMPLS[mode](self._scene, self._ctrlr, self._state)
+        self._prob_overlay.schedule()
+
+    def set_show_probabilities(self, show: bool) -> None:
+        """
+        Set whether to show the probability of each cell containing a mine,
+        which is calculated in the background after each update.
+        """
+        self._prob_overlay.set_enabled(show)
 
     def reset(self) -> None:
         """Reset all cell images and other state for a new game."""
@@ -468,6 +480,10 @@ class MinefieldWidget(QGraphicsView):
         self._mouse_events.append((self._elapsed, cell_updates))
         for c, state in cell_updates.items():
             self._set_cell_image(c, state)
+        # Remove stale probabilities straight away, with the new ones
+        # calculated in the background.
+        self._prob_overlay.invalidate(cell_updates)
+        self._prob_overlay.schedule()
         # Always display cell updates as soon as possible.
         QApplication.processEvents()
 
@@ -0,0 +1,177 @@
+# October 2026
+
+"""
+Overlay showing the probability of each unclicked cell containing a mine.
+
+The probabilities are calculated by a worker in a background thread so that
+the GUI thread is never blocked. Requests are debounced, so a burst of cell
+updates only triggers one calculation, and each request is tagged with an ID
+so that any request or result superseded by a newer board state is dropped.
+Regular game mode only.
+
+"""
+
+__all__ = ("ProbabilityOverlay",)
+
+import logging
+from typing import Dict, Iterable, Mapping, Optional
+
+from PyQt5.QtCore import QObject, Qt, QThread, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QApplication, QGraphicsRectItem, QGraphicsScene
+
+from ...core import api, solver
+from ...core.regular import Board, Coord
+from ...shared.types import GameMode
+from ..state import State
+
+
+logger = logging.getLogger(__name__)
+
+
+# Time to wait for further updates before starting a calculation.
+DEBOUNCE_MS = 50
+
+
+class _Worker(QObject):
+    """Calculates probabilities in the background thread."""
+
+    finished = pyqtSignal(int, object)
+
+    def __init__(self):
+        super().__init__()
+        # The ID of the most recent request, set from the GUI thread.
+        self.latest_request: int = 0
+
+    @pyqtSlot(int, object, int, int)
+    def calculate(self, request_id: int, board: Board, mines: int, per_cell: int):
+        if request_id != self.latest_request:
+            logger.debug("Skipping superseded probability request %d", request_id)
+            return
+        try:
+            probs = solver.calc_probabilities(board, mines, per_cell=per_cell)
+        except ValueError as e:
+            logger.debug("Unable to calculate probabilities: %s", e)
+            probs = {}
+        self.finished.emit(request_id, probs)
+
+
+class ProbabilityOverlay(QObject):
+    """
+    A heat-map layer of cell mine probabilities, drawn on top of the cells.
+    """
+
+    _request = pyqtSignal(int, object, int, int)
+
+    def __init__(
+        self, scene: QGraphicsScene, ctrlr: api.AbstractController, state: State
+    ):
+        super().__init__()
+        self._scene: QGraphicsScene = scene
+        self._ctrlr: api.AbstractController = ctrlr
+        self._state: State = state
+        self._request_id: int = 0
+        self._items: Dict[Coord, QGraphicsRectItem] = {}
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._start_calculation)
+
+        # The worker thread is only started when the overlay is enabled.
+        self._thread: Optional[QThread] = None
+        self._worker: Optional[_Worker] = None
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_thread)
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Turn the overlay on or off."""
+        if enabled == self.enabled:
+            return
+        if enabled:
+            logger.info("Enabling probability overlay")
+            self._thread = QThread()
+            self._worker = _Worker()
+            self._worker.moveToThread(self._thread)
+            self._request.connect(self._worker.calculate)
+            self._worker.finished.connect(self._on_finished)
+            self._thread.start()
+            self.schedule()
+        else:
+            logger.info("Disabling probability overlay")
+            self._timer.stop()
+            self._stop_thread()
+            self.clear()
+
+    def schedule(self) -> None:
+        """
+        Request the probabilities be recalculated for the current board, once
+        there have been no further requests for a short time.
+        """
+        if not self.enabled:
+            return
+        # Invalidate any calculation in progress.
+        self._request_id += 1
+        self._worker.latest_request = self._request_id
+        self._timer.start()
+
+    def invalidate(self, coords: Iterable[Coord]) -> None:
+        """Remove the overlay from cells that have changed."""
+        for c in coords:
+            item = self._items.pop(c, None)
+            if item is not None:
+                self._scene.removeItem(item)
+
+    def clear(self) -> None:
+        """Remove the overlay from all cells."""
+        for item in self._items.values():
+            self._scene.removeItem(item)
+        self._items.clear()
+
+    def forget_items(self) -> None:
+        """Forget the overlay items, after they have been removed from the scene."""
+        self._items.clear()
+
+    def _stop_thread(self) -> None:
+        if self._thread is None:
+            return
+        self._request.disconnect(self._worker.calculate)
+        self._thread.quit()
+        self._thread.wait()
+        self._thread = None
+        self._worker = None
+
+    def _start_calculation(self) -> None:
+        if not self.enabled:
+            return
+        info = self._ctrlr.get_game_info()
+        if info.mode is not GameMode.REGULAR or info.game_state.finished():
+            self.clear()
+            return
+        board = self._ctrlr.board.copy()
+        logger.debug("Requesting probabilities (request %d)", self._request_id)
+        self._request.emit(self._request_id, board, info.mines, info.per_cell)
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, request_id: int, probs: Mapping[Coord, float]) -> None:
+        if request_id != self._request_id:
+            logger.debug("Dropping superseded probabilities (request %d)", request_id)
+            return
+        self.clear()
+        btn_size = self._state.btn_size
+        for c, prob in probs.items():
+            item = QGraphicsRectItem(c.x * btn_size, c.y * btn_size, btn_size, btn_size)
+            # Shade from green for safe cells to red for mines.
+            item.setBrush(
+                QBrush(QColor(int(255 * prob), int(255 * (1 - prob)), 0, 100))
+            )
+            item.setPen(QColor(Qt.transparent))
+            item.setToolTip(f"{prob:.1%}")
+            item.setZValue(1)
+            self._scene.addItem(item)
+            self._items[c] = item
@@ -5,6 +5,9 @@ Types used throughout the project.
 
 Exports
 -------
+.. class:: CellAction
+    An enum of actions that can be performed on a cell.
+
 .. class:: CellContents
     An ADT-like class providing cell contents types.
 
@@ -35,6 +38,7 @@ Exports
 """
 
 __all__ = (
+    "CellAction",
     "CellContents",
     "CellImageType",
     "Coord",
@@ -48,9 +52,8 @@ __all__ = (
 
 import abc
 import enum
-import functools
 import os
-from typing import Union
+from typing import Dict, List, Optional, Union
 
 
 PathLike = Union[str, bytes, os.PathLike]
@@ -62,6 +65,8 @@ PathLike = Union[str, bytes, os.PathLike]
 
 
 class Coord(metaclass=abc.ABCMeta):
+    __slots__ = ()
+
     fields = ("x", "y")
 
     x: int
@@ -93,17 +98,53 @@ class Coord(metaclass=abc.ABCMeta):
 # ------------------------------------------------------------------------------
 
 
+# Largest number a cell contents instance can hold, so that the type and number
+# fit in a 16-bit code (see 'CellContents.code').
+_MAX_NUM = 255
+_NUM_BITS = 8
+
+
 class _NumericCellContentsMixin:
     """
     A mixin for numeric cell contents types, allowing adding and subtracting integers.
+
+    Instances are interned, with construction looking up a fixed table of the
+    instances for each number.
     """
 
+    __slots__ = ()
+
     char: str
+    num: int
 
-    def __init__(self, num):
+    # Interned instances indexed by number, None for invalid numbers.
+    _instances: List[Optional["_NumericCellContentsMixin"]]
+
+    def __new__(cls, num):
+        try:
+            if num >= 0:
+                item = cls._instances[num]
+                if item is not None:
+                    return item
+        except (IndexError, TypeError):
+            pass
+        cls._check_num(num)
+        raise AssertionError(f"No {cls.__name__} instance for valid number {num}")
+
+    @classmethod
+    def _check_num(cls, num) -> None:
+        """
+        Check a number is valid for the cell contents type.
+
+        :raise TypeError:
+            If the number is not an integer.
+        :raise ValueError:
+            If the number is out of range.
+        """
         if not isinstance(num, int):
             raise TypeError("Number should be an integer")
-        self.num = num
+        if num > _MAX_NUM:
+            raise ValueError(f"Cell contents number cannot be greater than {_MAX_NUM}")
 
     def __repr__(self):
         return self.char + str(self.num)
@@ -122,9 +163,22 @@ class _NumericCellContentsMixin:
 
 
 class CellContents:
-    """Abstract base class for contents of a minesweeper board cell."""
+    """
+    Abstract base class for contents of a minesweeper board cell.
+
+    All instances are interned, so can be compared by identity. Each instance
+    also has a compact integer encoding available as the 'code' attribute,
+    which can be converted back using 'CellContents.from_code()'.
+    """
+
+    __slots__ = ("code",)
 
     char: str
+    code: int
+
+    # The number of low bits of a code that hold the number, the bits above
+    # identifying the type.
+    CODE_NUM_BITS: int = _NUM_BITS
 
     Unclicked = NotImplemented
     UnclickedSunken = NotImplemented
@@ -136,11 +190,17 @@ class CellContents:
 
     items = NotImplemented
 
-    @functools.lru_cache(maxsize=None)
-    def __new__(cls, *args):
+    def __new__(cls):
         if cls is CellContents:
             raise TypeError("Base class should not be instantiated")
-        return super().__new__(cls)
+        try:
+            return _SINGLETONS[cls]
+        except KeyError:
+            item = _SINGLETONS[cls] = super().__new__(cls)
+            return item
+
+    def __reduce__(self):
+        return CellContents.from_code, (self.code,)
 
     def __str__(self):
         return repr(self)
@@ -156,6 +216,10 @@ class CellContents:
     def from_str(string: str) -> "CellContents":
         return NotImplemented  # Implemented below, after subclasses
 
+    @staticmethod
+    def from_code(code: int) -> "CellContents":
+        return NotImplemented  # Implemented below, after subclasses
+
     def is_type(self, item: "CellContents") -> bool:
         if item in [self.Unclicked, self.UnclickedSunken]:
             return self is item
@@ -168,23 +232,34 @@ class CellContents:
         return False  # Overridden by subclasses as required
 
 
+# Instances of the non-numeric cell contents types.
+_SINGLETONS: Dict[type, CellContents] = {}
+
+
 class _CellUnclicked(CellContents):
     """Unclicked cell on a minesweeper board."""
 
+    __slots__ = ()
+
     char = "#"
 
 
 class _CellUnclickedSunken(_CellUnclicked):
     """Unclicked sunken cell on a minesweeper board."""
 
+    __slots__ = ()
+
 
 class _CellNum(_NumericCellContentsMixin, CellContents):
     """Number shown in a cell on a minesweeper board."""
 
+    __slots__ = ("num",)
+
     char = ""
 
-    def __init__(self, num):
-        super().__init__(num)
+    @classmethod
+    def _check_num(cls, num) -> None:
+        super()._check_num(num)
         if num < 0:
             raise ValueError("Cell value cannot be negative")
 
@@ -192,6 +267,8 @@ class _CellNum(_NumericCellContentsMixin, CellContents):
 class _CellMineType(_NumericCellContentsMixin, CellContents):
     """Abstract base class for the number of a mine type in a cell."""
 
+    __slots__ = ("num",)
+
     def __new__(cls, num=1):
         if cls is _CellMineType:
             raise TypeError(
@@ -200,8 +277,9 @@ class _CellMineType(_NumericCellContentsMixin, CellContents):
             )
         return super().__new__(cls, num)
 
-    def __init__(self, num=1):
-        super().__init__(num)
+    @classmethod
+    def _check_num(cls, num) -> None:
+        super()._check_num(num)
         if num < 1:
             raise ValueError("Mine-type cell contents must represent one or more mines")
 
@@ -212,24 +290,32 @@ class _CellMineType(_NumericCellContentsMixin, CellContents):
 class _CellMine(_CellMineType):
     """Number of mines in a cell shown on a minesweeper board."""
 
+    __slots__ = ()
+
     char = "M"
 
 
 class _CellHitMine(_CellMineType):
     """Number of hit mines in a cell shown on a minesweeper board."""
 
+    __slots__ = ()
+
     char = "!"
 
 
 class _CellFlag(_CellMineType):
     """Number of flags in a cell shown on a minesweeper board."""
 
+    __slots__ = ()
+
     char = "F"
 
 
 class _CellWrongFlag(_CellFlag):
     """Number of incorrect flags in a cell shown on a minesweeper board."""
 
+    __slots__ = ()
+
     char = "X"
 
 
@@ -253,6 +339,32 @@ CellContents.items = [
 ]
 
 
+# Cell contents instances indexed by their code, None for unused codes. The
+# code is made up of the index of the type in 'CellContents.items' and the
+# number (for numeric types).
+_BY_CODE: List[Optional[CellContents]] = [None] * (len(CellContents.items) << _NUM_BITS)
+
+
+def _intern_cell_contents() -> None:
+    """Create the interned instances of each cell contents type."""
+    for tag, item in enumerate(CellContents.items):
+        if isinstance(item, CellContents):
+            item.code = tag << _NUM_BITS
+            _BY_CODE[item.code] = item
+            continue
+        min_num = 1 if issubclass(item, _CellMineType) else 0
+        item._instances = [None] * min_num
+        for num in range(min_num, _MAX_NUM + 1):
+            instance = object.__new__(item)
+            instance.num = num
+            instance.code = tag << _NUM_BITS | num
+            item._instances.append(instance)
+            _BY_CODE[instance.code] = instance
+
+
+_intern_cell_contents()
+
+
 def _from_char(char: str) -> CellContents:
     """
     Get the class of mine-like cell contents using the character
@@ -280,8 +392,30 @@ def _from_str(string: str) -> CellContents:
         raise ValueError(f"Unknown cell contents representation {string!r}")
 
 
+def _from_code(code: int) -> CellContents:
+    """
+    Get the cell contents from its integer encoding.
+
+    :param code:
+        The code, as given by 'CellContents.code'.
+    :return:
+        The cell contents instance.
+    :raise ValueError:
+        If the code does not correspond to any cell contents.
+    """
+    try:
+        if code >= 0:
+            item = _BY_CODE[code]
+            if item is not None:
+                return item
+    except (IndexError, TypeError):
+        pass
+    raise ValueError(f"Unknown cell contents code {code!r}")
+
+
 CellContents.from_char = _from_char
 CellContents.from_str = _from_str
+CellContents.from_code = _from_code
 
 
 # ------------------------------------------------------------------------------
@@ -340,6 +474,16 @@ class GameMode(str, enum.Enum):
             return cls(value)  # Raise standard exception
 
 
+class CellAction(str, enum.Enum):
+    """Enum of actions that can be performed on a cell."""
+
+    SELECT = "select"
+    FLAG = "flag"
+    CHORD = "chord"
+    SPLIT = "split"
+    REMOVE_FLAGS = "remove-flags"
+
+
 # ------------------------------------------------------------------------------
 # GUI enums
 # ------------------------------------------------------------------------------
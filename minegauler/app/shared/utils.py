@@ -264,6 +264,7 @@ class GameOptsStruct(StructConstructorMixin):
     per_cell: int = 1
     lives: int = 1
     mode: GameMode = GameMode.REGULAR
+    no_guess: bool = False
 
 
 @attr.attrs(auto_attribs=True)
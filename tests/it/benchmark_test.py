@@ -12,6 +12,7 @@ import pytest
 from pytest_benchmark.fixture import BenchmarkFixture
 
 from minegauler.app import core, frontend
+from minegauler.app.core import regular, split_cell
 from minegauler.app.shared.types import CellContents
 
 from . import process_events as _utils_process_events
@@ -112,3 +113,181 @@ class TestBenchmarks(ITBase):
             self.load_minefield(mf)
 
         benchmark.pedantic(self.ctrlr.select_cell, ((1, 0),), setup=setup)
+
+
+@pytest.mark.benchmark
+class TestCoordBenchmarks:
+    """Benchmark use of coords in sets and dicts."""
+
+    size = 100
+
+    @pytest.fixture(
+        params=[
+            lambda x, y: regular.Coord(x, y),
+            lambda x, y: split_cell.Coord(x, y, True),
+        ],
+        ids=["regular", "split-cell"],
+    )
+    def coords(self, request):
+        return [request.param(x, y) for x in range(self.size) for y in range(self.size)]
+
+    def test_set_build(self, benchmark: BenchmarkFixture, coords):
+        benchmark(set, coords)
+
+    def test_set_membership(self, benchmark: BenchmarkFixture, coords):
+        coords_set = set(coords)
+        benchmark(lambda: all(c in coords_set for c in coords))
+
+    def test_dict_lookup(self, benchmark: BenchmarkFixture, coords):
+        coords_dict = dict.fromkeys(coords, 0)
+        benchmark(lambda: sum(coords_dict[c] for c in coords))
+
+
+@pytest.mark.benchmark
+class TestOpeningBenchmarks:
+    """Benchmark revealing a huge opening on a near-empty board."""
+
+    size = 500
+
+    def test_regular(self, benchmark: BenchmarkFixture):
+        mf = regular.Minefield.from_coords(
+            (regular.Coord(x, y) for x in range(self.size) for y in range(self.size)),
+            mine_coords=[regular.Coord(self.size - 1, 0)],
+        )
+
+        def setup():
+            game = regular.Game.from_minefield(mf)
+            # Flag a blank cell so the opening is not the whole board, which
+            # would be handled without searching.
+            game.set_cell_flags(regular.Coord(self.size // 2, self.size // 2), 1)
+            return (game, regular.Coord(0, self.size - 1)), {}
+
+        benchmark.pedantic(
+            lambda game, coord: game.select_cell(coord), setup=setup, rounds=1
+        )
+
+    def test_split_cell(self, benchmark: BenchmarkFixture):
+        mf = split_cell.Minefield.from_coords(
+            (
+                split_cell.Coord(x, y, True)
+                for x in range(self.size)
+                for y in range(self.size)
+            ),
+            mine_coords=[split_cell.Coord(self.size - 1, 0, True)],
+        )
+
+        def setup():
+            game = split_cell.Game.from_minefield(mf)
+            return (game, split_cell.Coord(0, self.size - 2, False)), {}
+
+        benchmark.pedantic(
+            lambda game, coord: game.select_cell(coord), setup=setup, rounds=1
+        )
+
+
+@pytest.mark.benchmark
+class TestNoOpActionBenchmarks:
+    """
+    Benchmark actions that are ignored by the game, e.g. clicking a revealed
+    number. The operations per second give the number of actions per second.
+    """
+
+    @pytest.fixture
+    def game(self) -> regular.Game:
+        mf = regular.Minefield.from_2d_array(
+            [
+                # fmt: off
+                [0, 0, 0, 1],
+                [0, 0, 0, 0],
+                [0, 0, 0, 0],
+                [1, 0, 0, 0],
+                # fmt: on
+            ]
+        )
+        game = regular.Game.from_minefield(mf)
+        game.select_cell(regular.Coord(2, 0))
+        return game
+
+    def test_select_revealed(self, benchmark: BenchmarkFixture, game):
+        benchmark(game.select_cell, regular.Coord(2, 0))
+
+    def test_flag_revealed(self, benchmark: BenchmarkFixture, game):
+        benchmark(game.set_cell_flags, regular.Coord(2, 0), 1)
+
+    def test_chord_unclicked(self, benchmark: BenchmarkFixture, game):
+        benchmark(game.chord_on_cell, regular.Coord(3, 3))
+
+
+@pytest.mark.benchmark
+class TestEngineBenchmarks:
+    """Compare the standard regular game engine with the bitboard engine."""
+
+    size = 100
+
+    @pytest.fixture(params=[regular, regular.bitboard], ids=["array", "bitboard"])
+    def engine(self, request) -> ModuleType:
+        return request.param
+
+    @pytest.fixture
+    def mf(self) -> regular.Minefield:
+        mf = regular.Minefield(
+            (regular.Coord(x, y) for x in range(self.size) for y in range(self.size)),
+            mines=self.size**2 // 5,
+        )
+        mf.populate([regular.Coord(x, y) for x in range(2) for y in range(2)], seed=0)
+        return mf
+
+    def _started_game(self, engine: ModuleType, mf: regular.Minefield):
+        """Create a game with a number cell revealed."""
+        game = engine.Game.from_minefield(mf)
+        game.select_cell(regular.Coord(0, 0))
+        return game
+
+    def test_first_click(self, benchmark: BenchmarkFixture, engine, mf):
+        def setup():
+            return (engine.Game.from_minefield(mf),), {}
+
+        benchmark.pedantic(
+            lambda game: game.select_cell(regular.Coord(0, 0)),
+            setup=setup,
+            rounds=20,
+        )
+
+    def test_select_cells(self, benchmark: BenchmarkFixture, engine, mf):
+        coords = [
+            c
+            for c in mf.all_coords
+            if mf[c] == 0 and mf.completed_board[c] != CellContents.Num(0)
+        ][:500]
+
+        def setup():
+            return (self._started_game(engine, mf),), {}
+
+        def select_cells(game):
+            for c in coords:
+                game.select_cell(c)
+
+        benchmark.pedantic(select_cells, setup=setup, rounds=20)
+
+    def test_flag_and_chord(self, benchmark: BenchmarkFixture, engine, mf):
+        mine_coords = mf.mine_coords[:200]
+        chord_coords = [
+            nbr
+            for c in mine_coords
+            for nbr in mf.completed_board.get_nbrs(c)
+            if mf[nbr] == 0
+        ][:500]
+
+        def setup():
+            game = self._started_game(engine, mf)
+            for c in mine_coords:
+                game.set_cell_flags(c, mf[c])
+            for c in chord_coords:
+                game.select_cell(c)
+            return (game,), {}
+
+        def chord_cells(game):
+            for c in chord_coords:
+                game.chord_on_cell(c)
+
+        benchmark.pedantic(chord_cells, setup=setup, rounds=20)
@@ -0,0 +1,382 @@
+# October 2026
+
+"""
+Test the core API module.
+
+"""
+
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from minegauler.app.core import api
+from minegauler.app.core.api import BackPressure, Delivery, GameUpdate
+from minegauler.app.core.regular import Coord
+from minegauler.app.shared.types import CellContents, GameState
+
+
+class _Listener(api.AbstractListener):
+    """A listener recording the calls made on it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def reset(self):
+        self.calls.append(("reset",))
+
+    def resize_minefield(self, x_size, y_size):
+        self.calls.append(("resize_minefield", x_size, y_size))
+
+    def set_mines(self, mines):
+        self.calls.append(("set_mines", mines))
+
+    def set_difficulty(self, diff):
+        self.calls.append(("set_difficulty", diff))
+
+    def update_cells(self, cell_updates):
+        self.calls.append(("update_cells", dict(cell_updates)))
+
+    def update_game_state(self, game_state):
+        self.calls.append(("update_game_state", game_state))
+
+    def update_mines_remaining(self, mines_remaining):
+        self.calls.append(("update_mines_remaining", mines_remaining))
+
+    def ui_mode_changed(self, mode):
+        self.calls.append(("ui_mode_changed", mode))
+
+    def game_mode_about_to_change(self, mode):
+        self.calls.append(("game_mode_about_to_change", mode))
+
+    def game_mode_changed(self, mode):
+        self.calls.append(("game_mode_changed", mode))
+
+    def handle_exception(self, method, exc):
+        self.calls.append(("handle_exception", method, exc))
+
+
+class TestGameUpdate:
+    """Test the GameUpdate class."""
+
+    def test_merge(self):
+        first = GameUpdate(
+            cell_updates={Coord(0, 0): CellContents.Num(1)},
+            mines_remaining=5,
+            game_state=GameState.ACTIVE,
+        )
+        second = GameUpdate(
+            cell_updates={
+                Coord(0, 0): CellContents.Num(2),
+                Coord(1, 0): CellContents.Flag(1),
+            },
+            mines_remaining=4,
+        )
+        assert first.merge(second) == GameUpdate(
+            cell_updates={
+                Coord(0, 0): CellContents.Num(2),
+                Coord(1, 0): CellContents.Flag(1),
+            },
+            mines_remaining=4,
+            game_state=GameState.ACTIVE,
+        )
+        assert first.merge(GameUpdate()) == first
+
+
+class TestNotifier:
+    """Test the _Notifier class."""
+
+    def test_update_batch(self):
+        """Test a batched update is split up for listeners by default."""
+        listener = _Listener()
+        notif = api._Notifier([listener])
+        notif.update_batch(
+            GameUpdate(
+                cell_updates={Coord(0, 0): CellContents.Num(1)},
+                game_state=GameState.WON,
+            )
+        )
+        assert listener.calls == [
+            ("update_cells", {Coord(0, 0): CellContents.Num(1)}),
+            ("update_game_state", GameState.WON),
+        ]
+
+    def test_register_unregister(self):
+        listener1, listener2 = _Listener(), _Listener()
+        notif = api._Notifier()
+        notif.register_listener(listener1)
+        notif.register_listener(listener2)
+        notif.set_mines(10)
+        notif.unregister_listener(listener1)
+        notif.unregister_listener(listener1)  # not registered
+        notif.reset()
+        assert listener1.calls == [("set_mines", 10)]
+        assert listener2.calls == [("set_mines", 10), ("reset",)]
+
+    def test_method_lookup_on_register(self):
+        """Test listener methods are looked up when registering."""
+        listener = mock.Mock(spec=api.AbstractListener)
+        notif = api._Notifier([listener])
+        with mock.patch.object(listener, "reset") as mock_reset:
+            notif.reset()
+        mock_reset.assert_not_called()
+        listener.reset.assert_called_once_with()
+
+    def test_reentrant_notifications(self):
+        """Test notifications sent while a listener is busy are queued."""
+        notif = api._Notifier()
+
+        class ReentrantListener(_Listener):
+            def update_batch(self, update):
+                super().update_batch(update)
+                if len(self.calls) == 1:
+                    # Trigger further updates while handling the first.
+                    notif.update_batch(GameUpdate(mines_remaining=3))
+                    notif.update_batch(GameUpdate(game_state=GameState.LOST))
+                    notif.set_mines(1)
+
+        listener = ReentrantListener()
+        other_listener = _Listener()
+        notif.register_listener(listener)
+        notif.register_listener(other_listener)
+        notif.update_batch(GameUpdate(mines_remaining=4))
+        # The queued batches are coalesced, and delivered in order once the
+        # listener is done with the first.
+        assert listener.calls == [
+            ("update_mines_remaining", 4),
+            ("update_mines_remaining", 3),
+            ("update_game_state", GameState.LOST),
+            ("set_mines", 1),
+        ]
+        # Other listeners receive the updates in order too.
+        assert other_listener.calls == [
+            ("update_mines_remaining", 3),
+            ("update_game_state", GameState.LOST),
+            ("set_mines", 1),
+        ]
+
+    def test_concurrent_senders(self):
+        """Test notifications sent from several threads are all delivered."""
+        lock = threading.Lock()
+        active = 0
+        max_active = 0
+
+        class SlowListener(_Listener):
+            def set_mines(self, mines):
+                nonlocal active, max_active
+                with lock:
+                    active += 1
+                    max_active = max(max_active, active)
+                time.sleep(0.0001)
+                super().set_mines(mines)
+                with lock:
+                    active -= 1
+
+        listener = SlowListener()
+        notif = api._Notifier([listener])
+
+        def send(start):
+            for i in range(start, start + 50):
+                notif.set_mines(i)
+
+        senders = [threading.Thread(target=send, args=(i * 50,)) for i in range(4)]
+        for sender in senders:
+            sender.start()
+        for sender in senders:
+            sender.join(10)
+        # The listener is only called by one thread at a time.
+        assert max_active == 1
+        assert sorted(c[1] for c in listener.calls) == list(range(200))
+        assert notif.get_listener_stats(listener).queue_depth == 0
+
+    def test_listener_exception(self):
+        exc = RuntimeError("listener error")
+
+        class BadListener(_Listener):
+            def reset(self):
+                raise exc
+
+        listener = BadListener()
+        other_listener = _Listener()
+        notif = api._Notifier([listener, other_listener])
+        notif.reset()
+        notif.set_mines(2)
+        assert listener.calls == [("handle_exception", "reset", exc), ("set_mines", 2)]
+        assert other_listener.calls == [("reset",), ("set_mines", 2)]
+
+    def test_get_listener_stats(self):
+        listener = _Listener()
+        notif = api._Notifier([listener])
+        notif.reset()
+        notif.set_mines(2)
+        stats = notif.get_listener_stats(listener)
+        assert stats.delivered == 2
+        assert stats.dropped == 0
+        assert stats.queue_depth == 0
+        assert stats.max_queue_depth == 1
+        assert stats.mean_latency >= 0
+        with pytest.raises(ValueError):
+            notif.get_listener_stats(_Listener())
+
+
+class TestThreadedDelivery:
+    """Test delivering notifications to listeners in a worker thread."""
+
+    @staticmethod
+    def _blocked_listener():
+        """Create a listener that blocks in reset() until released."""
+        started, release = threading.Event(), threading.Event()
+
+        class BlockedListener(_Listener):
+            def reset(self):
+                started.set()
+                release.wait(5)
+                super().reset()
+
+        return BlockedListener(), started, release
+
+    def test_order(self):
+        listener = _Listener()
+        notif = api._Notifier()
+        notif.register_listener(listener, delivery=Delivery.THREAD)
+        for i in range(100):
+            notif.set_mines(i)
+        # Unregistering waits for queued notifications to be delivered.
+        notif.unregister_listener(listener)
+        assert listener.calls == [("set_mines", i) for i in range(100)]
+        notif.set_mines(100)
+        assert len(listener.calls) == 100
+
+    def test_drop(self):
+        listener, started, release = self._blocked_listener()
+        notif = api._Notifier()
+        notif.register_listener(
+            listener,
+            delivery=Delivery.THREAD,
+            max_queue=2,
+            back_pressure=BackPressure.DROP,
+        )
+        notif.reset()
+        assert started.wait(5)
+        for i in range(4):
+            notif.update_batch(GameUpdate(mines_remaining=i))
+        # Other notifications are queued even though the queue is full.
+        notif.reset()
+        notif.set_mines(5)
+        stats = notif.get_listener_stats(listener)
+        assert stats.dropped == 2
+        assert stats.coalesced == 0
+        assert stats.queue_depth == 4
+        release.set()
+        notif.close()
+        assert listener.calls == [
+            ("reset",),
+            ("update_mines_remaining", 0),
+            ("update_mines_remaining", 1),
+            ("reset",),
+            ("set_mines", 5),
+        ]
+
+    def test_block(self):
+        listener, started, release = self._blocked_listener()
+        notif = api._Notifier()
+        notif.register_listener(
+            listener,
+            delivery=Delivery.THREAD,
+            max_queue=1,
+            back_pressure=BackPressure.BLOCK,
+        )
+        notif.reset()
+        assert started.wait(5)
+        notif.set_mines(0)
+        sender = threading.Thread(target=notif.set_mines, args=(1,))
+        sender.start()
+        sender.join(0.1)
+        # Waiting for space in the queue.
+        assert sender.is_alive()
+        release.set()
+        sender.join(5)
+        assert not sender.is_alive()
+        # Updates are not coalesced.
+        notif.update_batch(GameUpdate(mines_remaining=2))
+        notif.update_batch(GameUpdate(mines_remaining=3))
+        notif.close()
+        assert listener.calls == [
+            ("reset",),
+            ("set_mines", 0),
+            ("set_mines", 1),
+            ("update_mines_remaining", 2),
+            ("update_mines_remaining", 3),
+        ]
+
+    def test_coalesce(self):
+        listener, started, release = self._blocked_listener()
+        notif = api._Notifier()
+        notif.register_listener(
+            listener,
+            delivery=Delivery.THREAD,
+            max_queue=1,
+            back_pressure=BackPressure.COALESCE,
+        )
+        notif.reset()
+        assert started.wait(5)
+        for i in range(3):
+            notif.update_batch(GameUpdate(mines_remaining=i))
+        notif.set_mines(5)
+        stats = notif.get_listener_stats(listener)
+        assert stats.coalesced == 2
+        assert stats.dropped == 0
+        release.set()
+        notif.close()
+        assert listener.calls == [
+            ("reset",),
+            ("update_mines_remaining", 2),
+            ("set_mines", 5),
+        ]
+
+
+class TestAsyncDelivery:
+    """Test delivering notifications to listeners in an event loop."""
+
+    def test_coroutine_methods(self):
+        class AsyncListener(_Listener):
+            async def set_mines(self, mines):
+                await asyncio.sleep(0)
+                super().set_mines(mines)
+
+            async def update_mines_remaining(self, mines_remaining):
+                await asyncio.sleep(0)
+                super().update_mines_remaining(mines_remaining)
+
+        async def main():
+            listener = AsyncListener()
+            notif = api._Notifier()
+            notif.register_listener(
+                listener, delivery=Delivery.ASYNC, loop=asyncio.get_running_loop()
+            )
+            notif.set_mines(1)
+            notif.update_batch(
+                GameUpdate(mines_remaining=1, game_state=GameState.ACTIVE)
+            )
+            notif.reset()
+            # Let the listener's task catch up.
+            for _ in range(20):
+                await asyncio.sleep(0)
+            notif.close()
+            await asyncio.sleep(0)
+            return listener, notif
+
+        listener, _ = asyncio.run(main())
+        assert listener.calls == [
+            ("set_mines", 1),
+            ("update_mines_remaining", 1),
+            ("update_game_state", GameState.ACTIVE),
+            ("reset",),
+        ]
+
+    def test_no_loop(self):
+        notif = api._Notifier()
+        with pytest.raises(ValueError):
+            notif.register_listener(_Listener(), delivery=Delivery.ASYNC)
@@ -0,0 +1,14 @@
+# October 2026
+
+from unittest import mock
+
+import pytest
+
+from minegauler.app.core.game import GameBase
+
+
+@pytest.fixture(autouse=True)
+def check_tracked_state():
+    """Cross-check incrementally tracked game state on every completion check."""
+    with mock.patch.object(GameBase, "_check_tracked_state", True):
+        yield
@@ -14,7 +14,7 @@ from unittest import mock
 import pytest
 
 from minegauler.app.core import engine
-from minegauler.app.shared.types import Difficulty, GameMode, UIMode
+from minegauler.app.shared.types import CellAction, Difficulty, GameMode, UIMode
 from minegauler.app.shared.utils import GameOptsStruct
 
 from .. import utils
@@ -102,6 +102,12 @@ class TestUberController:
         game_ctrlr.remove_cell_flags.assert_called_once_with((0, 1))
         game_ctrlr.reset_mock()
 
+        ctrlr.apply_actions([(CellAction.SELECT, (0, 1))])
+        game_ctrlr.apply_actions.assert_called_once_with(
+            [(CellAction.SELECT, (0, 1))], flag_only=False
+        )
+        game_ctrlr.reset_mock()
+
         ctrlr.resize_board(2, 3, 4)
         game_ctrlr.resize_board.assert_called_once_with(2, 3, 4)
         game_ctrlr.reset_mock()
@@ -8,6 +8,8 @@ Test the core game module.
 import logging
 from unittest import mock
 
+import pytest
+
 from minegauler.app.core.game import _ignore_if, _ignore_if_not
 from minegauler.app.core.regular.game import Game
 from minegauler.app.core.regular.types import Coord
@@ -83,3 +85,29 @@ class TestIgnoreIfDecorators:
         self.game.state = GameState.LOST
         decorated_mock(self.game)
         self.mock_func.assert_not_called()
+
+    def test_ignore_if_not_game_and_cell_state(self):
+        """Test 'ignore if not' with both game and cell states."""
+        decorator = _ignore_if_not(
+            game_state=GameState.ACTIVE, cell_state=CellContents.Unclicked
+        )
+        decorated_mock = decorator(self.mock_func)
+        game = Game(x_size=4, y_size=5, mines=5)
+
+        game.state = GameState.ACTIVE
+        decorated_mock(game, Coord(0, 0))  # unclicked
+        self.mock_func.assert_called_once()
+        self.mock_func.reset_mock()
+
+        game.board[Coord(0, 0)] = CellContents.UnclickedSunken
+        decorated_mock(game, Coord(0, 0))  # sunken is not unclicked
+        self.mock_func.assert_not_called()
+
+        game.state = GameState.READY
+        decorated_mock(game, Coord(0, 1))  # unclicked
+        self.mock_func.assert_not_called()
+
+    def test_unrecognised_cell_state(self):
+        """Test an unrecognised cell state is rejected when decorating."""
+        with pytest.raises(ValueError):
+            _ignore_if(cell_state=[CellContents.Num(1)])
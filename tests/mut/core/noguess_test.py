@@ -0,0 +1,101 @@
+# October 2026
+
+"""
+Test the noguess module.
+
+"""
+
+import pytest
+
+from minegauler.app.core import noguess
+
+
+def _flatten(mines):
+    return bytearray(n for row in mines for n in row)
+
+
+class TestIsSolvable:
+    """Test the is_solvable() function."""
+
+    def test_opening(self):
+        mines = [
+            [1, 0, 0],
+            [0, 0, 0],
+            [0, 0, 0],
+        ]
+        assert noguess.is_solvable(_flatten(mines), 3, 3, 8)
+
+    def test_guess_required(self):
+        mines = [
+            [1, 0, 0],
+            [0, 0, 0],
+        ]
+        assert not noguess.is_solvable(_flatten(mines), 3, 2, 5)
+
+    def test_pairwise_rule(self):
+        mines = [
+            [1, 0, 1],
+            [0, 0, 0],
+            [0, 0, 0],
+        ]
+        assert noguess.is_solvable(_flatten(mines), 3, 3, 7)
+
+    def test_mine_count(self):
+        mines = [
+            [0, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+        ]
+        # The corner cell is surrounded by mines, so can only be solved by
+        # counting the mines.
+        assert noguess.is_solvable(_flatten(mines), 4, 4, 15)
+        mines[0][0] = 1
+        assert noguess.is_solvable(_flatten(mines), 4, 4, 15)
+
+    def test_per_cell(self):
+        mines = [
+            [2, 0, 0],
+            [0, 0, 0],
+            [0, 0, 0],
+        ]
+        assert noguess.is_solvable(_flatten(mines), 3, 3, 8, per_cell=2)
+
+
+class TestGenerateNoGuess:
+    """Test the generate_no_guess() function."""
+
+    def test_solvable(self):
+        mine_indices, stats = noguess.generate_no_guess(
+            30, 16, 99, 8 * 30 + 15, seed=0, time_budget=10
+        )
+        assert stats.solved
+        assert stats.attempts >= 1
+        assert len(mine_indices) == 99
+        mine_counts = bytearray(30 * 16)
+        for i in mine_indices:
+            mine_counts[i] += 1
+        assert max(mine_counts) == 1
+        assert noguess.is_solvable(mine_counts, 30, 16, 8 * 30 + 15)
+
+    def test_reproducible(self):
+        kwargs = dict(seed=3, time_budget=10)
+        result = noguess.generate_no_guess(16, 16, 40, 0, **kwargs)
+        assert result[0] == noguess.generate_no_guess(16, 16, 40, 0, **kwargs)[0]
+        assert (
+            result[0]
+            == noguess.generate_no_guess(16, 16, 40, 0, processes=2, **kwargs)[0]
+        )
+
+    def test_time_budget(self):
+        mine_indices, stats = noguess.generate_no_guess(
+            8, 8, 40, 0, seed=0, time_budget=0
+        )
+        assert stats.attempts == 1
+        assert not stats.solved
+        assert len(mine_indices) == 40
+        assert not set(mine_indices) & {0, 1, 8, 9}
+
+    def test_too_many_mines(self):
+        with pytest.raises(ValueError):
+            noguess.generate_no_guess(3, 3, 1, 4)
@@ -0,0 +1,125 @@
+# October 2026
+
+"""
+Test the regular bitboard game module.
+
+"""
+
+import random
+from unittest import mock
+
+import pytest
+
+from minegauler.app.core import engine
+from minegauler.app.core.regular import Coord, Game, Minefield, bitboard
+from minegauler.app.shared.types import CellContents, GameMode, GameState
+from minegauler.app.shared.utils import GameOptsStruct
+
+
+class TestGame:
+    """Test the bitboard game against the standard regular game."""
+
+    def test_opening(self):
+        mf = Minefield.from_2d_array(
+            [
+                [0, 0, 0, 1],
+                [0, 0, 0, 0],
+                [2, 0, 0, 0],
+            ],
+            per_cell=2,
+        )
+        game = bitboard.Game.from_minefield(mf)
+        cells = game.select_cell(Coord(1, 0))
+        assert cells == {
+            Coord(0, 0): CellContents.Num(0),
+            Coord(1, 0): CellContents.Num(0),
+            Coord(2, 0): CellContents.Num(1),
+            Coord(0, 1): CellContents.Num(2),
+            Coord(1, 1): CellContents.Num(2),
+            Coord(2, 1): CellContents.Num(1),
+        }
+        assert game.state is GameState.ACTIVE
+        cells = game.select_cell(Coord(3, 2))
+        assert set(cells) == {
+            Coord(1, 2),
+            Coord(2, 2),
+            Coord(3, 1),
+            Coord(3, 2),
+            # Flags are added on completion.
+            Coord(0, 2),
+            Coord(3, 0),
+        }
+        assert game.state is GameState.WON
+
+    def test_chord_opening(self):
+        """Test chording onto cells of an opening revealed by the same chord."""
+        mf = Minefield.from_2d_array([[1, 0, 0], [0, 0, 0], [0, 0, 0]])
+        game = Game.from_minefield(mf)
+        bb_game = bitboard.Game.from_minefield(mf)
+        for g in [game, bb_game]:
+            g.set_cell_flags(Coord(0, 0), 1)
+            g.select_cell(Coord(1, 1))
+        assert bb_game.chord_on_cell(Coord(1, 1)) == game.chord_on_cell(Coord(1, 1))
+        assert bb_game.board == game.board
+        assert bb_game.state is GameState.WON
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_same_updates(self, seed):
+        rnd = random.Random(seed)
+        per_cell = rnd.choice([1, 2])
+        game = Game(x_size=12, y_size=10, mines=20, per_cell=per_cell, lives=3)
+        click = Coord(rnd.randrange(12), rnd.randrange(10))
+        game.mf.populate(game.board.get_nbrs(click, include_origin=True), seed=seed)
+        game.select_cell(click)
+        first = next(
+            c for c in game.board.all_coords if type(game.board[c]) is CellContents.Num
+        )
+        bb_game = bitboard.Game.from_minefield(game.mf, lives=3)
+        game = Game.from_minefield(game.mf, lives=3)
+        assert bb_game.select_cell(first) == game.select_cell(first)
+
+        all_coords = game.board.all_coords
+        while not game.state.finished():
+            coord = rnd.choice(all_coords)
+            action = rnd.random()
+            if action < 0.1:
+                # Flag a mine, to allow chording.
+                mines = [
+                    c
+                    for c in all_coords
+                    if game.mf[c] and game.board[c] is CellContents.Unclicked
+                ]
+                if mines:
+                    coord = rnd.choice(mines)
+                args = (coord, game.mf[coord])
+                method = "set_cell_flags"
+            elif action < 0.4:
+                method, args = "chord_on_cell", (coord,)
+            else:
+                method, args = "select_cell", (coord,)
+            updates = getattr(game, method)(*args)
+            assert getattr(bb_game, method)(*args) == updates
+            assert bb_game.board == game.board
+            assert bb_game.state is game.state
+            assert bb_game.get_rem_3bv() == game.get_rem_3bv()
+            self._check_bits(bb_game)
+
+    @staticmethod
+    def _check_bits(game: bitboard.Game):
+        """Check the bitboards have been kept up to date with the board."""
+        bits = game._get_bits()
+        exp_bits = bitboard._GameBits(game._layout, game.mf, game.board)
+        assert bits.unclicked == exp_bits.unclicked
+        assert bits.revealed == exp_bits.revealed
+        flags = list(bits.flags)
+        while flags and not flags[-1]:
+            flags.pop()
+        assert flags == exp_bits.flags
+
+
+def test_game_mode_impl():
+    with mock.patch.dict(engine.GAME_MODE_IMPL, {GameMode.REGULAR: bitboard}):
+        ctrlr = engine.UberController(GameOptsStruct())
+        assert isinstance(ctrlr._active_ctrlr.game, bitboard.Game)
+        ctrlr.select_cell(Coord(0, 0))
+        assert type(ctrlr.board[Coord(0, 0)]) is CellContents.Num
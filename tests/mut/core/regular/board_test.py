@@ -70,6 +70,49 @@ class TestRegularBoard:
         with pytest.raises(TypeError):
             board[(0, 0)] = 1
 
+    def test_out_of_bounds(self, board):
+        with pytest.raises(IndexError):
+            board[Coord(self.x, 0)]
+        with pytest.raises(IndexError):
+            board[Coord(0, -1)] = CellContents.Flag(1)
+        with pytest.raises(IndexError):
+            board.get_nbrs(Coord(self.x, self.y))
+
+    def test_shared_coords(self, board):
+        other = Board(self.x, self.y)
+        assert other.get_coord_at(1, 2) is board.get_coord_at(1, 2)
+        assert other.get_nbrs(Coord(1, 1)) == board.get_nbrs(Coord(1, 1))
+        other[Coord(0, 0)] = CellContents.Num(1)
+        assert board[Coord(0, 0)] is CellContents.Unclicked
+        # The neighbour table is built up front and immutable.
+        nbrs = board._layout.nbrs
+        assert isinstance(nbrs, tuple)
+        assert len(nbrs) == self.x * self.y
+        for c in board.all_coords:
+            assert set(nbrs[c.y * self.x + c.x]) == {
+                Coord(i, j)
+                for i in range(self.x)
+                for j in range(self.y)
+                if abs(i - c.x) <= 1 and abs(j - c.y) <= 1
+            }
+
+    def test_copy(self, board):
+        board[Coord(0, 0)] = CellContents.Num(1)
+        other = board.copy()
+        assert other == board
+        other[Coord(0, 0)] = CellContents.Flag(1)
+        assert board[Coord(0, 0)] == CellContents.Num(1)
+
+    def test_cell_codes(self, board):
+        board[Coord(1, 2)] = CellContents.Num(3)
+        codes = board.cell_codes
+        assert len(codes) == self.x * self.y
+        assert CellContents.from_code(codes[2 * self.x + 1]) is CellContents.Num(3)
+        assert codes[0] == CellContents.Unclicked.code
+        # Modifying the codes does not affect the board.
+        codes[0] = CellContents.Flag(1).code
+        assert board[Coord(0, 0)] is CellContents.Unclicked
+
     def test_equal(self):
         board1 = Board(self.x, self.y)
         board2 = Board(self.x, self.y)
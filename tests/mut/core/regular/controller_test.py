@@ -14,7 +14,13 @@ from minegauler.app.core.regular import (
     Minefield,
 )
 from minegauler.app.shared import GameOptsStruct
-from minegauler.app.shared.types import CellContents, Difficulty, GameMode, GameState
+from minegauler.app.shared.types import (
+    CellAction,
+    CellContents,
+    Difficulty,
+    GameMode,
+    GameState,
+)
 from minegauler.app.shared.utils import Grid
 
 
@@ -123,7 +129,22 @@ class TestGameController:
                     prop_flagging=0,
                 ),
             )
-            assert ctrlr.get_game_info() == exp_game_info
+            info = ctrlr.get_game_info()
+            assert info == exp_game_info
+
+        # The 3bv stats are only calculated once per state.
+        ctrlr.game.state_version += 1  # clear the stored values
+        with mock.patch.object(
+            ctrlr.game, "get_rem_3bv", wraps=ctrlr.game.get_rem_3bv
+        ) as mock_get_rem_3bv:
+            ctrlr.get_game_info()
+            ctrlr.get_game_info()
+            mock_get_rem_3bv.assert_called_once()
+
+        # The info is not affected by later changes to the game.
+        ctrlr.select_cell(Coord(0, 4))
+        assert info == exp_game_info
+        assert ctrlr.get_game_info().started_info.rem_bbbv != info.started_info.rem_bbbv
 
     def test_cell_interaction(self):
         """Test various basic cell interaction."""
@@ -507,6 +528,35 @@ class TestGameController:
             ctrlr.remove_cell_flags(c)
         assert ctrlr.game.state is GameState.WON
 
+    def test_apply_actions(self):
+        """Test applying a batch of actions sends a single update."""
+        ctrlr = self.create_ctrlr()
+        ctrlr.apply_actions(
+            [
+                (CellAction.SELECT, Coord(0, 0)),
+                (CellAction.SELECT, Coord(0, 4)),
+                (CellAction.FLAG, Coord(3, 1)),
+                (CellAction.FLAG, Coord(2, 4)),
+                (CellAction.REMOVE_FLAGS, Coord(2, 4)),
+                (CellAction.CHORD, Coord(2, 2)),
+            ]
+        )
+        assert ctrlr.game.state is GameState.WON
+        assert ctrlr.game.board == ctrlr.game.mf.completed_board
+        ctrlr._notif.update_batch.assert_called_once()
+        update = ctrlr._notif.update_batch.call_args[0][0]
+        assert update.game_state is GameState.WON
+        assert update.cell_updates == {
+            c: ctrlr.game.board[c] for c in ctrlr.game.board.all_coords
+        }
+
+        # Flag actions with 'flag only' leave cells at the max flags.
+        ctrlr = self.create_ctrlr()
+        ctrlr.apply_actions([(CellAction.FLAG, Coord(3, 0))] * 3, flag_only=True)
+        assert ctrlr.game.board[Coord(3, 0)] is CellContents.Flag(2)
+        ctrlr.apply_actions([(CellAction.FLAG, Coord(3, 0))])
+        assert ctrlr.game.board[Coord(3, 0)] is CellContents.Unclicked
+
     def test_new_game(self):
         """Test starting new games."""
         # Start a new game before doing anything else with minefield.
@@ -7,17 +7,20 @@ Test the regular game module.
 
 import logging
 import math
+import random
 import time
+from unittest import mock
 
 import pytest
 from pytest import approx
 
-from minegauler.app.core.game import GameNotStartedError
+from minegauler.app.core import noguess
+from minegauler.app.core.game import GameChanges, GameNotStartedError
 from minegauler.app.core.regular.board import Board
 from minegauler.app.core.regular.game import Game
 from minegauler.app.core.regular.minefield import Minefield
 from minegauler.app.core.regular.types import Coord
-from minegauler.app.shared.types import Difficulty, GameState
+from minegauler.app.shared.types import CellAction, CellContents, Difficulty, GameState
 
 
 logger = logging.getLogger(__name__)
@@ -223,3 +226,192 @@ class TestGame:
         assert game.get_elapsed() == 0
         assert game.get_3bvps() == math.inf
         assert game.get_flag_proportion() == 0
+
+    def test_no_guess(self):
+        """Test a game with a no-guess minefield."""
+        game = Game(x_size=16, y_size=16, mines=40, no_guess=True)
+        game.mf.populate(
+            game.board.get_nbrs(Coord(3, 4), include_origin=True),
+            seed=0,
+            no_guess_click=Coord(3, 4),
+        )
+        game.select_cell(Coord(3, 4))
+        assert game.no_guess
+        assert game.mf.no_guess_stats.solved
+        assert not any(
+            game.mf[c] for c in game.board.get_nbrs(Coord(3, 4), include_origin=True)
+        )
+        assert noguess.is_solvable(game.mf._mine_counts, 16, 16, 4 * 16 + 3)
+
+    def test_no_guess_failed(self):
+        """Test the game is not marked no-guess if no solvable minefield is found."""
+        game = Game(x_size=16, y_size=16, mines=40, no_guess=True)
+        game.mf.no_guess_time_budget = 0
+        with mock.patch.object(noguess, "is_solvable", return_value=False):
+            game.select_cell(Coord(3, 4))
+        assert not game.mf.no_guess_stats.solved
+        assert not game.no_guess
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_rem_3bv_tracking(self, seed):
+        """Check the tracked remaining 3bv against a full recalculation."""
+        rnd = random.Random(seed)
+        game = Game(x_size=12, y_size=10, mines=15, lives=3)
+        all_coords = game.board.all_coords
+        click = rnd.choice(all_coords)
+        game.mf.populate(game.board.get_nbrs(click, include_origin=True), seed=seed)
+        game.select_cell(click)
+        while not game.state.finished():
+            coord = rnd.choice(all_coords)
+            if rnd.random() < 0.2:
+                game.set_cell_flags(coord, 1)
+            else:
+                game.select_cell(coord)
+            if game.state is GameState.WON:
+                break
+            revealed = [
+                c for c in all_coords if type(game.board[c]) is CellContents.Num
+            ]
+            assert game.get_rem_3bv() == game.mf._calc_rem_3bv(revealed)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_apply_actions(self, seed):
+        """Check applying a batch of actions matches applying them one by one."""
+        rng = random.Random(seed)
+        mf = Minefield(Board(8, 8).all_underlying_coords, mines=10, per_cell=2)
+        mf.populate(seed=seed)
+        all_coords = Board(8, 8).all_coords
+        actions = []
+        for _ in range(200):
+            action, coord = rng.choice(list(CellAction)), rng.choice(all_coords)
+            if action is CellAction.SPLIT:
+                continue
+            if action is CellAction.SELECT and mf[coord] > 0 and rng.random() < 0.9:
+                # Mostly avoid clicking on mines.
+                continue
+            actions.append((action, coord))
+
+        single_game = Game.from_minefield(mf)
+        single_updates = {}
+        for action, coord in actions:
+            updates = single_game._apply_action(action, coord, flag_only=False)
+            single_updates.update(updates or {})
+        batch_game = Game.from_minefield(mf)
+        batch_updates = batch_game.apply_actions(actions)
+
+        assert batch_game.state is single_game.state
+        assert batch_game.board == single_game.board
+        assert batch_game.mines_remaining == single_game.mines_remaining
+        assert batch_updates == single_updates
+
+    def test_state_version(self):
+        """Test the state version and memoising values calculated from it."""
+        mf = Minefield.from_2d_array([[0, 0, 1], [0, 0, 1], [1, 1, 1]])
+        game = Game.from_minefield(mf)
+        assert game.state_version == 0
+        game.set_cell_flags(Coord(2, 2), 1)
+        assert game.state_version == 1
+        # No change to the state.
+        game.select_cell(Coord(2, 2))
+        assert game.state_version == 1
+
+        func = mock.Mock(return_value=1)
+        assert game.memoise("value", func) == 1
+        assert game.memoise("value", func) == 1
+        func.assert_called_once()
+        game.select_cell(Coord(0, 0))
+        assert game.state_version == 2
+        func.return_value = 2
+        assert game.memoise("value", func) == 2
+        assert func.call_count == 2
+
+    def test_changes_since(self):
+        mf = Minefield.from_2d_array([[0, 0, 1, 0], [0, 0, 1, 0], [1, 1, 1, 0]])
+        game = Game.from_minefield(mf)
+        assert game.changes_since(0) == GameChanges(
+            version=0,
+            cell_updates={},
+            full=False,
+            game_state=GameState.READY,
+            mines_remaining=5,
+        )
+        flag_updates = game.set_cell_flags(Coord(2, 2), 1)
+        select_updates = game.select_cell(Coord(0, 0))
+        changes = game.changes_since(0)
+        assert changes.version == 2
+        assert not changes.full
+        assert changes.cell_updates == {**flag_updates, **select_updates}
+        assert changes.game_state is GameState.ACTIVE
+        assert changes.mines_remaining == 4
+        assert game.changes_since(1).cell_updates == select_updates
+        assert game.changes_since(2).cell_updates == {}
+
+        # Changes that are no longer stored give a snapshot of the board.
+        with mock.patch.object(Game, "max_stored_changes", 1):
+            game = Game.from_minefield(mf)
+        game.set_cell_flags(Coord(2, 2), 1)
+        game.set_cell_flags(Coord(2, 1), 1)
+        changes = game.changes_since(0)
+        assert changes.full
+        assert changes.cell_updates == {c: game.board[c] for c in game.board.all_coords}
+        assert game.changes_since(1) == GameChanges(
+            version=2,
+            cell_updates={Coord(2, 1): CellContents.Flag(1)},
+            full=False,
+            game_state=GameState.READY,
+            mines_remaining=3,
+        )
+
+        with pytest.raises(ValueError):
+            game.changes_since(3)
+        with pytest.raises(ValueError):
+            game.changes_since(-1)
+
+    def test_apply_actions_win(self):
+        """Test completion is checked at the end of a batch of actions."""
+        mf = Minefield.from_2d_array([[0, 0, 1]])
+        game = Game.from_minefield(mf)
+        updates = game.apply_actions(
+            [(CellAction.FLAG, Coord(2, 0)), (CellAction.SELECT, Coord(0, 0))]
+        )
+        assert game.state is GameState.WON
+        assert updates == {
+            Coord(0, 0): CellContents.Num(0),
+            Coord(1, 0): CellContents.Num(1),
+            Coord(2, 0): CellContents.Flag(1),
+        }
+        # Further actions are ignored once the game is won.
+        assert game.apply_actions([(CellAction.FLAG, Coord(0, 0))]) == {}
+
+        # Actions after all safe cells are revealed are ignored too.
+        game = Game.from_minefield(mf)
+        game.apply_actions(
+            [(CellAction.SELECT, Coord(0, 0)), (CellAction.SELECT, Coord(2, 0))]
+        )
+        assert game.state is GameState.WON
+
+        with pytest.raises(ValueError):
+            Game.from_minefield(mf).apply_actions([(CellAction.SPLIT, Coord(0, 0))])
+
+    @pytest.mark.parametrize(
+        "bad_action",
+        [(CellAction.SPLIT, Coord(0, 0)), (CellAction.SELECT, Coord(3, 0))],
+    )
+    def test_apply_actions_invalid(self, bad_action):
+        """Test no actions are applied if any action is invalid."""
+        mf = Minefield.from_2d_array([[0, 0, 1]])
+        game = Game.from_minefield(mf)
+        with pytest.raises(ValueError):
+            game.apply_actions([(CellAction.FLAG, Coord(2, 0)), bad_action])
+        assert game.board == Board(3, 1)
+        assert game.state_version == 0
+
+    def test_cycle_cell_flags(self):
+        game = Game(x_size=3, y_size=3, mines=3, per_cell=2)
+        coord = Coord(1, 1)
+        assert game.cycle_cell_flags(coord) == {coord: CellContents.Flag(1)}
+        assert game.cycle_cell_flags(coord) == {coord: CellContents.Flag(2)}
+        assert game.cycle_cell_flags(coord, flag_only=True) == {}
+        assert game.board[coord] is CellContents.Flag(2)
+        assert game.cycle_cell_flags(coord) == {coord: CellContents.Unclicked}
+        assert game.mines_remaining == 3
@@ -1,9 +1,12 @@
 # October 2021, Lewis Gaul
 
+import json
+import random
 import textwrap
 
 import pytest
 
+from minegauler.app.core.minefield import sample_mine_indices
 from minegauler.app.core.regular.board import Board
 from minegauler.app.core.regular.minefield import Minefield
 from minegauler.app.core.regular.types import Coord
@@ -84,6 +87,67 @@ class TestRegularMinefield:
         assert mf.populated
         assert mf.mine_coords == [Coord(0, 2)]
 
+    def test_populate_seeded(self):
+        """Check populating a minefield from a seed is reproducible."""
+        safe_coords = {Coord(0, 0), Coord(1, 0), Coord(1, 1)}
+        mf1 = Minefield(self.coords, mines=self.mines, per_cell=2)
+        mf1.populate(safe_coords, seed=123)
+        mf2 = Minefield(self.coords, mines=self.mines, per_cell=2)
+        mf2.populate(safe_coords, seed=123)
+        assert mf1.seed == 123
+        assert mf1 == mf2
+        assert not any(mf1[c] for c in safe_coords)
+        assert max(mf1[c] for c in mf1.all_coords) <= 2
+
+        mf3 = Minefield(self.coords, mines=self.mines, per_cell=2)
+        mf3.populate(safe_coords)
+        mf4 = Minefield(self.coords, mines=self.mines, per_cell=2)
+        mf4.populate(safe_coords, seed=mf3.seed)
+        assert mf3 == mf4
+        mf5 = Minefield.from_json(mf3.to_json())
+        assert mf5.seed == mf3.seed
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_sample_mine_indices(self, seed):
+        """Check sampled slots are mapped to the cells that are not safe."""
+        rnd = random.Random(seed)
+        safe = rnd.sample(range(50), rnd.randrange(50))
+        avble = [i for i in range(50) if i not in safe]
+        mines = rnd.randrange(2 * len(avble) + 1)
+        mine_indices = sample_mine_indices(random.Random(seed), 50, safe, mines, 2)
+        slots = random.Random(seed).sample(range(2 * len(avble)), mines)
+        assert mine_indices == [avble[s % len(avble)] for s in slots]
+
+    def test_populate_no_guess(self):
+        """Check populating a minefield that can be solved without guessing."""
+        mf1 = Minefield.from_dimensions(9, 9, mines=10)
+        mf1.populate({Coord(4, 4)}, seed=5, no_guess_click=Coord(4, 4))
+        assert mf1.no_guess_stats.solved
+        assert mf1[Coord(4, 4)] == 0
+        mf2 = Minefield.from_dimensions(9, 9, mines=10)
+        mf2.populate({Coord(4, 4)}, seed=5, no_guess_click=Coord(4, 4))
+        assert mf1 == mf2
+
+    @pytest.mark.parametrize("no_guess", [False, True])
+    def test_regenerate_from_json(self, no_guess):
+        """Check a minefield can be regenerated from its saved JSON."""
+        mf = Minefield.from_dimensions(9, 9, mines=10)
+        click = Coord(4, 4)
+        mf.populate(
+            {click, Coord(3, 4), Coord(5, 4)},
+            no_guess_click=click if no_guess else None,
+        )
+        obj = json.loads(json.dumps(mf.to_json()))
+        loaded = Minefield.from_json(obj)
+        assert loaded.safe_coords == mf.safe_coords
+        assert loaded.no_guess_click == mf.no_guess_click
+        regenerated = loaded.regenerate()
+        assert regenerated == mf
+        assert regenerated.mine_coords == mf.mine_coords
+
+        with pytest.raises(ValueError):
+            Minefield.from_dimensions(9, 9, mines=10).regenerate()
+
     def test_populate_too_many_mines_error(self):
         """Check populate error - too many mines for safe coords."""
         safe_coords = {Coord(0, 0), Coord(0, 1)}
@@ -139,6 +203,33 @@ class TestRegularMinefield:
         assert mf[Coord(0, 1)] == 2
         assert mf[Coord(1, 1)] == 0
 
+    def test_opening_index(self):
+        """Check looking up the opening containing a cell."""
+        mf = Minefield.from_2d_array(
+            [
+                # fmt: off
+                [0, 0, 1, 0, 0],
+                [0, 0, 1, 0, 0],
+                [1, 1, 1, 0, 0],
+                # fmt: on
+            ]
+        )
+        assert len(mf.openings) == 2
+        index = mf.get_opening_index(Coord(0, 0))
+        assert mf.get_opening_coords(index) == [
+            # fmt: off
+            Coord(0, 0), Coord(1, 0),
+            Coord(0, 1), Coord(1, 1),
+            # fmt: on
+        ]
+        assert mf.get_opening_index(Coord(1, 1)) is None
+        index = mf.get_opening_index(Coord(4, 1))
+        assert mf.get_opening_index(Coord(4, 2)) == index
+        assert sorted(mf.get_opening_coords(index)) == mf.openings[index]
+        assert len(mf.openings[index]) == 6
+        with pytest.raises(IndexError):
+            mf.get_opening_index(Coord(5, 0))
+
     def test_from_coords_too_many_per_cell_error(self):
         """Check passing in too many mines in a cell."""
         mine_coords = [Coord(0, 0), Coord(0, 0)]
@@ -165,3 +256,38 @@ class TestRegularMinefield:
         assert mf[Coord(0, 0)] == mf.mine_coords.count(Coord(0, 0))
         with pytest.raises(IndexError):
             mf[Coord(10, 10)]
+
+    def test_equal(self):
+        """Check equality is based on the number of mines in each cell."""
+        mine_coords = [Coord(*c) for c in ((0, 0), (0, 1), (0, 1))]
+        mf1 = Minefield.from_coords(self.coords, mine_coords=mine_coords, per_cell=2)
+        mf2 = Minefield.from_coords(
+            self.coords, mine_coords=reversed(mine_coords), per_cell=2
+        )
+        mf3 = Minefield.from_coords(
+            self.coords, mine_coords=mine_coords[:2] + [Coord(0, 0)], per_cell=2
+        )
+        assert mf1 == mf2
+        assert mf1 != mf3
+        assert mf1 != Minefield(self.coords, mines=3, per_cell=2)
+
+    def test_json_roundtrip(self):
+        """Check converting to and from JSON."""
+        mine_coords = [Coord(*c) for c in ((3, 2), (0, 1), (3, 2))]
+        mf = Minefield.from_coords(self.coords, mine_coords=mine_coords, per_cell=2)
+        obj = mf.to_json()
+        assert obj["mine_coords"] == [(0, 1), (3, 2), (3, 2)]
+        assert Minefield.from_json(obj) == mf
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed):
+        """Check the flat array calculations against the reference ones."""
+        rnd = random.Random(seed)
+        x_size, y_size = rnd.randint(1, 20), rnd.randint(2, 20)
+        per_cell = rnd.randint(1, 3)
+        mines = rnd.randint(0, x_size * y_size * per_cell // 4)
+        mf = Minefield.from_dimensions(x_size, y_size, mines=mines, per_cell=per_cell)
+        mf.populate(seed=seed)
+        assert mf.completed_board == mf._calc_completed_board_reference()
+        assert sorted(mf.openings) == sorted(mf._find_openings_reference())
+        assert mf.bbbv == mf._calc_3bv_reference()
@@ -0,0 +1,171 @@
+# October 2026
+
+"""
+Test the session module.
+
+"""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from minegauler.app.core import api, board, regular, split_cell
+from minegauler.app.core.regular.types import Coord
+from minegauler.app.core.session import SessionManager, SessionNotFoundError
+from minegauler.app.shared.types import GameMode, GameState
+from minegauler.app.shared.utils import GameOptsStruct
+
+
+class TestSessionManager:
+    """Test the SessionManager class."""
+
+    def test_create_and_get(self):
+        manager = SessionManager()
+        opts = GameOptsStruct(x_size=5, y_size=4, mines=3)
+        session = manager.create(opts)
+        assert isinstance(session._ctrlr, regular.GameController)
+        assert session.ctrlr.mode is GameMode.REGULAR
+        assert manager.get(session.id) is session
+        assert session.id in manager
+        assert len(manager) == 1
+        # The session has its own copy of the options.
+        opts.x_size = 10
+        assert session.ctrlr.game.x_size == 5
+
+        split_session = manager.create(
+            GameOptsStruct(mode=GameMode.SPLIT_CELL), session_id="split"
+        )
+        assert split_session.id == "split"
+        assert isinstance(split_session._ctrlr, split_cell.GameController)
+        assert manager.session_ids == [session.id, "split"]
+        with pytest.raises(ValueError):
+            manager.create(session_id="split")
+
+        with pytest.raises(SessionNotFoundError):
+            manager.get("other")
+
+    def test_independent_games(self):
+        manager = SessionManager()
+        listener1 = mock.Mock(spec=api.AbstractListener)
+        listener2 = mock.Mock(spec=api.AbstractListener)
+        session1 = manager.create(listeners=[listener1])
+        session2 = manager.create()
+        session2.ctrlr.register_listener(listener2)
+        session1.ctrlr.select_cell(Coord(0, 0))
+        assert session1.ctrlr.game.state is not GameState.READY
+        assert session2.ctrlr.game.state is GameState.READY
+        listener1.update_batch.assert_called_once()
+        listener2.update_batch.assert_not_called()
+        # Boards of the same size share their tables.
+        assert session1.ctrlr.board._layout is session2.ctrlr.board._layout
+
+    def test_close(self):
+        manager = SessionManager()
+        listener = mock.Mock(spec=api.AbstractListener)
+        session = manager.create(listeners=[listener])
+        manager.close(session.id)
+        manager.close(session.id)  # already closed
+        assert session.id not in manager
+        session.ctrlr.new_game()
+        listener.reset.assert_not_called()
+
+        manager.create()
+        manager.create()
+        manager.close_all()
+        assert len(manager) == 0
+
+    def test_max_sessions(self):
+        manager = SessionManager(max_sessions=2)
+        first = manager.create()
+        second = manager.create()
+        manager.get(first.id)
+        third = manager.create()
+        # The least recently used session is evicted.
+        assert manager.session_ids == [first.id, third.id]
+        assert second.id not in manager
+
+    def test_evict_idle(self):
+        manager = SessionManager(idle_timeout=10)
+        with mock.patch("time.monotonic", return_value=100):
+            first = manager.create()
+            second = manager.create()
+        with mock.patch("time.monotonic", return_value=105):
+            manager.get(first.id)
+            third = manager.create()
+            assert manager.evict_idle() == []
+        with mock.patch("time.monotonic", return_value=112):
+            assert manager.evict_idle() == [second.id]
+            assert second.id not in manager
+        with mock.patch("time.monotonic", return_value=200):
+            assert sorted(manager.evict_idle()) == sorted([first.id, third.id])
+        assert len(manager) == 0
+
+        manager = SessionManager(idle_timeout=None)
+        manager.create()
+        assert manager.evict_idle() == []
+
+    def test_held_controller_active(self):
+        """Test playing through a held controller keeps the session active."""
+        manager = SessionManager(idle_timeout=10)
+        with mock.patch("time.monotonic", return_value=100):
+            first = manager.create()
+            second = manager.create()
+        ctrlr = first.ctrlr
+        with mock.patch("time.monotonic", return_value=105):
+            ctrlr.select_cell(Coord(0, 0))
+        assert first.last_active == 105
+        assert manager.session_ids == [second.id, first.id]
+        with mock.patch("time.monotonic", return_value=112):
+            assert manager.evict_idle() == [second.id]
+        assert first.id in manager
+        assert first._ctrlr.game.state is not GameState.READY
+
+    def test_background_eviction(self):
+        manager = SessionManager(idle_timeout=0)
+        session = manager.create()
+        evicted = threading.Event()
+        orig_evict_idle = manager.evict_idle
+
+        def evict_idle():
+            result = orig_evict_idle()
+            if result:
+                evicted.set()
+            return result
+
+        with mock.patch.object(manager, "evict_idle", side_effect=evict_idle):
+            manager.start_eviction(interval=0.01)
+            with pytest.raises(RuntimeError):
+                manager.start_eviction()
+            assert evicted.wait(5)
+            manager.stop_eviction()
+        assert session.id not in manager
+        manager.stop_eviction()  # not running
+
+    def test_memory_usage(self):
+        manager = SessionManager()
+        small = manager.create(GameOptsStruct(x_size=8, y_size=8, mines=10))
+        large = manager.create(GameOptsStruct(x_size=30, y_size=16, mines=99))
+        large.ctrlr.select_cell(Coord(0, 0))
+        usage = manager.memory_usage()
+        assert set(usage) == {small.id, large.id}
+        assert 0 < usage[small.id] < usage[large.id]
+        assert usage[large.id] == large.memory_usage()
+
+
+def test_shared_per_size():
+    """Test tables are shared between boards of the same size while in use."""
+    calls = []
+
+    @board.shared_per_size(maxsize=1)
+    def get_table(x_size, y_size):
+        calls.append((x_size, y_size))
+        return mock.Mock(size=(x_size, y_size))
+
+    table = get_table(2, 3)
+    assert get_table(2, 3) is table
+    # Still shared after dropping out of the recently used tables.
+    get_table(4, 5)
+    assert get_table(2, 3) is table
+    assert calls == [(2, 3), (4, 5)]
+    assert table in board.get_shared_tables()
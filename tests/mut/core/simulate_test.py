@@ -0,0 +1,98 @@
+# October 2026
+
+"""
+Test the simulate module.
+
+"""
+
+import random
+
+import pytest
+
+from minegauler.app.core import simulate
+from minegauler.app.core.regular import Coord, Minefield
+from minegauler.app.shared.types import CellContents
+
+
+class TestSimulateBoards:
+    """Test the simulate_boards() function."""
+
+    def test_reproducible(self):
+        kwargs = dict(x_size=16, y_size=16, mines=40, num_boards=20, seed=10)
+        stats = simulate.simulate_boards(**kwargs)
+        assert len(stats) == 20
+        assert stats == simulate.simulate_boards(**kwargs)
+        assert stats == simulate.simulate_boards(**kwargs, processes=2)
+        assert stats != simulate.simulate_boards(**{**kwargs, "seed": 11})
+
+    def test_number_counts(self):
+        stats = simulate.simulate_boards(6, 5, 4, per_cell=2, num_boards=10, seed=0)
+        assert len(stats.number_counts) == 17
+        assert all(len(counts) == 10 for counts in stats.number_counts)
+        # At most 4 cells contain mines, and no cell can show more than 4.
+        for i in range(10):
+            assert sum(counts[i] for counts in stats.number_counts) >= 30 - 4
+            assert all(counts[i] == 0 for counts in stats.number_counts[5:])
+
+    def test_first_success(self):
+        stats = simulate.simulate_boards(
+            8, 8, 10, first_click=(0, 0), num_boards=50, seed=0
+        )
+        assert all(stats.first_click_opening)
+        assert all(n >= 1 for n in stats.openings)
+        # Not enough space for an opening.
+        stats = simulate.simulate_boards(
+            3, 3, 7, first_click=(1, 1), num_boards=10, seed=0
+        )
+        assert not any(stats.first_click_opening)
+
+    @pytest.mark.parametrize("first_success", [True, False])
+    @pytest.mark.parametrize("per_cell", [1, 2])
+    def test_stats(self, first_success, per_cell):
+        """Check the stats match a minefield with the same mines."""
+        params = simulate._BoardParams(
+            x_size=12,
+            y_size=9,
+            mines=20,
+            per_cell=per_cell,
+            first_success=first_success,
+            first_click=None,
+        )
+        rng = random.Random(0)
+        for _ in range(20):
+            mine_counts, click = simulate._generate_mine_counts(rng, params)
+            assert sum(mine_counts) == 20
+            assert max(mine_counts) <= per_cell
+            if first_success:
+                assert mine_counts[click] == 0
+            mf = Minefield.from_coords(
+                [Coord(x, y) for x in range(12) for y in range(9)],
+                mine_coords=[
+                    Coord(i % 12, i // 12)
+                    for i, n in enumerate(mine_counts)
+                    for _ in range(n)
+                ],
+                per_cell=per_cell,
+            )
+            bbbv, openings, click_opening, number_counts = simulate._calc_stats(
+                mine_counts, click, 12, 9, per_cell
+            )
+            assert bbbv == mf.bbbv
+            assert openings == len(mf.openings)
+            assert click_opening == (
+                mf.completed_board[Coord(click % 12, click // 12)].num == 0
+                and mine_counts[click] == 0
+            )
+            assert len(number_counts) == 8 * per_cell + 1
+            for num, count in enumerate(number_counts):
+                assert count == sum(
+                    1
+                    for c in mf.completed_board.all_coords
+                    if mf.completed_board[c] == CellContents.Num(num)
+                )
+
+    def test_invalid_args(self):
+        with pytest.raises(ValueError):
+            simulate.simulate_boards(3, 3, 9)
+        with pytest.raises(ValueError):
+            simulate.simulate_boards(3, 3, 2, first_click=(3, 0))
@@ -0,0 +1,131 @@
+# October 2026
+
+"""
+Test the solver module.
+
+"""
+
+import functools
+import itertools
+import operator
+import random
+
+import pytest
+
+from minegauler.app.core import solver
+from minegauler.app.core.regular import Board, Coord, Game
+from minegauler.app.shared.types import CellContents
+
+
+def _brute_force_probs(board: Board, mines: int, per_cell: int):
+    """Calculate the probabilities by trying every arrangement of mines."""
+    unknown = [
+        c
+        for c in board.all_coords
+        if board[c] is CellContents.Unclicked or isinstance(board[c], CellContents.Flag)
+    ]
+    known = {c: board[c].num for c in board.all_coords if board[c].is_mine_type()}
+    mines -= sum(known.values())
+    total = 0
+    with_mine = {c: 0 for c in unknown}
+    for counts in itertools.product(range(per_cell + 1), repeat=len(unknown)):
+        if sum(counts) != mines:
+            continue
+        placed = {**known, **dict(zip(unknown, counts))}
+        if any(
+            sum(placed.get(nbr, 0) for nbr in board.get_nbrs(c)) != board[c].num
+            for c in board.all_coords
+            if type(board[c]) is CellContents.Num
+        ):
+            continue
+        # Count the ways of choosing slots for the mines in each cell.
+        ways = functools.reduce(
+            operator.mul, (solver._comb(per_cell, n) for n in counts), 1
+        )
+        total += ways
+        for c, n in zip(unknown, counts):
+            if n:
+                with_mine[c] += ways
+    return {c: n / total for c, n in with_mine.items()}
+
+
+class TestCalcProbabilities:
+    """Test the calc_probabilities() function."""
+
+    def test_no_unknown_cells(self):
+        board = Board.from_2d_array([[0, 0], [0, 0]])
+        assert solver.calc_probabilities(board, 0) == {}
+
+    def test_no_constraints(self):
+        board = Board(3, 3)
+        probs = solver.calc_probabilities(board, 3)
+        assert probs == {c: pytest.approx(1 / 3) for c in board.all_coords}
+
+    def test_certain_cells(self):
+        board = Board.from_2d_array(
+            [
+                ["#", "#", "#"],
+                [1, 2, 1],
+                [0, 0, 0],
+            ]
+        )
+        probs = solver.calc_probabilities(board, 2)
+        assert probs == {
+            Coord(0, 0): 1,
+            Coord(1, 0): 0,
+            Coord(2, 0): 1,
+        }
+
+    def test_flags_treated_as_unknown(self):
+        board = Board.from_2d_array(
+            [
+                ["F1", "#"],
+                [1, 1],
+            ]
+        )
+        probs = solver.calc_probabilities(board, 1)
+        assert probs == {Coord(0, 0): 0.5, Coord(1, 0): 0.5}
+
+    def test_known_mines(self):
+        board = Board.from_2d_array(
+            [
+                ["!1", "#", "#"],
+                [1, "#", "#"],
+            ]
+        )
+        probs = solver.calc_probabilities(board, 2)
+        assert probs[Coord(1, 0)] == 0
+        assert probs[Coord(1, 1)] == 0
+        assert probs[Coord(2, 0)] == pytest.approx(0.5)
+        assert probs[Coord(2, 1)] == pytest.approx(0.5)
+
+    @pytest.mark.parametrize(
+        "board, mines",
+        [
+            ([[5, "#"], ["#", "#"]], 3),
+            ([[1, "#"], [0, "#"]], 1),
+            ([[1, "#"], ["#", "#"]], 5),
+            ([["M1", 0], ["#", "#"]], 1),
+        ],
+    )
+    def test_inconsistent(self, board, mines):
+        with pytest.raises(ValueError):
+            solver.calc_probabilities(Board.from_2d_array(board), mines)
+
+    @pytest.mark.parametrize(
+        "x_size, y_size, mines, per_cell", [(5, 4, 6, 1), (4, 3, 5, 2)]
+    )
+    def test_against_brute_force(self, x_size, y_size, mines, per_cell):
+        rnd = random.Random(0)
+        for seed in range(10):
+            game = Game(
+                x_size=x_size, y_size=y_size, mines=mines, per_cell=per_cell, lives=3
+            )
+            click = Coord(rnd.randrange(x_size), rnd.randrange(y_size))
+            game.mf.populate(game.board.get_nbrs(click, include_origin=True), seed=seed)
+            game.select_cell(click)
+            while not game.state.finished():
+                probs = solver.calc_probabilities(game.board, mines, per_cell=per_cell)
+                expected = _brute_force_probs(game.board, mines, per_cell)
+                assert probs == pytest.approx(expected)
+                game.select_cell(rnd.choice(sorted(probs)))
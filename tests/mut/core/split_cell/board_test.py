@@ -149,3 +149,19 @@ class TestSplitCellBoard:
             assert c not in board.all_coords
             with pytest.raises(ValueError):
                 board.get_nbrs(c)
+
+    def test_get_nbrs_after_split(self, board):
+        # Fill in the neighbours of every cell before each split.
+        for split in [Coord(2, 2, False), Coord(4, 0, False), Coord(0, 0, False)]:
+            for c in board.all_coords:
+                board.get_nbrs(c)
+            board.split_coord(split)
+            fresh_board = Board(self.x, self.y)
+            for c in board.all_coords:
+                if c.is_split and c.get_big_cell_coord() in fresh_board:
+                    fresh_board.split_coord(c.get_big_cell_coord())
+            for c in board.all_coords:
+                assert board.get_nbrs(c) == fresh_board.get_nbrs(c)
+                assert board.get_nbrs(c, include_origin=True) == (
+                    fresh_board.get_nbrs(c, include_origin=True)
+                )
@@ -0,0 +1,130 @@
+# October 2026
+
+"""
+Test the split cell game module.
+
+"""
+
+import json
+import random
+
+import pytest
+
+from minegauler.app.core.split_cell import Coord, Game, Minefield
+from minegauler.app.shared.types import CellAction, CellContents, GameState
+
+
+def _populate_around(game: Game, coord: Coord, seed: int) -> None:
+    """Populate a game's minefield with no mines around a big cell."""
+    game.mf.populate(
+        [
+            small
+            for big in game.board.get_nbrs(coord, include_origin=True)
+            for small in big.split()
+        ],
+        seed=seed,
+    )
+
+
+class TestSplitCellGame:
+    """Test the split cell Game class."""
+
+    def test_regenerate_minefield_from_json(self):
+        game = Game(x_size=12, y_size=10, mines=12, first_success=True)
+        game.select_cell(Coord(4, 4, False))
+        obj = json.loads(json.dumps(game.mf.to_json()))
+        loaded = Minefield.from_json(obj)
+        assert loaded.safe_coords == game.mf.safe_coords
+        assert loaded.regenerate() == game.mf
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_rem_3bv_tracking(self, seed):
+        """Check the tracked remaining 3bv against a full recalculation."""
+        rnd = random.Random(seed)
+        game = Game(x_size=12, y_size=10, mines=12, lives=3)
+        _populate_around(game, Coord(4, 4, False), seed)
+        game.select_cell(Coord(4, 4, False))
+        assert game.get_rem_3bv() == game.mf._calc_rem_3bv(game.board)
+        while not game.state.finished():
+            coord = game.board.get_coord_at(
+                rnd.randrange(game.x_size), rnd.randrange(game.y_size)
+            )
+            small_cells = coord.get_small_cell_coords()
+            if any(game.mf[c] > 0 for c in small_cells):
+                # Mostly avoid clicking on mines, splitting big cells instead.
+                if not coord.is_split:
+                    updates = game.split_cell(coord)
+                elif rnd.random() < 0.1:
+                    updates = game.select_cell(coord)
+                else:
+                    continue
+            else:
+                updates = game.select_cell(coord)
+            if not updates or game.state is GameState.WON:
+                continue
+            assert game.get_rem_3bv() == game.mf._calc_rem_3bv(game.board)
+        if game.state is GameState.WON:
+            assert game.get_rem_3bv() == 0
+            assert all(
+                type(game.board[c]) is CellContents.Num
+                or all(game.mf[s] > 0 for s in c.get_small_cell_coords())
+                for c in game.board.all_coords
+            )
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_apply_actions(self, seed):
+        """Check applying a batch of actions matches applying them one by one."""
+        rng = random.Random(seed)
+        game = Game(x_size=12, y_size=10, mines=12)
+        _populate_around(game, Coord(4, 4, False), seed)
+        actions = []
+        for _ in range(200):
+            x, y = rng.randrange(game.x_size), rng.randrange(game.y_size)
+            if rng.random() < 0.5:
+                coord = Coord(x, y, True)
+            else:
+                coord = Coord(x - x % 2, y - y % 2, False)
+            action = rng.choice(list(CellAction))
+            if action is CellAction.SELECT and any(
+                game.mf[c] > 0 for c in coord.get_small_cell_coords()
+            ):
+                # Mostly avoid clicking on mines.
+                if rng.random() < 0.9:
+                    continue
+            actions.append((action, coord))
+
+        single_game = Game.from_minefield(game.mf)
+        single_game.select_cell(Coord(4, 4, False))
+        for action, coord in actions:
+            if single_game.state.finished():
+                break
+            if coord not in single_game.board:
+                continue
+            single_game._apply_action(action, coord, flag_only=False)
+        batch_game = Game.from_minefield(game.mf)
+        batch_game.select_cell(Coord(4, 4, False))
+        # Actions on cells not on the board when reached are ignored.
+        batch_game.apply_actions(actions)
+
+        assert batch_game.state is single_game.state
+        assert batch_game.board == single_game.board
+
+    def test_apply_actions_on_split_cell(self):
+        """Check actions on a big cell split earlier in a batch are ignored."""
+        game = Game(x_size=4, y_size=4, mines=1)
+        game.mf = Minefield.from_coords(
+            game.board.all_underlying_coords, mine_coords=[Coord(0, 0, True)]
+        )
+        game.minefield_known = True
+        game.select_cell(Coord(2, 2, False))
+        updates = game.apply_actions(
+            [
+                (CellAction.SPLIT, Coord(0, 0, False)),
+                (CellAction.SELECT, Coord(0, 0, False)),
+                (CellAction.CHORD, Coord(0, 0, False)),
+            ]
+        )
+        assert Coord(0, 0, False) not in updates
+        assert Coord(0, 0, False) not in game.board
+        assert game.board[Coord(0, 0, True)] is CellContents.Unclicked
+        assert game.state is GameState.ACTIVE
@@ -7,6 +7,7 @@ Tests for the main window of the GUI.
 
 from unittest import mock
 
+import attr
 import pytest
 from pytestqt.qtbot import QtBot
 
@@ -174,6 +175,14 @@ class TestMinegaulerGUI:
                 )
                 mock_open.assert_called_once_with(mock.ANY, "3bv/s")
 
+        # No-guess games are not stored as highscores.
+        main_window.highscores.insert_highscore.reset_mock()
+        gui._ctrlr.get_game_info.return_value = attr.evolve(
+            gui._ctrlr.get_game_info.return_value, no_guess=True
+        )
+        gui.update_game_state(GameState.WON)
+        main_window.highscores.insert_highscore.assert_not_called()
+
         # update_mines_remaining()
         gui.update_mines_remaining(56)
         gui._panel_widget.set_mines_counter.assert_called_once_with(56)
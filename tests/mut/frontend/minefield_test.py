@@ -14,9 +14,11 @@ from PyQt5.QtGui import QMouseEvent
 from pytestqt.qtbot import QtBot
 
 from minegauler.app.core import api
+from minegauler.app.core.regular import Coord
 from minegauler.app.frontend import state
 from minegauler.app.frontend.minefield import MinefieldWidget
 from minegauler.app.frontend.minefield._base import RAISED_CELL, SUNKEN_CELL
+from minegauler.app.shared.types import CellContents
 
 from . import utils
 
@@ -188,6 +190,26 @@ class TestMinefieldWidget:
         click(pos=QPoint(mf_widget.width() - 1, 16))
         self.assert_cell_sank((self.state.x_size - 1, 1))
 
+    def test_probability_overlay(self, qtbot: QtBot, mf_widget: MinefieldWidget):
+        """Test the probabilities are shown when enabled."""
+        overlay = mf_widget._prob_overlay
+        assert not overlay._items
+        mf_widget.set_show_probabilities(True)
+        try:
+            qtbot.waitUntil(lambda: len(overlay._items) == 64)
+            assert overlay._items[Coord(0, 0)].toolTip() == "15.6%"
+
+            # Updated cells lose their probabilities straight away.
+            mf_widget.update_cells({Coord(0, 0): CellContents.Num(0)})
+            assert Coord(0, 0) not in overlay._items
+            # Stale results are ignored.
+            overlay._on_finished(overlay._request_id - 1, {})
+            assert len(overlay._items) == 63
+        finally:
+            mf_widget.set_show_probabilities(False)
+        assert not overlay._items
+        assert not overlay.enabled
+
     # --------------------------------------------------------------------------
     # Helper functions
     # --------------------------------------------------------------------------
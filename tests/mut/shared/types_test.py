@@ -0,0 +1,57 @@
+# October 2026
+
+"""
+Test the shared types module.
+
+"""
+
+import pickle
+
+import pytest
+
+from minegauler.app.shared.types import CellContents
+
+
+class TestCellContents:
+    """Test the CellContents types."""
+
+    numeric_types = [
+        CellContents.Num,
+        CellContents.Mine,
+        CellContents.HitMine,
+        CellContents.Flag,
+        CellContents.WrongFlag,
+    ]
+
+    @pytest.mark.parametrize("cls", numeric_types)
+    def test_interned(self, cls):
+        assert cls(2) is cls(2)
+        assert cls(1) + 1 is cls(2)
+        assert cls(3) - 1 is cls(2)
+        assert cls(2).num == 2
+        assert not hasattr(cls(2), "__dict__")
+
+    def test_invalid_num(self):
+        with pytest.raises(TypeError):
+            CellContents.Num(1.0)
+        with pytest.raises(ValueError):
+            CellContents.Num(-1)
+        with pytest.raises(ValueError):
+            CellContents.Flag(0)
+        with pytest.raises(ValueError):
+            CellContents.Num(1) + 255
+
+    def test_code(self):
+        items = [CellContents.Unclicked, CellContents.UnclickedSunken] + [
+            cls(n) for cls in self.numeric_types for n in (1, 2, 255)
+        ]
+        assert CellContents.Unclicked.code == 0
+        assert len({c.code for c in items}) == len(items)
+        for item in items:
+            assert 0 <= item.code < 2**16
+            assert CellContents.from_code(item.code) is item
+            assert pickle.loads(pickle.dumps(item)) is item
+        with pytest.raises(ValueError):
+            CellContents.from_code(1)
+        with pytest.raises(ValueError):
+            CellContents.from_code(-1)